@@ -46,7 +46,8 @@ INSTALLED_APPS = [
     'report',
     'students',
     'teachers',
-    'assignments'
+    'assignments',
+    'jobs',
     
 ]
 
@@ -161,11 +162,31 @@ SIMPLE_JWT = {
 
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+
+    # Embed role / student / child ids claims in every issued token
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.tokens.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.tokens.ClaimsTokenRefreshSerializer',
 }
 
+# No CACHES backend is configured, so each process gets its own in-memory
+# cache and invalidation only reaches the process that made the write.
+# Cached views therefore keep short timeouts (PROGRESS_CACHE_SECONDS,
+# LEADERBOARD_CACHE_SECONDS).
+# With a cache shared by every process, e.g.
+#   CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache",
+#                         "LOCATION": "redis://127.0.0.1:6379"}}
+# those timeouts can be raised.
+PROGRESS_CACHE_SECONDS = 30
+LEADERBOARD_CACHE_SECONDS = 30
+
+# Authenticate API requests from the token's claims without loading the
+# user row. Revocation after role changes relies on the cache, so only
+# enable this with a cache shared by every process.
+JWT_TOKEN_USER = False
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.ClaimsJWTAuthentication',
         # 'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.TokenAuthentication',  # if you want TokenAuth too
@@ -191,5 +212,17 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 
+# Academic year (attendance bitmaps index days from this date)
+ACADEMIC_YEAR_START_MONTH = 6
+ACADEMIC_YEAR_START_DAY = 1
+
+
+# Rendered report card PDFs, keyed by student and marks fingerprint
+REPORT_CARD_CACHE_DIR = BASE_DIR / 'cache' / 'report_cards'
+
+# Files produced by background jobs (batch report cards, imports)
+JOB_RESULTS_DIR = BASE_DIR / 'cache' / 'jobs'
+
+
 
 
@@ -34,6 +34,7 @@ urlpatterns = [
     path('api/performance/', include('performance.urls')),# Exams, Marks
     path('api/report/', include('report.urls')),          # Attendance & Reports
     path('api/assignments/', include('assignments.urls')),# Assignments
+    path('api/jobs/', include('jobs.urls')),              # Background jobs
 ]
 
 # -----------------------------
@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .tokens import is_revoked, token_user
+
+
+# ============================================================
+# 🪪 JWT AUTHENTICATION WITH ROLE CLAIMS
+# ============================================================
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    simplejwt authentication that, when `JWT_TOKEN_USER` is enabled,
+    returns a TokenUser built from the access token's role claims instead
+    of loading the user row. Tokens whose claims were revoked (role or
+    parent links changed) are refused. With the setting off, or for
+    tokens issued without claims, the user is loaded as usual.
+    """
+
+    def get_user(self, validated_token):
+        if not getattr(settings, "JWT_TOKEN_USER", False):
+            return super().get_user(validated_token)
+
+        user = token_user(validated_token)
+        if user is None:
+            return super().get_user(validated_token)
+        if is_revoked(validated_token):
+            raise AuthenticationFailed("Token claims are out of date; log in again.", code="token_revoked")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
@@ -33,3 +33,26 @@ class User(AbstractUser):
         String representation of the user, including role.
         """
         return f"{self.username} ({self.get_role_display()})"
+
+
+# ============================================================
+# 🪪 Token User (built from JWT claims)
+# ============================================================
+class TokenUser(User):
+    """
+    Read-only user rebuilt from the claims of an access token, so a
+    request can be authorized without loading the user row.
+
+    Only the fields carried in the token are populated; reading any other
+    field loads it from the database on first access. `student_id` and
+    `child_ids` hold the claimed student profile and linked children.
+    """
+
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise TypeError("TokenUser is read-only; load the User to change it.")
+
+    def delete(self, *args, **kwargs):
+        raise TypeError("TokenUser is read-only; load the User to delete it.")
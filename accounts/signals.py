@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from students.models import ParentStudent, Student
+from .models import User
+from .tokens import CLAIM_FIELDS, revoke_tokens
+
+
+# ============================================================
+# 🚫 TOKEN CLAIM REVOCATION
+# ============================================================
+
+def _revoke_on_commit(user_ids):
+    transaction.on_commit(lambda: revoke_tokens(user_ids))
+
+
+@receiver(pre_save, sender=User)
+def user_claims_changed(sender, instance, update_fields=None, **kwargs):
+    """Revoke issued tokens when a field carried in the claims changes."""
+    if instance.pk is None:
+        return
+    fields = [field for field in CLAIM_FIELDS if update_fields is None or field in update_fields]
+    if not fields:
+        return
+    current = User.objects.filter(pk=instance.pk).values(*fields).first()
+    if current and any(current[field] != getattr(instance, field) for field in fields):
+        _revoke_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def student_profile_changed(sender, instance, created=True, **kwargs):
+    if created:
+        _revoke_on_commit([instance.user_id])
+
+
+@receiver(post_save, sender=ParentStudent)
+@receiver(post_delete, sender=ParentStudent)
+def parent_link_changed(sender, instance, **kwargs):
+    _revoke_on_commit([instance.parent_id])
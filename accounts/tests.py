@@ -1,3 +1,117 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from students.models import ParentStudent, Section, Standard, Student
+from .authentication import ClaimsJWTAuthentication
+from .models import TokenUser, User
+from .permissions import IsStudent
+
+
+# ============================================================
+# 🪪 JWT ROLE CLAIMS
+# ============================================================
+class TokenClaimsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        standard = Standard.objects.create(name="9")
+        section = Section.objects.create(name="A", standard=standard)
+        self.student_user = User.objects.create_user(
+            username="stud", password="pass-1234", role="STUDENT", first_name="Asha"
+        )
+        self.student = Student.objects.create(user=self.student_user, standard=standard, section=section)
+        self.parent = User.objects.create_user(username="parent", password="pass-1234", role="PARENT")
+        ParentStudent.objects.create(parent=self.parent, student=self.student)
+
+    def login(self, username):
+        response = self.client.post(
+            reverse("session-login"), {"username": username, "password": "pass-1234"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data["tokens"]
+
+    def authenticate(self, access):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        return ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def test_login_embeds_role_claims(self):
+        student = AccessToken(self.login("stud")["access"])
+        parent = AccessToken(self.login("parent")["access"])
+
+        self.assertEqual(student["role"], "STUDENT")
+        self.assertEqual(student["student_id"], self.student.id)
+        self.assertEqual(parent["role"], "PARENT")
+        self.assertEqual(parent["child_ids"], [self.student.id])
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_token_user_skips_user_lookup(self):
+        access = self.login("stud")["access"]
+        request = APIRequestFactory().get("/")
+
+        with self.assertNumQueries(0):
+            user = self.authenticate(access)
+            request.user = user
+            self.assertTrue(IsStudent().has_permission(request, None))
+
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(user, self.student_user)
+        self.assertEqual(user.student_id, self.student.id)
+        self.assertEqual(user.get_full_name(), "Asha")
+        # Fields outside the claims are loaded on demand
+        self.assertEqual(user.email, "")
+        with self.assertRaises(TypeError):
+            user.save()
+
+    def test_database_user_without_token_user_mode(self):
+        user = self.authenticate(self.login("stud")["access"])
+        self.assertNotIsInstance(user, TokenUser)
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_role_change_revokes_claims(self):
+        tokens = self.login("stud")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student_user.role = "TEACHER"
+            self.student_user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(tokens["access"])
+
+        response = self.client.post(reverse("token-refresh"), {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.authenticate(response.data["access"]).role, "TEACHER")
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_parent_link_change_revokes_claims(self):
+        access = self.login("parent")["access"]
+        self.assertEqual(self.authenticate(access).child_ids, {self.student.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ParentStudent.objects.filter(parent=self.parent).delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(access)
+        self.assertEqual(self.authenticate(self.login("parent")["access"]).child_ids, frozenset())
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_revocation_holds_after_an_earlier_one_expired(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student_user.first_name = "Asha R"
+            self.student_user.save()
+        access = self.login("stud")["access"]
+        # The first revocation outlives its access token lifetime and expires
+        cache.delete(f"jwt:revoked:{self.student_user.pk}")
+        self.assertEqual(self.authenticate(access), self.student_user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student_user.first_name = "Asha"
+            self.student_user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(access)
+
+    def test_last_login_update_keeps_claims(self):
+        self.login("stud")
+        self.assertEqual(cache.get(f"jwt:revoked:{self.student_user.pk}"), None)
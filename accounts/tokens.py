@@ -0,0 +1,125 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import DEFERRED
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import TokenUser, User
+
+
+# ============================================================
+# 🪪 ROLE CLAIMS
+# ============================================================
+
+# User fields copied into every token; the rest are loaded on demand.
+CLAIM_FIELDS = ("username", "first_name", "last_name", "role", "is_staff", "is_superuser", "is_active")
+
+
+def user_claims(user):
+    """
+    Claims describing who the user is: the CLAIM_FIELDS, the id of their
+    student profile, the ids of the students linked to them as a parent
+    and the time the claims were read (compared with revoked_at()).
+    """
+    from students.models import ParentStudent, Student
+
+    claims = {field: getattr(user, field) for field in CLAIM_FIELDS}
+    claims["student_id"] = Student.objects.filter(user=user).values_list("id", flat=True).first()
+    claims["child_ids"] = sorted(
+        ParentStudent.objects.filter(parent=user).values_list("student_id", flat=True)
+    )
+    claims["rv"] = time.time()
+    return claims
+
+
+def tokens_for_user(user):
+    """Return a refresh token carrying the user's role claims (copied into its access token)."""
+    refresh = RefreshToken.for_user(user)
+    for name, value in user_claims(user).items():
+        refresh[name] = value
+    return refresh
+
+
+def token_user(token):
+    """
+    Build a TokenUser from a validated access token, or return None if the
+    token predates role claims.
+    """
+    if "role" not in token:
+        return None
+    field_names = [field.attname for field in User._meta.concrete_fields]
+    values = {
+        User._meta.pk.attname: User._meta.pk.to_python(token[api_settings.USER_ID_CLAIM]),
+        **{field: token.get(field) for field in CLAIM_FIELDS},
+    }
+    user = TokenUser.from_db(
+        "default", field_names, [values.get(name, DEFERRED) for name in field_names]
+    )
+    user.student_id = token.get("student_id")
+    user.child_ids = frozenset(token.get("child_ids") or ())
+    return user
+
+
+# ============================================================
+# 🚫 REVOCATION
+# ============================================================
+
+def revocation_key(user_id):
+    return f"jwt:revoked:{user_id}"
+
+
+def revoked_at(user_id):
+    """When the user's tokens were last revoked (a timestamp), or None."""
+    return cache.get(revocation_key(user_id))
+
+
+def revoke_tokens(user_ids):
+    """
+    Invalidate the claims of every token already issued to `user_ids`.
+
+    The time of the revocation is stored per user; access tokens whose
+    claims were read at or before it are refused in token-user mode. The
+    entry only has to outlive the access tokens issued before it: once it
+    expires, every token it could refuse has expired too, and a later
+    revocation records a later time rather than starting over.
+    """
+    timeout = int(settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds())
+    now = time.time()
+    cache.set_many({revocation_key(user_id): now for user_id in set(user_ids)}, timeout)
+
+
+def is_revoked(token):
+    user_id = User._meta.pk.to_python(token[api_settings.USER_ID_CLAIM])
+    revoked = revoked_at(user_id)
+    return revoked is not None and token.get("rv", 0) <= revoked
+
+
+# ============================================================
+# 🔁 TOKEN SERIALIZERS
+# ============================================================
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair endpoint serializer that embeds the role claims."""
+
+    @classmethod
+    def get_token(cls, user):
+        return tokens_for_user(user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Issues the new access token with claims re-read from the database,
+    so role changes are picked up at the next refresh.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.get(**{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]})
+        for name, value in user_claims(user).items():
+            refresh[name] = value
+        data["access"] = str(refresh.access_token)
+        return data
@@ -9,9 +9,9 @@ from rest_framework.views import APIView
 from rest_framework.generics import CreateAPIView, GenericAPIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import User
+from .tokens import tokens_for_user
 from .serializers import (
     CreateUserSerializer,
     SessionLoginSerializer,
@@ -47,7 +47,7 @@ class SessionLoginView(APIView):
     POST /api/accounts/session-login/
     --------------------------------
     Logs in a user using Django's session authentication.
-    Also returns JWT tokens for API access.
+    Also returns JWT tokens (with role claims) for API access.
     """
     permission_classes = []
 
@@ -57,7 +57,7 @@ class SessionLoginView(APIView):
         user = serializer.validated_data["user"]
 
         login(request, user)
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
 
         return Response({
             "message": "Login successful",
@@ -98,7 +98,8 @@ class JWTLoginView(APIView):
     """
     POST /api/accounts/jwt-login/
     --------------------------------
-    Authenticates the user and returns a JWT token pair.
+    Authenticates the user and returns a JWT token pair carrying the
+    user's role, student id and linked child ids as claims.
     """
     permission_classes = []
 
@@ -107,7 +108,7 @@ class JWTLoginView(APIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
 
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
 
         return Response({
             "message": "Login successful",
@@ -0,0 +1,13 @@
+from django.contrib import admin
+from .models import Job
+
+
+# ============================================================
+# ⏳ JOB ADMIN CONFIGURATION
+# ============================================================
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "priority", "attempts", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("locked_by", "locked_at", "result", "error", "created_at", "finished_at")
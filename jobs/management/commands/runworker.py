@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+import signal
+import socket
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobs.services import requeue_stale, work
+from jobs.worker import run_worker
+
+
+class Command(BaseCommand):
+    """
+    Runs background job workers.
+
+    Usage:
+        python manage.py runworker
+        python manage.py runworker --processes 4 --poll-interval 0.5
+        python manage.py runworker --once
+
+    Each process claims jobs one at a time, highest priority first.
+    SIGINT/SIGTERM let running jobs finish before the workers exit.
+    """
+    help = "Process queued background jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1,
+                            help="Worker processes to run.")
+        parser.add_argument("--poll-interval", type=float, default=1.0,
+                            help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true",
+                            help="Drain the queue in this process and exit.")
+
+    def handle(self, *args, **options):
+        if options["processes"] < 1:
+            raise CommandError("--processes must be at least 1.")
+        requeued = requeue_stale()
+        if requeued:
+            self.stdout.write(f"Re-queued {requeued} stale jobs.")
+
+        if options["once"]:
+            done = work(self._name(0), once=True)
+            self.stdout.write(self.style.SUCCESS(f"Ran {done} jobs."))
+            return
+
+        # Children must open their own database connections
+        connections.close_all()
+        # Spawned the same way on every platform; each child sets Django up itself
+        context = multiprocessing.get_context("spawn")
+        settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "SMART_EDUP.settings")
+        workers = [
+            context.Process(
+                target=run_worker,
+                args=(settings_module, self._name(index), options["poll_interval"]),
+                daemon=False,
+            )
+            for index in range(options["processes"])
+        ]
+        for process in workers:
+            process.start()
+        self.stdout.write(self.style.SUCCESS(f"Started {len(workers)} workers."))
+
+        def forward(signum, frame):
+            for process in workers:
+                if process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGINT, forward)
+        signal.signal(signal.SIGTERM, forward)
+        for process in workers:
+            process.join()
+        self.stdout.write("Workers stopped.")
+
+    def _name(self, index):
+        return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
@@ -0,0 +1,42 @@
+# ============================================================
+# 🧩 JOB HANDLERS
+# ============================================================
+
+_handlers = {}
+_permissions = {}
+
+
+def register(kind, permission_classes=()):
+    """
+    Register a function as the handler for jobs of `kind`:
+
+        @register("report_card")
+        def render(payload, job):
+            ...
+            return {"file": "..."}
+
+    The handler gets the job's JSON payload and the Job itself, and
+    returns a JSON-serializable result. Raising marks the attempt failed.
+    A result holding "file" (a path) can be downloaded from the jobs API.
+
+    `permission_classes` are checked when the job is submitted through
+    the jobs API; give the ones of the endpoint that queues the same work.
+    """
+    def decorator(handler):
+        _handlers[kind] = handler
+        _permissions[kind] = tuple(permission_classes)
+        return handler
+    return decorator
+
+
+def get_handler(kind):
+    return _handlers.get(kind)
+
+
+def get_permissions(kind):
+    """Permission instances a caller must pass to submit `kind` through the jobs API."""
+    return [permission() for permission in _permissions.get(kind, ())]
+
+
+def registered_kinds():
+    return sorted(_handlers)
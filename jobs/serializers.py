@@ -0,0 +1,30 @@
+from rest_framework import serializers
+from .models import Job
+from .registry import registered_kinds
+
+
+# ============================================================
+# 📌 Job Serializers
+# ============================================================
+class JobSerializer(serializers.ModelSerializer):
+    """Read-only view of a job's state for polling."""
+    class Meta:
+        model = Job
+        fields = [
+            "id", "kind", "payload", "status", "priority", "attempts", "max_attempts",
+            "result", "error", "created_at", "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class JobSubmitSerializer(serializers.Serializer):
+    kind = serializers.CharField(max_length=50)
+    payload = serializers.DictField(required=False, default=dict)
+    priority = serializers.IntegerField(required=False, default=0, min_value=-100, max_value=100)
+
+    def validate_kind(self, value):
+        if value not in registered_kinds():
+            raise serializers.ValidationError(
+                f"Unknown job kind. Choose one of: {', '.join(registered_kinds())}."
+            )
+        return value
@@ -0,0 +1,178 @@
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_handler
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the first retry; doubles with every failed attempt.
+RETRY_DELAY_SECONDS = 10
+
+# A running job's locked_at is refreshed this often (override with the
+# JOB_HEARTBEAT_SECONDS setting) ...
+HEARTBEAT_SECONDS = 60
+
+# ... so a RUNNING job whose worker has been silent this long is lost.
+STALE_AFTER = timedelta(minutes=5)
+
+
+# ============================================================
+# 📥 SUBMITTING
+# ============================================================
+
+def enqueue(kind, payload=None, priority=0, created_by=None, max_attempts=3):
+    """Queue a job of a registered kind and return it."""
+    if get_handler(kind) is None:
+        raise ValueError(f"Unknown job kind '{kind}'.")
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        priority=priority,
+        max_attempts=max_attempts,
+        created_by=created_by,
+    )
+
+
+# ============================================================
+# ⚙️ RUNNING
+# ============================================================
+
+def claim_next(worker):
+    """
+    Claim the most urgent runnable job for `worker`, or return None.
+
+    The claim is a conditional UPDATE on the job's QUEUED status, so two
+    workers racing for the same row cannot both win on any database.
+    """
+    while True:
+        now = timezone.now()
+        candidate = (
+            Job.objects.filter(status=Job.QUEUED, run_after__lte=now)
+            .order_by('-priority', 'id')
+            .values_list('id', flat=True)
+            .first()
+        )
+        if candidate is None:
+            return None
+        claimed = Job.objects.filter(pk=candidate, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=candidate)
+
+
+def run_job(job):
+    """
+    Run a claimed job's handler and record the outcome. Failed attempts
+    are re-queued with exponential backoff until `max_attempts` is used.
+    """
+    handler = get_handler(job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind '{job.kind}'.")
+        with heartbeat(job):
+            result = handler(job.payload, job)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            delay = RETRY_DELAY_SECONDS * 2 ** (job.attempts - 1)
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+        logger.warning("Job %s attempt %s failed", job.pk, job.attempts, exc_info=True)
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.error = ""
+        job.finished_at = timezone.now()
+    job.locked_by = ""
+    job.locked_at = None
+    job.save(update_fields=[
+        'status', 'result', 'error', 'run_after', 'finished_at', 'locked_by', 'locked_at',
+    ])
+    return job
+
+
+@contextmanager
+def heartbeat(job):
+    """
+    Refresh the claimed job's locked_at from a background thread while
+    the block runs, so requeue_stale() can tell a long job from a lost one.
+    """
+    interval = getattr(settings, "JOB_HEARTBEAT_SECONDS", HEARTBEAT_SECONDS)
+    stopped = threading.Event()
+
+    def beat():
+        try:
+            while not stopped.wait(interval):
+                Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+                    locked_at=timezone.now()
+                )
+        except Exception:
+            logger.warning("Heartbeat for job %s failed", job.pk, exc_info=True)
+        finally:
+            # Connections are per thread; close the one this thread opened
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name=f"job-{job.pk}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def requeue_stale(older_than=STALE_AFTER):
+    """
+    Put RUNNING jobs whose worker disappeared back on the queue. The lost
+    run already counted as an attempt when it was claimed, so jobs that
+    have used up `max_attempts` are marked FAILED instead of retried.
+    Returns the number of jobs re-queued.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, locked_at__lt=now - older_than)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED,
+        error="Worker stopped responding while running the job.",
+        finished_at=now,
+        locked_by="",
+        locked_at=None,
+    )
+    if failed:
+        logger.warning("Marked %s stale jobs failed after their last attempt", failed)
+    return stale.update(status=Job.QUEUED, locked_by="", locked_at=None)
+
+
+def work(worker, stop=lambda: False, idle=lambda: None, once=False):
+    """
+    Claim and run jobs until `stop()` is true. `idle()` is called when
+    the queue is empty; with `once` the loop exits instead.
+    Returns the number of jobs run.
+    """
+    done = 0
+    while not stop():
+        job = claim_next(worker)
+        if job is None:
+            if once:
+                break
+            idle()
+            continue
+        run_job(job)
+        done += 1
+    return done
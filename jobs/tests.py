@@ -0,0 +1,184 @@
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from performance.models import Mark
+from performance.tests import make_class
+from .models import Job
+from .registry import register
+from .services import claim_next, enqueue, requeue_stale, run_job, work
+
+
+calls = []
+
+
+@register("test_echo")
+def echo(payload, job):
+    calls.append(payload)
+    return {"echo": payload}
+
+
+@register("test_fail")
+def fail(payload, job):
+    raise RuntimeError("boom")
+
+
+@register("test_slow")
+def slow(payload, job):
+    time.sleep(payload["seconds"])
+    # What a runworker starting now would see
+    return {"requeued": requeue_stale(older_than=timezone.timedelta(seconds=1))}
+
+
+# ============================================================
+# ⚙️ QUEUE
+# ============================================================
+class JobQueueTests(TestCase):
+    def test_jobs_are_claimed_by_priority_then_age(self):
+        low = enqueue("test_echo", {"n": 1})
+        high = enqueue("test_echo", {"n": 2}, priority=5)
+        later = enqueue("test_echo", {"n": 3}, priority=5)
+
+        order = [claim_next("w1").pk for _ in range(3)]
+
+        self.assertEqual(order, [high.pk, later.pk, low.pk])
+        self.assertIsNone(claim_next("w2"))
+        self.assertEqual(Job.objects.get(pk=low.pk).locked_by, "w1")
+
+    def test_failures_retry_with_backoff_then_fail(self):
+        job = enqueue("test_fail", max_attempts=2)
+
+        with self.assertLogs("jobs.services", "WARNING"):
+            run_job(claim_next("w"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("boom", job.error)
+        self.assertIsNone(claim_next("w"))
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs("jobs.services", "WARNING"):
+            run_job(claim_next("w"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_work_drains_queue_and_stale_jobs_are_requeued(self):
+        calls.clear()
+        enqueue("test_echo", {"n": 1})
+        stuck = enqueue("test_echo", {"n": 2})
+        Job.objects.filter(pk=stuck.pk).update(
+            status=Job.RUNNING, locked_at=timezone.now() - timezone.timedelta(hours=1)
+        )
+
+        self.assertEqual(work("w", once=True), 1)
+        self.assertEqual(requeue_stale(), 1)
+        out = StringIO()
+        call_command("runworker", once=True, stdout=out)
+
+        self.assertEqual(calls, [{"n": 1}, {"n": 2}])
+        self.assertEqual(set(Job.objects.values_list("status", flat=True)), {Job.SUCCEEDED})
+        self.assertIn("Ran 1 jobs", out.getvalue())
+
+    def test_stale_job_on_its_last_attempt_fails(self):
+        stale = timezone.now() - timezone.timedelta(hours=1)
+        lost = enqueue("test_echo", {"n": 1}, max_attempts=2)
+        retried = enqueue("test_echo", {"n": 2}, max_attempts=2)
+        Job.objects.filter(pk=lost.pk).update(status=Job.RUNNING, attempts=2, locked_at=stale)
+        Job.objects.filter(pk=retried.pk).update(status=Job.RUNNING, attempts=1, locked_at=stale)
+
+        with self.assertLogs("jobs.services", "WARNING"):
+            self.assertEqual(requeue_stale(), 1)
+
+        lost.refresh_from_db()
+        retried.refresh_from_db()
+        self.assertEqual(lost.status, Job.FAILED)
+        self.assertIsNotNone(lost.finished_at)
+        self.assertEqual(retried.status, Job.QUEUED)
+
+
+class HeartbeatTests(TransactionTestCase):
+    @override_settings(JOB_HEARTBEAT_SECONDS=0.05)
+    def test_running_job_is_not_requeued(self):
+        job = enqueue("test_slow", {"seconds": 0.3})
+        claimed = claim_next("w")
+        # Claimed long ago: only the heartbeat keeps it from looking lost
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timezone.timedelta(hours=1))
+
+        run_job(claimed)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (Job.SUCCEEDED, {"requeued": 0}))
+
+
+# ============================================================
+# 🌐 API
+# ============================================================
+class JobApiTests(APITestCase):
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        settings_override = override_settings(REPORT_CARD_CACHE_DIR=cache_dir, JOB_RESULTS_DIR=cache_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_submit_and_poll(self):
+        response = self.client.post(reverse("job-submit"), {"kind": "test_echo", "payload": {"a": 1}},
+                                    format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], Job.QUEUED)
+
+        work("w", once=True)
+        detail = self.client.get(response.data["url"])
+        self.assertEqual(detail.data["status"], Job.SUCCEEDED)
+        self.assertEqual(detail.data["result"], {"echo": {"a": 1}})
+
+        unknown = self.client.post(reverse("job-submit"), {"kind": "nope"}, format="json")
+        self.assertEqual(unknown.status_code, 400)
+
+    def test_guarded_kinds_need_their_endpoints_permission(self):
+        submit = {"kind": "report_cards", "payload": {"standard_id": 1}}
+        self.assertEqual(self.client.post(reverse("job-submit"), submit, format="json").status_code, 401)
+
+        self.client.force_authenticate(User.objects.create(username="pupil", role="STUDENT"))
+        for kind in ("report_cards", "roster_import"):
+            response = self.client.post(reverse("job-submit"), {**submit, "kind": kind}, format="json")
+            self.assertEqual(response.status_code, 403)
+
+        self.client.force_authenticate(User.objects.create(username="teacher", role="TEACHER"))
+        self.assertEqual(self.client.post(reverse("job-submit"), submit, format="json").status_code, 202)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_report_card_job_produces_downloadable_pdf(self):
+        exam, students, subjects = make_class(students=1, subjects=1)
+        Mark.objects.create(exam=exam, student=students[0], subject=subjects[0],
+                            marks_obtained=Decimal("30"), max_marks=Decimal("50"))
+
+        response = self.client.post(reverse("report-card", args=[students[0].id]))
+        self.assertEqual(response.status_code, 202)
+        work("w", once=True)
+
+        download = self.client.get(reverse("job-result", args=[response.data["id"]]))
+        self.assertEqual(download.status_code, 200)
+        self.assertTrue(b"".join(download.streaming_content).startswith(b"%PDF"))
+
+    def test_batch_job_from_report_cards_endpoint(self):
+        exam, students, subjects = make_class(students=2, subjects=1)
+        self.client.force_authenticate(User.objects.create(username="teacher", role="TEACHER"))
+
+        response = self.client.post(reverse("report-card-batch"), {"section": exam.section_id},
+                                    format="json")
+        self.assertEqual(response.status_code, 202)
+        work("w", once=True)
+
+        job = Job.objects.get(pk=response.data["id"])
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result["students"], 2)
@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import JobSubmitView, JobDetailView, JobResultView
+
+
+# ============================================================
+# ⏳ BACKGROUND JOB ROUTES
+# ============================================================
+
+urlpatterns = [
+    path("", JobSubmitView.as_view(), name="job-submit"),
+    path("<int:pk>/", JobDetailView.as_view(), name="job-detail"),
+    path("<int:pk>/result/", JobResultView.as_view(), name="job-result"),
+]
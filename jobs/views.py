@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Job
+from .registry import get_permissions
+from .serializers import JobSerializer, JobSubmitSerializer
+from .services import enqueue
+
+
+# ----------------------------
+# Job Submit View
+# ----------------------------
+class JobSubmitView(APIView):
+    """
+    POST {"kind": "report_card", "payload": {"student_id": 3}, "priority": 0}
+    queues a job and returns 202 with its id; poll the status URL for the
+    outcome. Kinds registered with permission_classes are refused to
+    callers who could not queue them through their own endpoint.
+    """
+    # permission_classes = [IsAuthenticated]
+    permission_classes = []
+
+    def post(self, request):
+        serializer = JobSubmitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Each kind needs the permissions of the endpoint that queues it
+        for permission in get_permissions(serializer.validated_data["kind"]):
+            if not permission.has_permission(request, self):
+                self.permission_denied(request, message=getattr(permission, "message", None))
+        job = enqueue(
+            created_by=request.user if request.user.is_authenticated else None,
+            **serializer.validated_data,
+        )
+        data = JobSerializer(job).data
+        data["url"] = request.build_absolute_uri(reverse("job-detail", args=[job.pk]))
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+
+# ----------------------------
+# Job Status View
+# ----------------------------
+class JobDetailView(APIView):
+    """GET a job's status, result and last error."""
+    # permission_classes = [IsAuthenticated]
+    permission_classes = []
+
+    def get(self, request, pk):
+        return Response(JobSerializer(get_object_or_404(Job, pk=pk)).data)
+
+
+# ----------------------------
+# Job Result Download View
+# ----------------------------
+class JobResultView(APIView):
+    """GET the file produced by a finished job."""
+    # permission_classes = [IsAuthenticated]
+    permission_classes = []
+
+    def get(self, request, pk):
+        job = get_object_or_404(Job, pk=pk, status=Job.SUCCEEDED)
+        path = Path((job.result or {}).get("file", ""))
+        if not path.is_file():
+            raise NotFound("This job has no downloadable result.")
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=job.result.get("filename", path.name),
+            content_type=job.result.get("content_type", "application/octet-stream"),
+        )
@@ -0,0 +1,27 @@
+import os
+import signal
+import time
+
+
+# ============================================================
+# 👷 WORKER PROCESSES
+# ============================================================
+# runworker starts these in spawned processes, so nothing here may import
+# models before the process has set Django up.
+
+def run_worker(settings_module, worker, poll_interval):
+    """Set Django up in a fresh process and work the queue until SIGINT/SIGTERM."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+    from django.db import connections
+    from .services import work
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.append(signum))
+    try:
+        work(worker, stop=lambda: bool(stopping), idle=lambda: time.sleep(poll_interval))
+    finally:
+        connections.close_all()
@@ -1,3 +1,23 @@
 from django.contrib import admin
+from .models import GradeScale, GradeBoundary
 
-# Register your models here.
+
+# ============================================================
+# 🎓 GRADE SCALE ADMIN CONFIGURATION
+# ============================================================
+
+class GradeBoundaryInline(admin.TabularInline):
+    """Edit a scale's grade boundaries inline."""
+    model = GradeBoundary
+    extra = 0
+
+
+@admin.register(GradeScale)
+class GradeScaleAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for grade scales.
+    Run `manage.py regrade_marks` after changing a scale to apply it to
+    existing marks.
+    """
+    list_display = ("name", "standard", "updated_at")
+    inlines = [GradeBoundaryInline]
@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Max, Min, Q, Sum
+from django.db.models.functions import Cast
+
+from .models import Mark, SectionSubjectAggregate
+
+
+# ============================================================
+# 📊 SECTION SUBJECT AGGREGATES
+# ============================================================
+
+def _aggregate_rows(marks):
+    percentage = Cast(F("marks_obtained"), FloatField()) * 100 / Cast(F("max_marks"), FloatField())
+    return (
+        marks.annotate(percentage=percentage)
+        .order_by()
+        .values("exam_id", "exam__section_id", "subject_id")
+        .annotate(
+            count=Count("id"),
+            sum_marks=Sum("marks_obtained"),
+            sum_percentage=Sum("percentage"),
+            sum_squares=Sum(F("percentage") * F("percentage")),
+            min_percentage=Min("percentage"),
+            max_percentage=Max("percentage"),
+        )
+    )
+
+
+def _to_aggregate(row):
+    return SectionSubjectAggregate(
+        exam_id=row["exam_id"],
+        section_id=row["exam__section_id"],
+        subject_id=row["subject_id"],
+        count=row["count"],
+        sum_marks=row["sum_marks"],
+        sum_percentage=row["sum_percentage"],
+        sum_squares=row["sum_squares"],
+        min_percentage=row["min_percentage"],
+        max_percentage=row["max_percentage"],
+    )
+
+
+def refresh_mark_aggregates(keys):
+    """
+    Recompute the aggregate rows touched by a set of mark writes.
+
+    `keys` is an iterable of (exam id, subject id) pairs that were
+    created, changed or deleted. Only those groups are recomputed from
+    Mark and rewritten; groups left without marks disappear. Call inside
+    the same transaction as the write.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+
+    scope = Q()
+    for exam_id, subject_id in keys:
+        scope |= Q(exam_id=exam_id, subject_id=subject_id)
+    aggregates = [_to_aggregate(row) for row in _aggregate_rows(Mark.objects.filter(scope))]
+
+    SectionSubjectAggregate.objects.filter(scope).delete()
+    SectionSubjectAggregate.objects.bulk_create(aggregates)
+
+
+def rebuild_mark_aggregates(batch_size=1000):
+    """Rebuild every aggregate row from Mark. Returns the number of rows."""
+    with transaction.atomic():
+        SectionSubjectAggregate.objects.all().delete()
+        aggregates = SectionSubjectAggregate.objects.bulk_create(
+            (_to_aggregate(row) for row in _aggregate_rows(Mark.objects.all())),
+            batch_size=batch_size,
+        )
+    return len(aggregates)
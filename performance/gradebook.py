@@ -0,0 +1,87 @@
+import numpy as np
+
+from .models import Mark
+
+
+# ============================================================
+# 📒 GRADEBOOK MATRIX
+# ============================================================
+
+GRADEBOOK_COLUMNS = (
+    "exam__name", "exam__date", "exam__standard__name", "exam__section__name",
+    "student_id", "student__user__first_name", "student__user__last_name",
+    "subject_id", "subject__name", "subject__code",
+    "marks_obtained", "max_marks", "grade",
+)
+
+
+def _cells(matrix, filled):
+    """Turn a 2-D array into nested lists with None for empty cells."""
+    return [
+        [value if present else None for value, present in zip(row, mask)]
+        for row, mask in zip(matrix.tolist(), filled.tolist())
+    ]
+
+
+def build_gradebook(exam_id):
+    """
+    Pivot an exam's marks into a students x subjects grid.
+
+    Everything comes from one values_list() fetch; NumPy maps each mark
+    to its (row, column) cell. Rows are ordered by student name and
+    columns by subject name. Returns None when the exam has no marks.
+    """
+    rows = list(
+        Mark.objects.filter(exam_id=exam_id).order_by().values_list(*GRADEBOOK_COLUMNS)
+    )
+    if not rows:
+        return None
+
+    exam_name, exam_date, standard_name, section_name = rows[0][:4]
+    (_, _, _, _, student_ids, first_names, last_names,
+     subject_ids, subject_names, subject_codes, obtained, maximum, grades) = zip(*rows)
+
+    students = {}
+    subjects = {}
+    for student_id, first_name, last_name, subject_id, name, code in zip(
+        student_ids, first_names, last_names, subject_ids, subject_names, subject_codes
+    ):
+        students[student_id] = f"{first_name} {last_name}".strip()
+        subjects[subject_id] = (name, code)
+    student_order = sorted(students, key=lambda pk: (students[pk].lower(), pk))
+    subject_order = sorted(subjects, key=lambda pk: (subjects[pk][0].lower(), pk))
+
+    # Position of every id in the sorted headers, then one lookup per mark
+    student_keys = np.array(student_order, dtype=np.int64)
+    subject_keys = np.array(subject_order, dtype=np.int64)
+    student_sorter = np.argsort(student_keys)
+    subject_sorter = np.argsort(subject_keys)
+    row_index = student_sorter[np.searchsorted(student_keys, student_ids, sorter=student_sorter)]
+    column_index = subject_sorter[np.searchsorted(subject_keys, subject_ids, sorter=subject_sorter)]
+
+    shape = (len(student_order), len(subject_order))
+    filled = np.zeros(shape, dtype=bool)
+    marks = np.zeros(shape, dtype=np.float64)
+    max_marks = np.zeros(shape, dtype=np.float64)
+    grade_cells = np.full(shape, None, dtype=object)
+    filled[row_index, column_index] = True
+    marks[row_index, column_index] = np.array(obtained, dtype=np.float64)
+    max_marks[row_index, column_index] = np.array(maximum, dtype=np.float64)
+    grade_cells[row_index, column_index] = np.array(grades, dtype=object)
+
+    return {
+        "exam": {
+            "id": exam_id,
+            "name": exam_name,
+            "date": exam_date,
+            "standard": standard_name,
+            "section": section_name,
+        },
+        "students": [{"id": pk, "name": students[pk]} for pk in student_order],
+        "subjects": [
+            {"id": pk, "name": subjects[pk][0], "code": subjects[pk][1]} for pk in subject_order
+        ],
+        "marks": _cells(marks, filled),
+        "max_marks": _cells(max_marks, filled),
+        "grades": grade_cells.tolist(),
+    }
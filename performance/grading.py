@@ -0,0 +1,127 @@
+import threading
+import time
+from bisect import bisect_right
+from decimal import Decimal
+
+import numpy as np
+
+
+# ============================================================
+# 🎓 GRADE SCALES
+# ============================================================
+
+# Built-in scale, used until a GradeScale row exists.
+# Lower percentage bound of every grade above the lowest one, ascending.
+GRADE_BOUNDARIES = [45, 60, 75, 90]
+GRADE_LABELS = ["D", "C", "B", "A", "A+"]
+
+# Seconds a process keeps its compiled scales before reloading them.
+# Edits made in the same process invalidate the cache immediately.
+SCALE_CACHE_SECONDS = 300
+
+
+class CompiledScale:
+    """
+    A grade scale as sorted boundary arrays ready for bisect.
+
+    `bounds` holds the lower bound of every grade except the lowest,
+    ascending, and `labels` holds one more entry than `bounds`.
+    """
+    __slots__ = ("bounds", "labels", "hundredths")
+
+    def __init__(self, bounds, labels):
+        self.bounds = [Decimal(bound) for bound in bounds]
+        self.labels = list(labels)
+        self.hundredths = np.array(
+            [int(bound * 100) for bound in self.bounds], dtype=np.int64
+        )
+
+    @classmethod
+    def from_boundaries(cls, boundaries):
+        """Build from (grade, min_percentage) pairs in any order."""
+        ordered = sorted(boundaries, key=lambda pair: pair[1])
+        return cls([bound for _, bound in ordered[1:]], [grade for grade, _ in ordered])
+
+    def grade(self, percentage):
+        return self.labels[bisect_right(self.bounds, percentage)]
+
+
+DEFAULT_SCALE = CompiledScale(GRADE_BOUNDARIES, GRADE_LABELS)
+
+_cache = {"scales": None, "loaded_at": 0.0}
+_cache_lock = threading.Lock()
+
+
+def _load_scales():
+    """Compile every stored scale, keyed by standard id (None = default)."""
+    from .models import GradeBoundary
+
+    boundaries = {}
+    rows = GradeBoundary.objects.values_list(
+        "scale__standard_id", "grade", "min_percentage"
+    )
+    for standard_id, grade, bound in rows:
+        boundaries.setdefault(standard_id, []).append((grade, bound))
+    return {
+        standard_id: CompiledScale.from_boundaries(pairs)
+        for standard_id, pairs in boundaries.items()
+    }
+
+
+def clear_scale_cache():
+    """Forget compiled scales so the next lookup reloads them."""
+    with _cache_lock:
+        _cache["scales"] = None
+
+
+def get_scales():
+    """Return {standard id or None: CompiledScale}, loading at most once per TTL."""
+    with _cache_lock:
+        expired = time.monotonic() - _cache["loaded_at"] > SCALE_CACHE_SECONDS
+        if _cache["scales"] is None or expired:
+            _cache["scales"] = _load_scales()
+            _cache["loaded_at"] = time.monotonic()
+        return _cache["scales"]
+
+
+def get_scale(standard_id=None):
+    """Return the scale for a standard, falling back to the default scale."""
+    scales = get_scales()
+    return scales.get(standard_id) or scales.get(None) or DEFAULT_SCALE
+
+
+# ============================================================
+# 🧮 GRADE COMPUTATION
+# ============================================================
+
+def grade_for(marks_obtained, max_marks, standard_id=None):
+    """Return the grade for a single mark using a bisect over the boundaries."""
+    percentage = (Decimal(marks_obtained) / Decimal(max_marks)) * 100
+    return get_scale(standard_id).grade(percentage)
+
+
+def grades_for(marks_obtained, max_marks, standard_ids=None):
+    """
+    Return grades for a whole batch of marks at once.
+
+    Values are scaled to integer hundredths so every boundary test is an
+    exact integer comparison (`obtained * 100 >= boundary * max`),
+    giving the same result as grade_for() without per-row Decimal math.
+    `standard_ids` picks the scale per row; omit it to use the default.
+    """
+    if not len(marks_obtained):
+        return []
+    obtained = np.array([int(Decimal(value) * 100) for value in marks_obtained], dtype=np.int64)
+    maximum = np.array([int(Decimal(value) * 100) for value in max_marks], dtype=np.int64)
+    if standard_ids is None:
+        standard_ids = [None] * len(obtained)
+
+    grades = np.empty(len(obtained), dtype=object)
+    for standard_id in set(standard_ids):
+        scale = get_scale(standard_id)
+        rows = np.array([value == standard_id for value in standard_ids])
+        passed = (obtained[rows, None] * 10000) >= (
+            scale.hundredths[None, :] * maximum[rows, None]
+        )
+        grades[rows] = np.array(scale.labels, dtype=object)[passed.sum(axis=1)]
+    return grades.tolist()
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from performance.models import Exam
+from performance.ranking import compute_exam_ranks
+
+
+class Command(BaseCommand):
+    """
+    Recomputes stored class ranks for finalized exams.
+
+    Usage:
+        python manage.py compute_exam_ranks
+        python manage.py compute_exam_ranks --exam 4 --exam 7
+
+    Exams are normally ranked when finalized; use this to backfill or to
+    repair ranks after bulk data changes made outside the app.
+    """
+    help = "Recompute stored class ranks for finalized exams."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--exam", type=int, action="append", default=None,
+                            help="Only rank this exam id (repeatable); need not be finalized.")
+
+    def handle(self, *args, **options):
+        if options["exam"]:
+            exam_ids = options["exam"]
+        else:
+            exam_ids = Exam.objects.filter(is_finalized=True).values_list("id", flat=True)
+
+        total = 0
+        for exam_id in exam_ids:
+            total += compute_exam_ranks(exam_id)
+        self.stdout.write(self.style.SUCCESS(f"Stored {total} ranks."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from performance.aggregates import rebuild_mark_aggregates
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the exam x section x subject mark aggregates.
+
+    Usage:
+        python manage.py rebuild_mark_aggregates
+    """
+    help = "Rebuild section subject aggregates from the raw Mark rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Rows per INSERT statement.")
+
+    def handle(self, *args, **options):
+        rows = rebuild_mark_aggregates(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} section subject aggregate rows."))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from performance.services import regrade_marks
+
+
+class Command(BaseCommand):
+    """
+    Re-applies the stored grade scales to every Mark.
+
+    Usage:
+        python manage.py regrade_marks
+        python manage.py regrade_marks --standard 3 --chunk-size 10000
+
+    Grades are rewritten with chunked set-based UPDATEs, so no Mark is
+    loaded into Python.
+    """
+    help = "Regrade all marks with the current grade scales."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000,
+                            help="Primary keys covered by each UPDATE statement.")
+        parser.add_argument("--standard", type=int, default=None,
+                            help="Only regrade marks of exams for this standard id.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        def progress(scale, done, changed):
+            self.stdout.write(f"[{scale}] {done:6.1%} scanned, {changed} grades changed")
+
+        changed = regrade_marks(
+            chunk_size=options["chunk_size"],
+            standard_id=options["standard"],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Regraded marks in {time.perf_counter() - started:.2f}s; {changed} grades changed."
+        ))
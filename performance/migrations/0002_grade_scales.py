@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+DEFAULT_BOUNDARIES = [("D", 0), ("C", 45), ("B", 60), ("A", 75), ("A+", 90)]
+
+
+def create_default_scale(apps, schema_editor):
+    """Seed the default scale with the thresholds Mark.save() used to hard-code."""
+    GradeScale = apps.get_model('performance', 'GradeScale')
+    GradeBoundary = apps.get_model('performance', 'GradeBoundary')
+    scale = GradeScale.objects.create(name='Default')
+    GradeBoundary.objects.bulk_create(
+        GradeBoundary(scale=scale, grade=grade, min_percentage=bound)
+        for grade, bound in DEFAULT_BOUNDARIES
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0001_initial'),
+        ('students', '0005_attendancequeue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeScale',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('standard', models.OneToOneField(blank=True, help_text='Leave empty for the default scale', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='grade_scale', to='students.standard')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GradeBoundary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grade', models.CharField(max_length=3)),
+                ('min_percentage', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('scale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='boundaries', to='performance.gradescale')),
+            ],
+            options={
+                'ordering': ['scale', 'min_percentage'],
+                'unique_together': {('scale', 'grade'), ('scale', 'min_percentage')},
+            },
+        ),
+        migrations.RunPython(create_default_scale, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0002_grade_scales'),
+        ('students', '0005_attendancequeue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam',
+            name='is_finalized',
+            field=models.BooleanField(default=False, help_text='Marks are final; class ranks have been computed'),
+        ),
+        migrations.CreateModel(
+            name='StudentExamRank',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(help_text='1 = top; ties share a rank')),
+                ('percentile', models.DecimalField(decimal_places=2, help_text='Percentage of the class scoring lower', max_digits=5)),
+                ('class_size', models.PositiveSmallIntegerField()),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranks', to='performance.exam')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_ranks', to='students.student')),
+                ('subject', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exam_ranks', to='students.subject')),
+            ],
+            options={
+                'ordering': ['exam', 'subject', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('exam', 'student', 'subject'), name='unique_subject_exam_rank'), models.UniqueConstraint(condition=models.Q(('subject__isnull', True)), fields=('exam', 'student'), name='unique_overall_exam_rank')],
+            },
+        ),
+    ]
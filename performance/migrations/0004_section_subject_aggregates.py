@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, FloatField, Max, Min, Sum
+from django.db.models.functions import Cast
+
+
+def build_aggregates(apps, schema_editor):
+    """Populate the aggregates from marks entered before they existed."""
+    Mark = apps.get_model('performance', 'Mark')
+    SectionSubjectAggregate = apps.get_model('performance', 'SectionSubjectAggregate')
+    percentage = Cast(F('marks_obtained'), FloatField()) * 100 / Cast(F('max_marks'), FloatField())
+    rows = (
+        Mark.objects.annotate(percentage=percentage)
+        .order_by().values('exam_id', 'exam__section_id', 'subject_id')
+        .annotate(
+            count=Count('id'),
+            sum_marks=Sum('marks_obtained'),
+            sum_percentage=Sum('percentage'),
+            sum_squares=Sum(F('percentage') * F('percentage')),
+            min_percentage=Min('percentage'),
+            max_percentage=Max('percentage'),
+        )
+    )
+    SectionSubjectAggregate.objects.bulk_create(
+        (
+            SectionSubjectAggregate(
+                exam_id=row['exam_id'],
+                section_id=row['exam__section_id'],
+                subject_id=row['subject_id'],
+                count=row['count'],
+                sum_marks=row['sum_marks'],
+                sum_percentage=row['sum_percentage'],
+                sum_squares=row['sum_squares'],
+                min_percentage=row['min_percentage'],
+                max_percentage=row['max_percentage'],
+            )
+            for row in rows
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('performance', '0003_exam_ranks'),
+        ('students', '0005_attendancequeue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectionSubjectAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('sum_marks', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('sum_percentage', models.FloatField(default=0)),
+                ('sum_squares', models.FloatField(default=0, help_text='Sum of squared percentages')),
+                ('min_percentage', models.FloatField(null=True)),
+                ('max_percentage', models.FloatField(null=True)),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subject_aggregates', to='performance.exam')),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subject_aggregates', to='students.section')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='section_aggregates', to='students.subject')),
+            ],
+            options={
+                'unique_together': {('exam', 'section', 'subject')},
+            },
+        ),
+        migrations.RunPython(build_aggregates, migrations.RunPython.noop),
+    ]
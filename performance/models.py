@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from accounts.models import User
 from students.models import Student, Standard, Section, Subject
+from .grading import grade_for
 
 
 # ============================================================
@@ -30,6 +31,10 @@ class Exam(models.Model):
         help_text="User who created the exam"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    is_finalized = models.BooleanField(
+        default=False,
+        help_text="Marks are final; class ranks have been computed"
+    )
 
     class Meta:
         ordering = ['-date']
@@ -39,6 +44,46 @@ class Exam(models.Model):
         return f"{self.name} - {self.standard.name} {self.section.name}"
 
 
+# ============================================================
+# 📌 Grade Scale Models
+# ============================================================
+class GradeScale(models.Model):
+    """
+    A grading policy. The scale without a standard is the school-wide
+    default; a scale linked to a standard overrides it for that standard.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    standard = models.OneToOneField(
+        Standard,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="grade_scale",
+        help_text="Leave empty for the default scale"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.standard.name if self.standard else 'default'})"
+
+
+class GradeBoundary(models.Model):
+    """
+    Lowest percentage that earns a grade within a scale.
+    The lowest boundary of a scale should be 0.
+    """
+    scale = models.ForeignKey(GradeScale, on_delete=models.CASCADE, related_name="boundaries")
+    grade = models.CharField(max_length=3)
+    min_percentage = models.DecimalField(max_digits=5, decimal_places=2)
+
+    class Meta:
+        unique_together = [('scale', 'grade'), ('scale', 'min_percentage')]
+        ordering = ['scale', 'min_percentage']
+
+    def __str__(self):
+        return f"{self.scale.name}: {self.grade} >= {self.min_percentage}%"
+
+
 # ============================================================
 # 📌 Mark Model
 # ============================================================
@@ -70,25 +115,102 @@ class Mark(models.Model):
     # --------------------------------------------------------
     # Override save to validate marks and auto-calculate grade
     # --------------------------------------------------------
-    def save(self, *args, **kwargs):
+    def save(self, *args, standard_id=None, **kwargs):
+        """
+        Validate and grade the mark before saving. Pass `standard_id` (the
+        exam's standard) when the exam is not loaded, to grade without
+        fetching it; a loaded `exam` is used as is.
+        """
         # Validation: marks_obtained cannot exceed max_marks
         if self.marks_obtained > self.max_marks:
             raise ValueError("Marks obtained cannot exceed max marks.")
 
         # Auto-calculate grade based on percentage
-        percentage = (self.marks_obtained / self.max_marks) * 100
-        if percentage >= 90:
-            self.grade = "A+"
-        elif percentage >= 75:
-            self.grade = "A"
-        elif percentage >= 60:
-            self.grade = "B"
-        elif percentage >= 45:
-            self.grade = "C"
-        else:
-            self.grade = "D"
-
-        super().save(*args, **kwargs)
+        if standard_id is None:
+            standard_id = self.exam.standard_id
+        self.grade = grade_for(self.marks_obtained, self.max_marks, standard_id)
+
+        # Section aggregates are refreshed by the post_save handler in this transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f"{self.student.user.get_full_name()} - {self.subject.name} ({self.exam.name})"
+
+
+# ============================================================
+# 📌 Stored Class Rank Model
+# ============================================================
+class StudentExamRank(models.Model):
+    """
+    A student's position within their section for one exam, computed
+    when the exam is finalized. `subject` is empty for the overall rank.
+    """
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name="ranks")
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="exam_ranks")
+    subject = models.ForeignKey(
+        Subject, on_delete=models.CASCADE, null=True, blank=True, related_name="exam_ranks"
+    )
+    rank = models.PositiveSmallIntegerField(help_text="1 = top; ties share a rank")
+    percentile = models.DecimalField(
+        max_digits=5, decimal_places=2,
+        help_text="Percentage of the class scoring lower"
+    )
+    class_size = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['exam', 'student', 'subject'], name='unique_subject_exam_rank'
+            ),
+            models.UniqueConstraint(
+                fields=['exam', 'student'],
+                condition=models.Q(subject__isnull=True),
+                name='unique_overall_exam_rank',
+            ),
+        ]
+        ordering = ['exam', 'subject', 'rank']
+
+    def __str__(self):
+        scope = self.subject.name if self.subject else "Overall"
+        return f"{self.student} - {self.exam.name} {scope}: {self.rank}/{self.class_size}"
+
+
+# ============================================================
+# 📌 Section Subject Aggregate Model
+# ============================================================
+class SectionSubjectAggregate(models.Model):
+    """
+    Running totals of mark percentages for one exam x section x subject,
+    kept in step with Mark writes so averages and spreads are O(1) reads.
+    """
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name="subject_aggregates")
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name="subject_aggregates")
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="section_aggregates")
+    count = models.PositiveIntegerField(default=0)
+    sum_marks = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    sum_percentage = models.FloatField(default=0)
+    sum_squares = models.FloatField(default=0, help_text="Sum of squared percentages")
+    min_percentage = models.FloatField(null=True)
+    max_percentage = models.FloatField(null=True)
+
+    class Meta:
+        unique_together = ('exam', 'section', 'subject')
+
+    @property
+    def mean(self):
+        return self.sum_percentage / self.count if self.count else None
+
+    @property
+    def std_dev(self):
+        if not self.count:
+            return None
+        mean = self.mean
+        return max(self.sum_squares / self.count - mean * mean, 0.0) ** 0.5
+
+    def __str__(self):
+        return f"{self.exam.name} {self.section} {self.subject.name}: {self.count} marks"
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+from .models import Mark, StudentExamRank
+
+
+# ============================================================
+# 📈 STUDENT PROGRESS
+# ============================================================
+
+# Entries are dropped whenever the student's marks or stored ranks change,
+# but only in the cache of the process that wrote them. With the default
+# per-process cache other workers keep serving their copy until it times
+# out, so the timeout stays short; raise it with the PROGRESS_CACHE_SECONDS
+# setting once CACHES is shared (see settings).
+PROGRESS_CACHE_SECONDS = 30
+
+
+def progress_key(student_id):
+    return f"progress:student:{student_id}"
+
+
+def invalidate_progress(student_ids):
+    cache.delete_many([progress_key(student_id) for student_id in student_ids])
+
+
+def build_progress(student_id):
+    """
+    Per-subject series of (exam, date, percentage, class percentile) for
+    one student, oldest exam first, as parallel columns. Built from a
+    single query; percentiles are null until an exam is finalized.
+    """
+    percentile = StudentExamRank.objects.filter(
+        exam_id=OuterRef("exam_id"),
+        student_id=OuterRef("student_id"),
+        subject_id=OuterRef("subject_id"),
+    ).values("percentile")[:1]
+    rows = (
+        Mark.objects.filter(student_id=student_id)
+        .annotate(
+            percentage=Cast(F("marks_obtained"), FloatField()) * 100
+            / Cast(F("max_marks"), FloatField()),
+            percentile=Subquery(percentile),
+        )
+        .order_by("subject__name", "subject_id", "exam__date", "exam_id")
+        .values_list("subject_id", "subject__name", "exam_id", "exam__name",
+                     "exam__date", "percentage", "percentile")
+    )
+
+    subjects = {}
+    for subject_id, subject_name, exam_id, exam_name, exam_date, percentage, rank_percentile in rows:
+        series = subjects.get(subject_id)
+        if series is None:
+            series = subjects[subject_id] = {
+                "id": subject_id, "name": subject_name,
+                "exams": [], "exam_names": [], "dates": [], "percentages": [], "percentiles": [],
+            }
+        series["exams"].append(exam_id)
+        series["exam_names"].append(exam_name)
+        series["dates"].append(exam_date.isoformat())
+        series["percentages"].append(round(percentage, 2))
+        series["percentiles"].append(None if rank_percentile is None else float(rank_percentile))
+    return {"student": student_id, "subjects": list(subjects.values())}
+
+
+def get_progress(student_id):
+    """Return build_progress() for a student, cached until their marks change."""
+    key = progress_key(student_id)
+    progress = cache.get(key)
+    if progress is None:
+        progress = build_progress(student_id)
+        cache.set(key, progress, getattr(settings, "PROGRESS_CACHE_SECONDS", PROGRESS_CACHE_SECONDS))
+    return progress
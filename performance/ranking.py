@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, FloatField, OuterRef, Subquery, Sum, Window
+from django.db.models.functions import Cast, PercentRank, Rank
+
+from .models import Exam, Mark, StudentExamRank
+from .progress import invalidate_progress
+
+
+# ============================================================
+# 🥇 CLASS RANKS
+# ============================================================
+
+def _percentage(obtained, maximum):
+    return Cast(obtained, FloatField()) * 100 / Cast(maximum, FloatField())
+
+
+def _ranked(rows, partition_by=None):
+    """Annotate `rank` (best first, ties shared) and `percentile` (share scoring lower)."""
+    partition = {"partition_by": partition_by} if partition_by else {}
+    return rows.annotate(
+        rank=Window(Rank(), order_by=F("percentage").desc(), **partition),
+        percentile=Window(PercentRank(), order_by=F("percentage").asc(), **partition),
+    )
+
+
+def compute_exam_ranks(exam_id):
+    """
+    Rank every student of an exam per subject and overall with two
+    window-function queries and replace the exam's stored ranks.
+    Returns the number of rank rows written.
+    """
+    marks = Mark.objects.filter(exam_id=exam_id).order_by()
+
+    by_subject = list(
+        _ranked(
+            marks.annotate(percentage=_percentage(F("marks_obtained"), F("max_marks"))),
+            partition_by=[F("subject_id")],
+        ).values_list("student_id", "subject_id", "rank", "percentile")
+    )
+    overall = list(
+        _ranked(
+            marks.values("student_id")
+            .annotate(percentage=_percentage(Sum("marks_obtained"), Sum("max_marks")))
+        ).values_list("student_id", "rank", "percentile")
+    )
+
+    class_sizes = {}
+    for _, subject_id, _, _ in by_subject:
+        class_sizes[subject_id] = class_sizes.get(subject_id, 0) + 1
+    class_sizes[None] = len(overall)
+
+    ranks = [
+        StudentExamRank(
+            exam_id=exam_id,
+            student_id=student_id,
+            subject_id=subject_id,
+            rank=rank,
+            percentile=round(Decimal(percentile * 100), 2),
+            class_size=class_sizes[subject_id],
+        )
+        for student_id, subject_id, rank, percentile in (
+            by_subject + [(student_id, None, rank, percentile) for student_id, rank, percentile in overall]
+        )
+    ]
+    with transaction.atomic():
+        StudentExamRank.objects.filter(exam_id=exam_id).delete()
+        StudentExamRank.objects.bulk_create(ranks, batch_size=1000)
+    # Every student's percentile may have moved
+    invalidate_progress({rank.student_id for rank in ranks})
+    return len(ranks)
+
+
+def finalize_exam(exam):
+    """Mark an exam's results as final and store its class ranks."""
+    with transaction.atomic():
+        exam.is_finalized = True
+        exam.save(update_fields=["is_finalized"])
+        return compute_exam_ranks(exam.id)
+
+
+def refresh_finalized_ranks(exam_ids):
+    """Recompute stored ranks of the finalized exams among `exam_ids` after late edits."""
+    for exam_id in Exam.objects.filter(id__in=exam_ids, is_finalized=True).values_list("id", flat=True):
+        compute_exam_ranks(exam_id)
+
+
+def with_stored_ranks(marks):
+    """
+    Annotate a Mark queryset with the stored subject and overall ranks of
+    each row's student and exam (None until the exam is finalized).
+    """
+    stored = StudentExamRank.objects.filter(exam_id=OuterRef("exam_id"), student_id=OuterRef("student_id"))
+    subject = stored.filter(subject_id=OuterRef("subject_id"))
+    overall = stored.filter(subject__isnull=True)
+    return marks.annotate(
+        subject_rank=Subquery(subject.values("rank")[:1]),
+        subject_percentile=Subquery(subject.values("percentile")[:1]),
+        exam_rank=Subquery(overall.values("rank")[:1]),
+        exam_percentile=Subquery(overall.values("percentile")[:1]),
+        class_size=Subquery(overall.values("class_size")[:1]),
+    )
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from students.models import Student, Subject
 from .models import Mark, Exam
 
 
@@ -65,6 +66,63 @@ class MarkEntrySerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+# ============================================================
+# 📌 Bulk Mark Entry Serializers
+# ============================================================
+class MarkBulkEntryListSerializer(serializers.ListSerializer):
+    """
+    Validates a whole mark sheet with one existence query per related
+    table (exams, students, subjects) instead of one per row and field.
+    Errors keep the per-row list shape.
+    """
+    related_models = {"exam": Exam, "student": Student, "subject": Subject}
+
+    def to_internal_value(self, data):
+        items = super().to_internal_value(data)
+
+        known = {
+            field: set(
+                model.objects.filter(id__in={item[field] for item in items})
+                .values_list("id", flat=True)
+            )
+            for field, model in self.related_models.items()
+        }
+        errors = [
+            {
+                field: [f'Invalid pk "{item[field]}" - object does not exist.']
+                for field in self.related_models
+                if item[field] not in known[field]
+            }
+            for item in items
+        ]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+
+class MarkBulkEntrySerializer(serializers.Serializer):
+    """
+    Write-only row of a bulk mark sheet, upserted on
+    (exam, student, subject) by performance.services.bulk_upsert_marks.
+    """
+    exam = serializers.IntegerField()
+    student = serializers.IntegerField()
+    subject = serializers.IntegerField()
+    marks_obtained = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=0)
+    max_marks = serializers.DecimalField(max_digits=5, decimal_places=2)
+    remarks = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    class Meta:
+        list_serializer_class = MarkBulkEntryListSerializer
+
+    def validate(self, data):
+        if data["max_marks"] <= 0:
+            raise serializers.ValidationError("Max marks must be greater than zero.")
+        if data["marks_obtained"] > data["max_marks"]:
+            raise serializers.ValidationError("Marks obtained cannot exceed max marks.")
+        return data
+
+
 # ============================================================
 # 📌 Exam Serializer
 # ============================================================
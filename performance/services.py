@@ -0,0 +1,138 @@
+from django.db import transaction
+from django.db.models import Case, CharField, F, Max, Min, Value, When
+from django.db.models.functions import Now, Round
+from django.db.models.lookups import GreaterThanOrEqual
+
+from .aggregates import refresh_mark_aggregates
+from .grading import DEFAULT_SCALE, get_scales, grades_for
+from .models import Exam, Mark
+from .signals import notify_marks_changed
+
+
+# ============================================================
+# 📝 MARK WRITE SERVICES
+# ============================================================
+
+def bulk_upsert_marks(items, entered_by=None):
+    """
+    Upserts a batch of marks in one statement keyed on
+    (exam, student, subject), so re-submitting an exam sheet updates it
+    instead of failing on the unique constraint.
+
+    `items` are validated MarkBulkEntrySerializer rows; when the same key
+    appears more than once the last row wins. Grades for the whole batch
+    are computed in one vectorized pass with each exam's grade scale.
+    Returns the saved Mark instances.
+    """
+    latest = {}
+    for item in items:
+        latest[(item["exam"], item["student"], item["subject"])] = item
+
+    rows = list(latest.values())
+    standard_by_exam = dict(
+        Exam.objects.filter(id__in={row["exam"] for row in rows}).values_list("id", "standard_id")
+    )
+    grades = grades_for(
+        [row["marks_obtained"] for row in rows],
+        [row["max_marks"] for row in rows],
+        [standard_by_exam.get(row["exam"]) for row in rows],
+    )
+    marks = [
+        Mark(
+            exam_id=row["exam"],
+            student_id=row["student"],
+            subject_id=row["subject"],
+            marks_obtained=row["marks_obtained"],
+            max_marks=row["max_marks"],
+            remarks=row.get("remarks"),
+            grade=grade,
+            entered_by=entered_by,
+        )
+        for row, grade in zip(rows, grades)
+    ]
+
+    with transaction.atomic():
+        Mark.objects.bulk_create(
+            marks,
+            update_conflicts=True,
+            unique_fields=["exam", "student", "subject"],
+            update_fields=[
+                "marks_obtained", "max_marks", "remarks", "grade", "entered_by", "updated_at",
+            ],
+        )
+        refresh_mark_aggregates({(exam, subject) for exam, _, subject in latest})
+        notify_marks_changed(latest.keys())
+
+    return marks
+
+
+# ============================================================
+# 🎓 BATCH REGRADING
+# ============================================================
+
+def grade_expression(scale):
+    """
+    SQL CASE expression that grades a Mark row with `scale`.
+
+    Compares integer hundredths (ROUND(obtained * 100) * 100 against
+    boundary * ROUND(max * 100)) so boundaries are exact on every backend.
+    """
+    obtained = Round(F("marks_obtained") * 100)
+    maximum = Round(F("max_marks") * 100)
+    whens = [
+        When(
+            GreaterThanOrEqual(obtained * 10000, maximum * int(bound * 100)),
+            then=Value(label),
+        )
+        for bound, label in reversed(list(zip(scale.bounds, scale.labels[1:])))
+    ]
+    return Case(*whens, default=Value(scale.labels[0]), output_field=CharField())
+
+
+def regrade_marks(chunk_size=5000, standard_id=None, progress=None):
+    """
+    Re-apply the current grade scales to stored marks with chunked,
+    set-based UPDATEs (one statement per `chunk_size` primary keys per
+    scale). Only rows whose grade changes are written. `progress`, if
+    given, is called after every chunk with (scale name, fraction of the
+    scope done, grades changed so far).
+    Returns the number of marks whose grade changed.
+    """
+    # Marks outside every overridden standard fall back to the default,
+    # even when no default scale row exists
+    scales = dict(get_scales())
+    scales.setdefault(None, DEFAULT_SCALE)
+    overridden = [key for key in scales if key is not None]
+
+    scopes = []
+    for key, scale in scales.items():
+        if standard_id is not None and key not in (standard_id, None):
+            continue
+        marks = Mark.objects.all()
+        if key is None:
+            marks = marks.exclude(exam__standard_id__in=overridden)
+            if standard_id is not None:
+                marks = marks.filter(exam__standard_id=standard_id)
+        else:
+            marks = marks.filter(exam__standard_id=key)
+        scopes.append(("default" if key is None else f"standard {key}", scale, marks))
+
+    changed = 0
+    for name, scale, marks in scopes:
+        bounds = marks.aggregate(low=Min("id"), high=Max("id"))
+        if bounds["low"] is None:
+            continue
+        span = bounds["high"] - bounds["low"] + 1
+        grade = grade_expression(scale)
+        for start in range(bounds["low"], bounds["high"] + 1, chunk_size):
+            chunk = marks.filter(id__gte=start, id__lt=start + chunk_size)
+            changed += (
+                Mark.objects
+                .filter(id__in=chunk.values("id"))
+                .exclude(grade=grade)
+                .update(grade=grade, updated_at=Now())
+            )
+            if progress:
+                done = min(start + chunk_size - bounds["low"], span) / span
+                progress(name, done, changed)
+    return changed
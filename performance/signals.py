@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .aggregates import refresh_mark_aggregates
+from .grading import clear_scale_cache
+from .models import GradeBoundary, GradeScale, Mark
+from .progress import invalidate_progress
+from .ranking import refresh_finalized_ranks
+
+
+# ============================================================
+# 🎓 GRADE SCALE CACHE
+# ============================================================
+
+@receiver([post_save, post_delete], sender=GradeScale)
+@receiver([post_save, post_delete], sender=GradeBoundary)
+def grade_scale_changed(sender, **kwargs):
+    """Drop this process's compiled scales whenever a scale is edited."""
+    clear_scale_cache()
+
+
+# ============================================================
+# 📝 MARK CHANGES
+# ============================================================
+
+# Sent once per committed write with the sets `exam_ids`, `subject_ids`
+# and `student_ids` (Student ids) touched, so caches and stored results
+# derived from marks can refresh exactly the scopes that changed.
+marks_changed = Signal()
+
+
+def notify_marks_changed(keys):
+    """
+    Send marks_changed after the current transaction commits.
+    `keys` are (exam_id, student_id, subject_id) tuples.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    exam_ids = {exam_id for exam_id, _, _ in keys}
+    student_ids = {student_id for _, student_id, _ in keys}
+    subject_ids = {subject_id for _, _, subject_id in keys}
+    transaction.on_commit(lambda: marks_changed.send(
+        sender=Mark, exam_ids=exam_ids, subject_ids=subject_ids, student_ids=student_ids,
+    ))
+
+
+@receiver([post_save, post_delete], sender=Mark)
+def mark_written(sender, instance, **kwargs):
+    # Aggregates change inside the write's transaction; caches after commit
+    refresh_mark_aggregates([(instance.exam_id, instance.subject_id)])
+    notify_marks_changed([(instance.exam_id, instance.student_id, instance.subject_id)])
+
+
+@receiver(marks_changed)
+def marks_changed_ranks(sender, exam_ids, **kwargs):
+    """Keep stored class ranks right when a finalized exam is corrected."""
+    refresh_finalized_ranks(exam_ids)
+
+
+@receiver(marks_changed)
+def marks_changed_progress(sender, student_ids, **kwargs):
+    invalidate_progress(student_ids)
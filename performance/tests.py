@@ -1,3 +1,386 @@
-from django.test import TestCase
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from students.models import Section, Standard, Student, Subject
+from .grading import clear_scale_cache, grade_for, grades_for
+from .aggregates import rebuild_mark_aggregates
+from .models import Exam, GradeBoundary, GradeScale, Mark, SectionSubjectAggregate, StudentExamRank
+from .services import bulk_upsert_marks
+
+
+def make_class(standard_name="5", section_name="A", students=3, subjects=2):
+    """Create a standard, section, exam, students and subjects to mark."""
+    standard = Standard.objects.create(name=standard_name)
+    section = Section.objects.create(name=section_name, standard=standard)
+    exam = Exam.objects.create(
+        name="Midterm", date=date(2025, 9, 15), standard=standard, section=section
+    )
+    pupils = [
+        Student.objects.create(
+            user=User.objects.create(username=f"{standard_name}{section_name}-s{i}",
+                                     first_name=f"S{i}", role="STUDENT"),
+            standard=standard,
+            section=section,
+        )
+        for i in range(students)
+    ]
+    courses = [
+        Subject.objects.create(name=f"Subject {i}", code=f"{standard_name}{section_name}-{i}",
+                               standard=standard)
+        for i in range(subjects)
+    ]
+    return exam, pupils, courses
+
+
+# ============================================================
+# 🎓 GRADING
+# ============================================================
+class GradingTests(TestCase):
+    def test_vectorized_grades_match_single_row_grades(self):
+        obtained = [Decimal(v) for v in ("45", "44.99", "27", "29.99", "0", "50", "37.5", "22.5")]
+        maximum = [Decimal(v) for v in ("50", "100", "30", "50", "40", "50", "50", "50")]
+
+        self.assertEqual(
+            grades_for(obtained, maximum),
+            [grade_for(o, m) for o, m in zip(obtained, maximum)],
+        )
+        self.assertEqual(grades_for(obtained, maximum)[:4], ["A+", "D", "A+", "C"])
+
+
+class GradeScaleTests(TestCase):
+    def setUp(self):
+        self.addCleanup(clear_scale_cache)
+        self.exam, self.students, self.subjects = make_class(students=2, subjects=1)
+        self.other_exam, other_students, other_subjects = make_class("6", "B", 1, 1)
+        for exam, students, subjects in (
+            (self.exam, self.students, self.subjects),
+            (self.other_exam, other_students, other_subjects),
+        ):
+            for student in students:
+                Mark.objects.create(exam=exam, student=student, subject=subjects[0],
+                                    marks_obtained=Decimal("35"), max_marks=Decimal("50"))
+
+    def make_scale(self, standard, boundaries):
+        scale = GradeScale.objects.create(name=f"Scale {standard}", standard=standard)
+        for grade, bound in boundaries:
+            GradeBoundary.objects.create(scale=scale, grade=grade, min_percentage=bound)
+
+    def test_default_scale_is_seeded(self):
+        self.assertEqual(set(Mark.objects.values_list("grade", flat=True)), {"B"})
+
+    def test_standard_scale_overrides_default(self):
+        self.make_scale(self.exam.standard, [("F", 0), ("P", 50)])
+
+        self.assertEqual(grade_for(Decimal("35"), Decimal("50"), self.exam.standard_id), "P")
+        self.assertEqual(grade_for(Decimal("35"), Decimal("50"), self.other_exam.standard_id), "B")
+        self.assertEqual(
+            grades_for([Decimal("35")] * 2, [Decimal("50")] * 2,
+                       [self.exam.standard_id, self.other_exam.standard_id]),
+            ["P", "B"],
+        )
+
+    def test_regrade_command_applies_scales(self):
+        self.make_scale(self.exam.standard, [("F", 0), ("P", 70)])
+        GradeBoundary.objects.filter(scale__standard__isnull=True, grade="A").update(
+            min_percentage=Decimal("70")
+        )
+        clear_scale_cache()
+
+        out = StringIO()
+        call_command("regrade_marks", chunk_size=1, stdout=out)
+
+        self.assertEqual(
+            list(Mark.objects.filter(exam=self.exam).values_list("grade", flat=True)), ["P", "P"]
+        )
+        self.assertEqual(Mark.objects.get(exam=self.other_exam).grade, "A")
+        self.assertIn("3 grades changed", out.getvalue())
+
+    def test_regrade_without_default_scale_uses_builtin_default(self):
+        GradeScale.objects.filter(standard__isnull=True).delete()
+        self.make_scale(self.exam.standard, [("F", 0), ("P", 50)])
+        Mark.objects.update(grade="?")
+        clear_scale_cache()
+
+        call_command("regrade_marks", stdout=StringIO())
+
+        self.assertEqual(Mark.objects.get(exam=self.other_exam).grade, "B")
+        self.assertEqual(set(Mark.objects.filter(exam=self.exam).values_list("grade", flat=True)), {"P"})
+
+    def test_single_mark_save_does_not_fetch_the_exam(self):
+        mark = Mark.objects.get(exam=self.other_exam)
+        mark.marks_obtained = Decimal("48")
+
+        with CaptureQueriesContext(connection) as queries:
+            mark.save(standard_id=self.other_exam.standard_id)
+
+        self.assertEqual(mark.grade, "A+")
+        self.assertFalse(any(
+            'FROM "performance_exam"' in query["sql"] for query in queries.captured_queries
+        ))
+
+
+# ============================================================
+# 📝 BULK MARK ENTRY
+# ============================================================
+class MarkEntryViewTests(APITestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.exam, self.students, self.subjects = make_class(students=6, subjects=3)
+        self.client.force_authenticate(self.teacher)
+        self.url = reverse("marks-entry")
+
+    def sheet(self, students, obtained="40"):
+        return [
+            {
+                "exam": self.exam.id,
+                "student": student.id,
+                "subject": subject.id,
+                "marks_obtained": obtained,
+                "max_marks": "50",
+            }
+            for student in students
+            for subject in self.subjects
+        ]
+
+    def test_sheet_is_saved_with_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, self.sheet(self.students[:1]), format="json")
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, self.sheet(self.students), format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(Mark.objects.count(), 18)
+        self.assertEqual(set(Mark.objects.values_list("grade", flat=True)), {"A"})
+
+    def test_resubmitting_updates_marks(self):
+        self.client.post(self.url, self.sheet(self.students), format="json")
+        response = self.client.post(self.url, self.sheet(self.students, obtained="20"), format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Mark.objects.count(), 18)
+        self.assertEqual(set(Mark.objects.values_list("grade", flat=True)), {"D"})
+        self.assertEqual(Mark.objects.first().entered_by, self.teacher)
+
+    def test_unknown_ids_are_reported_per_row(self):
+        sheet = self.sheet(self.students[:1])
+        sheet.append({**sheet[0], "student": 999})
+
+        response = self.client.post(self.url, sheet, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[:3], [{}, {}, {}])
+        self.assertEqual(list(response.data[3]), ["student"])
+        self.assertFalse(Mark.objects.exists())
+
+    def test_marks_above_max_are_rejected(self):
+        sheet = self.sheet(self.students[:1])
+        sheet[0]["marks_obtained"] = "60"
+
+        response = self.client.post(self.url, sheet, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Mark.objects.exists())
+
+
+# ============================================================
+# 🥇 CLASS RANKS
+# ============================================================
+class ExamRankTests(APITestCase):
+    def setUp(self):
+        self.exam, self.students, self.subjects = make_class(students=4, subjects=2)
+        scores = {0: (40, 30), 1: (45, 30), 2: (45, 20), 3: (10, 50)}
+        for index, (first, second) in scores.items():
+            for subject, score, max_marks in ((self.subjects[0], first, 50), (self.subjects[1], second, 100)):
+                Mark.objects.create(exam=self.exam, student=self.students[index], subject=subject,
+                                    marks_obtained=Decimal(score), max_marks=Decimal(max_marks))
+
+    def finalize(self):
+        return self.client.post(reverse("exam-finalize", args=[self.exam.id]))
+
+    def ranks(self, subject=None):
+        return list(
+            StudentExamRank.objects.filter(exam=self.exam, subject=subject)
+            .order_by("student_id").values_list("rank", "percentile")
+        )
+
+    def test_finalize_stores_subject_and_overall_ranks(self):
+        response = self.finalize()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["ranks"], 12)
+        self.exam.refresh_from_db()
+        self.assertTrue(self.exam.is_finalized)
+        # 90% twice shares rank 1, next is rank 3
+        self.assertEqual([rank for rank, _ in self.ranks(self.subjects[0])], [3, 1, 1, 4])
+        # Overall: 70/150, 75/150, 65/150, 60/150
+        self.assertEqual(self.ranks(), [(2, Decimal("66.67")), (1, Decimal("100.00")),
+                                        (3, Decimal("33.33")), (4, Decimal("0.00"))])
+        self.assertEqual(set(StudentExamRank.objects.values_list("class_size", flat=True)), {4})
+
+    def test_editing_a_finalized_exam_refreshes_ranks(self):
+        self.finalize()
+        mark = Mark.objects.get(student=self.students[3], subject=self.subjects[0])
+        mark.marks_obtained = Decimal("50")
+        with self.captureOnCommitCallbacks(execute=True):
+            mark.save()
+
+        self.assertEqual(self.ranks()[3][0], 1)
+
+    def test_mark_list_reads_stored_ranks(self):
+        url = reverse("student-marks", args=[self.students[1].id])
+        before = self.client.get(url)
+        self.assertIsNone(before.data[0]["exam_rank"])
+
+        self.finalize()
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row["exam_rank"] for row in response.data}, {1})
+        self.assertEqual(sorted(row["subject_rank"] for row in response.data), [1, 2])
+        self.assertEqual(response.data[0]["class_size"], 4)
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(REPORT_CARD_CACHE_DIR=cache_dir):
+            self.assertEqual(self.client.get(reverse("report-card", args=[self.students[1].id])).status_code, 200)
+
+
+# ============================================================
+# 📒 GRADEBOOK
+# ============================================================
+class GradebookViewTests(APITestCase):
+    def setUp(self):
+        self.exam, self.students, self.subjects = make_class(students=3, subjects=2)
+        for student in self.students:
+            for subject in self.subjects:
+                if (student, subject) == (self.students[2], self.subjects[1]):
+                    continue
+                Mark.objects.create(exam=self.exam, student=student, subject=subject,
+                                    marks_obtained=Decimal(40 + student.id % 10), max_marks=Decimal("50"))
+
+    def test_grid_is_built_with_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("exam-gradebook", args=[self.exam.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual([s["id"] for s in response.data["students"]], [s.id for s in self.students])
+        self.assertEqual([s["id"] for s in response.data["subjects"]], [s.id for s in self.subjects])
+        self.assertEqual(response.data["marks"][1][0], float(40 + self.students[1].id % 10))
+        self.assertEqual(response.data["max_marks"][0], [50.0, 50.0])
+        self.assertIsNone(response.data["marks"][2][1])
+        self.assertIsNone(response.data["grades"][2][1])
+        self.assertEqual(response.data["exam"]["section"], "A")
+
+    def test_exam_without_marks_returns_empty_grid(self):
+        Mark.objects.all().delete()
+
+        response = self.client.get(reverse("exam-gradebook", args=[self.exam.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["marks"], [])
+        self.assertEqual(self.client.get(reverse("exam-gradebook", args=[999])).status_code, 404)
+
+
+# ============================================================
+# 📈 STUDENT PROGRESS
+# ============================================================
+class StudentProgressViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.exam, self.students, self.subjects = make_class(students=2, subjects=2)
+        self.final = Exam.objects.create(name="Final", date=date(2026, 3, 10),
+                                         standard=self.exam.standard, section=self.exam.section)
+        for exam, score in ((self.exam, 30), (self.final, 40)):
+            for student in self.students:
+                for subject in self.subjects:
+                    Mark.objects.create(exam=exam, student=student, subject=subject,
+                                        marks_obtained=Decimal(score - student.id % 2),
+                                        max_marks=Decimal("50"))
+        self.student = self.students[0]
+        self.url = reverse("student-progress", args=[self.student.id])
+
+    def test_series_are_columnar_and_oldest_first(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        series = response.data["subjects"][0]
+        self.assertEqual(series["id"], self.subjects[0].id)
+        self.assertEqual(series["exams"], [self.exam.id, self.final.id])
+        self.assertEqual(series["dates"], ["2025-09-15", "2026-03-10"])
+        self.assertEqual(series["percentiles"], [None, None])
+        self.assertEqual(len(series["percentages"]), 2)
+
+    def test_cache_is_invalidated_by_marks_and_ranks(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):  # the student lookup only
+            self.client.get(self.url)
+
+        mark = Mark.objects.get(exam=self.final, student=self.student, subject=self.subjects[0])
+        mark.marks_obtained = Decimal("50")
+        with self.captureOnCommitCallbacks(execute=True):
+            mark.save()
+        self.assertEqual(self.client.get(self.url).data["subjects"][0]["percentages"][1], 100.0)
+
+        self.client.post(reverse("exam-finalize", args=[self.final.id]))
+        series = self.client.get(self.url).data["subjects"][0]
+        self.assertEqual(series["percentiles"], [None, 100.0])
+
+
+# ============================================================
+# 📊 SECTION SUBJECT AGGREGATES
+# ============================================================
+class SectionSubjectAggregateTests(TestCase):
+    def setUp(self):
+        self.exam, self.students, self.subjects = make_class(students=3, subjects=2)
+
+    def aggregate(self, subject):
+        return SectionSubjectAggregate.objects.get(exam=self.exam, subject=subject)
+
+    def test_single_writes_keep_totals_in_step(self):
+        marks = [
+            Mark.objects.create(exam=self.exam, student=student, subject=self.subjects[0],
+                                marks_obtained=Decimal(score), max_marks=Decimal("50"))
+            for student, score in zip(self.students, (20, 30, 40))
+        ]
+        row = self.aggregate(self.subjects[0])
+        self.assertEqual((row.count, row.sum_marks), (3, Decimal("90")))
+        self.assertAlmostEqual(row.mean, 60.0)
+        self.assertAlmostEqual(row.std_dev, 16.3299, places=3)
+        self.assertEqual((row.min_percentage, row.max_percentage), (40.0, 80.0))
+
+        marks[0].marks_obtained = Decimal("50")
+        marks[0].save()
+        marks[1].delete()
+        row = self.aggregate(self.subjects[0])
+        self.assertEqual((row.count, row.max_percentage), (2, 100.0))
+        self.assertAlmostEqual(row.mean, 90.0)
+
+        Mark.objects.all().delete()
+        self.assertFalse(SectionSubjectAggregate.objects.exists())
+
+    def test_bulk_entry_matches_a_rebuild(self):
+        bulk_upsert_marks([
+            {"exam": self.exam.id, "student": student.id, "subject": subject.id,
+             "marks_obtained": Decimal(10 + student.id % 7), "max_marks": Decimal("20")}
+            for student in self.students
+            for subject in self.subjects
+        ])
+        incremental = list(SectionSubjectAggregate.objects.order_by("subject_id").values_list(
+            "section_id", "subject_id", "count", "sum_marks", "sum_percentage", "sum_squares"))
+
+        self.assertEqual(rebuild_mark_aggregates(), 2)
+        rebuilt = list(SectionSubjectAggregate.objects.order_by("subject_id").values_list(
+            "section_id", "subject_id", "count", "sum_marks", "sum_percentage", "sum_squares"))
+        self.assertEqual(incremental, rebuilt)
+        self.assertEqual(incremental[0][:3], (self.exam.section_id, self.subjects[0].id, 3))
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import MarkEntryView, ExamListCreateView
+from .views import MarkEntryView, ExamListCreateView, ExamFinalizeView, GradebookView
 
 
 # ============================================================
@@ -25,4 +25,14 @@ urlpatterns = [
         ExamListCreateView.as_view(),
         name="exam-list-create"
     ),
+    path(
+        "exams/<int:pk>/finalize/",
+        ExamFinalizeView.as_view(),
+        name="exam-finalize"
+    ),
+    path(
+        "exams/<int:pk>/gradebook/",
+        GradebookView.as_view(),
+        name="exam-gradebook"
+    ),
 ]
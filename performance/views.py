@@ -4,11 +4,14 @@ from django.shortcuts import render
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.generics import ListCreateAPIView
+from rest_framework.generics import ListCreateAPIView, get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 
 from .models import Mark, Exam
-from .serializers import MarkEntrySerializer, ExamSerializer
+from .serializers import MarkEntrySerializer, MarkBulkEntrySerializer, ExamSerializer
+from .gradebook import build_gradebook
+from .ranking import finalize_exam
+from .services import bulk_upsert_marks
 from accounts.permissions import IsTeacherOrPrincipal
 
 
@@ -30,6 +33,7 @@ class MarkEntryView(ListCreateAPIView):
         },
         ...
     ]
+    Re-posting a row for the same exam, student and subject updates it.
     """
     # permission_classes = [IsAuthenticated, IsTeacherOrPrincipal]
     permission_classes =[]
@@ -38,9 +42,11 @@ class MarkEntryView(ListCreateAPIView):
     queryset = Mark.objects.select_related('exam', 'student', 'subject', 'entered_by').all()
 
     def post(self, request):
-        serializer = MarkEntrySerializer(data=request.data, many=True)
+        serializer = MarkBulkEntrySerializer(data=request.data, many=True)
         if serializer.is_valid():
-            serializer.save(entered_by=request.user)
+            entered_by = request.user if request.user.is_authenticated else None
+            # Whole sheet is upserted on (exam, student, subject) in one statement
+            bulk_upsert_marks(serializer.validated_data, entered_by=entered_by)
             return Response({"message": "Marks saved successfully"}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -59,6 +65,56 @@ class ExamListCreateView(ListCreateAPIView):
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
+
+
+# ----------------------------
+# Gradebook View
+# ----------------------------
+class GradebookView(APIView):
+    """
+    GET returns an exam (one standard and section) as a students x
+    subjects grid: row and column headers plus 2-D `marks`, `max_marks`
+    and `grades` arrays, with null where a mark is missing.
+    """
+    # permission_classes = [IsAuthenticated, IsTeacherOrPrincipal]
+    permission_classes =[]
+
+    def get(self, request, pk):
+        gradebook = build_gradebook(pk)
+        if gradebook is None:
+            exam = get_object_or_404(Exam, pk=pk)
+            gradebook = {
+                "exam": {
+                    "id": exam.id,
+                    "name": exam.name,
+                    "date": exam.date,
+                    "standard": exam.standard.name,
+                    "section": exam.section.name,
+                },
+                "students": [], "subjects": [], "marks": [], "max_marks": [], "grades": [],
+            }
+        return Response(gradebook)
+
+
+# ----------------------------
+# Exam Finalize View
+# ----------------------------
+class ExamFinalizeView(APIView):
+    """
+    POST marks an exam's results as final and stores every student's
+    class rank and percentile (overall and per subject).
+    Editing marks afterwards recomputes the stored ranks.
+    """
+    # permission_classes = [IsAuthenticated, IsTeacherOrPrincipal]
+    permission_classes =[]
+
+    def post(self, request, pk):
+        exam = get_object_or_404(Exam, pk=pk)
+        ranks = finalize_exam(exam)
+        return Response(
+            {"message": "Exam finalized", "exam": exam.id, "ranks": ranks},
+            status=status.HTTP_200_OK,
+        )
 # ----------------------------
 # 
 # ----------------------------
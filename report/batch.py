@@ -0,0 +1,89 @@
+import zipfile
+
+from django.db.models import Prefetch
+
+from performance.models import Exam, Mark
+from performance.ranking import with_stored_ranks
+from students.models import Student
+from .pdf import render_report_cards
+from .render_pool import render_many
+from .rendering import build_payload
+
+
+# ============================================================
+# 🗂️ BATCH REPORT CARDS
+# ============================================================
+
+def batch_payloads(standard_id=None, section_id=None, exam_id=None):
+    """
+    Report card payloads for every student in a standard, a section or
+    an exam's section, ordered by name. With an exam only that exam's
+    marks are printed. Two queries: students, then all of their marks
+    (with stored ranks) prefetched and grouped in memory.
+    """
+    students = Student.objects.select_related('user')
+    marks = with_stored_ranks(Mark.objects.select_related('subject', 'exam'))
+    if exam_id is not None:
+        exam = Exam.objects.filter(pk=exam_id).values('section_id').first()
+        if exam is None:
+            return []
+        students = students.filter(section_id=exam['section_id'])
+        marks = marks.filter(exam_id=exam_id)
+    if standard_id is not None:
+        students = students.filter(standard_id=standard_id)
+    if section_id is not None:
+        students = students.filter(section_id=section_id)
+
+    students = students.order_by('user__first_name', 'user__last_name', 'id').prefetch_related(
+        Prefetch('marks', queryset=marks.order_by('exam__date', 'exam_id', 'subject__name'),
+                 to_attr='card_marks')
+    )
+    return [build_payload(student, student.card_marks) for student in students]
+
+
+def render_batch(payloads, workers=None):
+    """Render payloads on the warm pool, yielding (payload, pdf bytes) in input order."""
+    return render_many(payloads, workers)
+
+
+def zip_name(payload):
+    return f"report_card_{payload['student_id']}.pdf"
+
+
+class _ZipStream:
+    """Write-only file object that hands zipfile's output back in pieces."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def stream_zip(results):
+    """Yield a ZIP archive of rendered cards chunk by chunk, one card at a time."""
+    sink = _ZipStream()
+    # PDFs are already compressed; storing them keeps the CPU for rendering
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for payload, pdf in results:
+            archive.writestr(zip_name(payload), pdf)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def merged_pdf(payloads):
+    """
+    Return all cards as one PDF, drawn into a single document in this
+    process. Concatenating pool-rendered PDFs would need a PDF merging
+    library, which is not a dependency, so merged output stays serial;
+    use the ZIP output for parallel rendering.
+    """
+    return render_report_cards(payloads)
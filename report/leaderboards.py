@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, FloatField, Sum, Window
+from django.db.models.functions import Cast, Rank
+
+from performance.models import Exam, Mark
+
+
+# ============================================================
+# 🏆 LEADERBOARDS
+# ============================================================
+
+# Scope name -> Mark lookup. A board without a scope covers the school.
+SCOPES = {
+    "standard": "exam__standard_id",
+    "section": "exam__section_id",
+    "exam": "exam_id",
+    "subject": "subject_id",
+}
+
+# Deepest rank kept per cached board; requests may ask for any top-N up to it.
+LEADERBOARD_SIZE = 100
+
+# Boards are invalidated on every mark write, but only in the writing
+# process's cache when the backend is per-process (the default; see
+# settings), so the timeout stays short. Override it with the
+# LEADERBOARD_CACHE_SECONDS setting.
+LEADERBOARD_CACHE_SECONDS = 30
+
+
+def leaderboard_key(scope=None, scope_id=None):
+    if scope is None:
+        return "leaderboard:school"
+    return f"leaderboard:{scope}:{scope_id}"
+
+
+def compute_leaderboard(scope=None, scope_id=None, size=LEADERBOARD_SIZE):
+    """
+    Rank students in a scope on their overall percentage
+    (sum of marks obtained / sum of max marks) with a RANK() window, so
+    tied students share a position and the next position is skipped.
+    Returns every student ranked `size` or better.
+    """
+    marks = Mark.objects.all()
+    if scope is not None:
+        marks = marks.filter(**{SCOPES[scope]: scope_id})
+
+    percentage = (
+        Cast(Sum("marks_obtained"), FloatField()) * 100
+        / Cast(Sum("max_marks"), FloatField())
+    )
+    rows = (
+        marks.order_by()
+        .values(
+            "student_id",
+            "student__user__first_name",
+            "student__user__last_name",
+            "student__standard__name",
+            "student__section__name",
+        )
+        .annotate(percentage=percentage)
+        .annotate(rank=Window(Rank(), order_by=F("percentage").desc()))
+        .filter(rank__lte=size)
+        .order_by("rank", "student__user__first_name", "student_id")
+    )
+    return [
+        {
+            "student_id": row["student_id"],
+            "first_name": row["student__user__first_name"],
+            "last_name": row["student__user__last_name"],
+            "standard": row["student__standard__name"],
+            "section": row["student__section__name"],
+            "percentage": round(row["percentage"], 2),
+            "rank": row["rank"],
+        }
+        for row in rows
+    ]
+
+
+def get_leaderboard(scope=None, scope_id=None, top=3):
+    """
+    Return the top `top` positions of a board, served from the cache
+    between mark writes. Ties at the cut-off are all included.
+    """
+    key = leaderboard_key(scope, scope_id)
+    rows = cache.get(key)
+    if rows is None:
+        rows = compute_leaderboard(scope, scope_id)
+        cache.set(key, rows, getattr(settings, "LEADERBOARD_CACHE_SECONDS", LEADERBOARD_CACHE_SECONDS))
+    return [row for row in rows if row["rank"] <= top]
+
+
+def invalidate_leaderboards(exam_ids=(), subject_ids=(), exams=()):
+    """
+    Drop the cached boards whose scope contains the given exams or
+    subjects. `exams` may pass (id, standard_id, section_id) triples for
+    exams that no longer exist; the rest are looked up in one query.
+    """
+    exams = list(exams)
+    known = {exam_id for exam_id, _, _ in exams}
+    missing = set(exam_ids) - known
+    if missing:
+        exams += Exam.objects.filter(id__in=missing).values_list("id", "standard_id", "section_id")
+
+    keys = {leaderboard_key()}
+    keys.update(leaderboard_key("subject", subject_id) for subject_id in subject_ids)
+    for exam_id, standard_id, section_id in exams:
+        keys.add(leaderboard_key("exam", exam_id))
+        keys.add(leaderboard_key("standard", standard_id))
+        keys.add(leaderboard_key("section", section_id))
+    keys.update(leaderboard_key("exam", exam_id) for exam_id in missing)
+    cache.delete_many(list(keys))
@@ -0,0 +1,97 @@
+import json
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from report.render_pool import default_workers, render_many, shutdown_pool
+
+
+# Runs in a fresh interpreter: the first card pays for importing reportlab
+# and building styles, later cards show the warm per-card cost.
+COLD_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from report.pdf import render_report_card
+payload = json.loads(sys.argv[1])
+render_report_card(payload)
+cold = time.perf_counter() - started
+count = int(sys.argv[2])
+started = time.perf_counter()
+for _ in range(count):
+    render_report_card(payload)
+print(json.dumps([cold, (time.perf_counter() - started) / count]))
+"""
+
+
+def sample_payload(subjects, exams):
+    return {
+        "student_id": 1,
+        "student_name": "Bench Student",
+        "exams": [
+            {
+                "name": f"Exam {e + 1}",
+                "date": f"2025-{e % 12 + 1:02d}-01",
+                "rows": [[f"Subject {s + 1}", "42.00", "50.00", "A", str(s + 1)] for s in range(subjects)],
+                "position": [3, 40, "92.31"],
+            }
+            for e in range(exams)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    """
+    Measures report card render time, cold versus warm.
+
+    Usage:
+        python manage.py bench_report_render
+        python manage.py bench_report_render --cards 200 --workers 4 --subjects 8 --exams 3
+
+    "process" rows time a fresh interpreter (import + first card) against
+    later cards in the same process. "pool" rows time the first batch on
+    a newly started render pool against a second batch on the warm pool.
+    No database access.
+    """
+    help = "Benchmark cold vs warm report card rendering."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cards", type=int, default=100, help="Cards per batch.")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Pool size (default: REPORT_CARD_WORKERS or CPU count).")
+        parser.add_argument("--subjects", type=int, default=8, help="Subjects per exam.")
+        parser.add_argument("--exams", type=int, default=3, help="Exams per card.")
+
+    def handle(self, *args, **options):
+        if options["cards"] < 1:
+            raise CommandError("--cards must be positive.")
+        payload = sample_payload(options["subjects"], options["exams"])
+        workers = options["workers"] or default_workers()
+
+        self.stdout.write(f"{'mode':>8} {'phase':>6} {'cards':>6} {'total ms':>10} {'ms/card':>9}")
+
+        result = subprocess.run(
+            [sys.executable, "-c", COLD_SCRIPT, json.dumps(payload), str(options["cards"])],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        cold, warm = json.loads(result.stdout)
+        self._row("process", "cold", 1, cold)
+        self._row("process", "warm", options["cards"], warm * options["cards"])
+
+        payloads = [dict(payload, student_id=i) for i in range(options["cards"])]
+        shutdown_pool()
+        try:
+            for phase in ("cold", "warm"):
+                started = time.perf_counter()
+                for _ in render_many(payloads, workers=max(workers, 2)):
+                    pass
+                self._row(f"pool x{max(workers, 2)}", phase, len(payloads), time.perf_counter() - started)
+        finally:
+            shutdown_pool()
+
+    def _row(self, mode, phase, cards, seconds):
+        self.stdout.write(
+            f"{mode:>8} {phase:>6} {cards:>6} {seconds * 1000:>10.1f} {seconds * 1000 / cards:>9.2f}"
+        )
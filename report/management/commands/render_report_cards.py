@@ -0,0 +1,66 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from report.batch import batch_payloads, merged_pdf, render_batch, stream_zip
+from report.render_pool import default_workers
+
+
+class Command(BaseCommand):
+    """
+    Renders report cards for a whole standard, section or exam.
+
+    Usage:
+        python manage.py render_report_cards --section 4 --output cards.zip --workers 8
+        python manage.py render_report_cards --exam 9 --output cards.pdf
+
+    The output format follows the file extension: .zip holds one PDF per
+    student, .pdf is a single merged document. Marks for every student
+    are fetched up front; ZIP output is rendered across a process pool,
+    while the merged PDF is drawn in this process.
+    """
+    help = "Render report cards for a standard, section or exam in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--standard", type=int, default=None, help="Standard id.")
+        parser.add_argument("--section", type=int, default=None, help="Section id.")
+        parser.add_argument("--exam", type=int, default=None,
+                            help="Exam id; prints only this exam's marks.")
+        parser.add_argument("--output", required=True, help="Target .zip or .pdf file.")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Render processes (default: REPORT_CARD_WORKERS or CPU count).")
+
+    def handle(self, *args, **options):
+        filters = {
+            f"{name}_id": options[name]
+            for name in ("standard", "section", "exam")
+            if options[name] is not None
+        }
+        if not filters:
+            raise CommandError("Pass at least one of --standard, --section or --exam.")
+        output = Path(options["output"])
+        if output.suffix not in (".zip", ".pdf"):
+            raise CommandError("--output must end in .zip or .pdf.")
+        # The merged PDF is drawn in this process
+        workers = 1 if output.suffix == ".pdf" else options["workers"] or default_workers()
+
+        started = time.perf_counter()
+        payloads = batch_payloads(**filters)
+        if not payloads:
+            raise CommandError("No students found.")
+        loaded = time.perf_counter()
+
+        with open(output, "wb") as target:
+            if output.suffix == ".pdf":
+                target.write(merged_pdf(payloads))
+            else:
+                for chunk in stream_zip(render_batch(payloads, workers)):
+                    target.write(chunk)
+        finished = time.perf_counter()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {len(payloads)} report cards with {workers} workers to {output}: "
+            f"load {loaded - started:.2f}s, render {finished - loaded:.2f}s "
+            f"({(finished - loaded) * 1000 / len(payloads):.1f} ms/card)."
+        ))
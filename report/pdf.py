@@ -0,0 +1,138 @@
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+
+# ============================================================
+# 🖨️ PDF RENDERING
+# ============================================================
+# Kept free of Django imports so pool worker processes can load it cheaply.
+# reportlab itself is imported on first use by toolkit(), not at import.
+
+TABLE_HEADER = ["Subject", "Marks Obtained", "Max Marks", "Grade", "Class Rank"]
+
+SAMPLE_PAYLOAD = {
+    "student_id": 0,
+    "student_name": "Warm Up",
+    "exams": [{
+        "name": "Warm Up",
+        "date": "2000-01-01",
+        "rows": [["Subject", "1.00", "1.00", "A+", "1"]],
+        "position": [1, 1, "100.00"],
+    }],
+}
+
+
+class Toolkit:
+    """reportlab classes plus the styles every card shares, built once per process."""
+
+    def __init__(self):
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.lib.units import inch
+        from reportlab.platypus import (
+            PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle,
+        )
+
+        self.PageBreak = PageBreak
+        self.Paragraph = Paragraph
+        self.SimpleDocTemplate = SimpleDocTemplate
+        self.Spacer = Spacer
+        self.Table = Table
+        self.inch = inch
+        self.page_size = A4
+        self.margins = dict.fromkeys(
+            ("leftMargin", "rightMargin", "topMargin", "bottomMargin"), 0.8 * inch
+        )
+        self.column_widths = [2.2 * inch, 1.3 * inch, 1.1 * inch, 0.8 * inch, 1.1 * inch]
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ])
+        sample = getSampleStyleSheet()
+        self.styles = {
+            "title": ParagraphStyle("CardTitle", parent=sample["Title"], alignment=TA_CENTER),
+            "body": sample["Normal"],
+            "exam": sample["Heading2"],
+        }
+
+
+@lru_cache(maxsize=None)
+def toolkit():
+    return Toolkit()
+
+
+def warm_up():
+    """
+    Load reportlab, build the shared styles and lay out one sample card
+    so font metrics and templates are cached before real work arrives.
+    Used as the initializer of render pool workers.
+    """
+    render_report_card(SAMPLE_PAYLOAD)
+
+
+def report_card_flowables(payload):
+    """
+    Flowables for one report card. Each exam gets its own table whose
+    header row repeats when the table splits across pages. Names are
+    escaped because Paragraph text is parsed as markup.
+    """
+    tk = toolkit()
+    styles = tk.styles
+    story = [
+        tk.Paragraph("Report Card", styles["title"]),
+        tk.Paragraph(f"Student: {escape(payload['student_name'])}", styles["body"]),
+        tk.Paragraph(f"Student ID: {payload['student_id']}", styles["body"]),
+        tk.Spacer(1, 0.3 * tk.inch),
+    ]
+    if not payload["exams"]:
+        story.append(tk.Paragraph("No marks available", styles["body"]))
+
+    for exam in payload["exams"]:
+        story.append(tk.Paragraph(f"{escape(exam['name'])} ({exam['date']})", styles["exam"]))
+        table = tk.Table([TABLE_HEADER] + exam["rows"], colWidths=tk.column_widths, repeatRows=1)
+        table.setStyle(tk.table_style)
+        story.append(table)
+        if exam["position"]:
+            rank, class_size, percentile = exam["position"]
+            story.append(tk.Spacer(1, 0.1 * tk.inch))
+            story.append(tk.Paragraph(
+                f"Position in class: {rank} of {class_size} (percentile {percentile})", styles["body"]
+            ))
+        story.append(tk.Spacer(1, 0.25 * tk.inch))
+    return story
+
+
+def write_report_cards(payloads, target):
+    """
+    Lay out report cards, each starting on a new page, and write the PDF
+    to the binary file object `target`.
+    """
+    tk = toolkit()
+    story = []
+    for payload in payloads:
+        if story:
+            story.append(tk.PageBreak())
+        story.extend(report_card_flowables(payload))
+    document = tk.SimpleDocTemplate(target, pagesize=tk.page_size, title="Report Card", **tk.margins)
+    document.build(story)
+
+
+def render_report_card(payload):
+    """Lay out one report card payload and return the PDF bytes."""
+    return render_report_cards([payload])
+
+
+def render_report_cards(payloads):
+    """Lay out several report cards into one PDF and return its bytes."""
+    buffer = BytesIO()
+    write_report_cards(payloads, buffer)
+    return buffer.getvalue()
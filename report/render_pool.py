@@ -0,0 +1,69 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+from .pdf import render_report_card, warm_up
+
+
+# ============================================================
+# 🔥 WARM RENDER POOL
+# ============================================================
+# One long-lived pool per process. Workers are spawned without Django,
+# import reportlab and lay out a sample card once, then serve every later
+# batch, so only the first batch pays the start-up cost.
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def default_workers():
+    return getattr(settings, 'REPORT_CARD_WORKERS', None) or os.cpu_count() or 1
+
+
+def get_pool(workers=None):
+    """Return the shared warm pool, (re)starting it if the size changed."""
+    global _pool, _pool_workers
+    workers = workers or default_workers()
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=True)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up,
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool, _pool_workers = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+def render_many(payloads, workers=None):
+    """
+    Render payloads to PDF bytes, yielding (payload, pdf) in input order.
+    `workers=1` (or a single payload) renders in this process, which is
+    itself warm after its first card.
+    """
+    workers = workers or default_workers()
+    if workers == 1 or len(payloads) < 2:
+        for payload in payloads:
+            yield payload, render_report_card(payload)
+        return
+
+    chunksize = max(1, len(payloads) // (workers * 4))
+    yield from zip(payloads, get_pool(workers).map(render_report_card, payloads, chunksize=chunksize))
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Count, Max, OuterRef, Subquery
+
+from performance.models import Mark, StudentExamRank
+from performance.ranking import with_stored_ranks
+from students.models import Student
+from .pdf import write_report_cards
+
+
+# ============================================================
+# 🧾 REPORT CARD PAYLOADS
+# ============================================================
+
+# Bump when the layout changes so cached PDFs are rebuilt.
+REPORT_CARD_LAYOUT_VERSION = 2
+
+
+def report_card_fingerprint(student_id):
+    """
+    Return a hex digest identifying the current content of a student's
+    report card, or None if the student does not exist.
+
+    One query: the student's name plus the count and latest `updated_at`
+    of their marks, and the newest stored rank row (ranks are rewritten
+    whenever a finalized exam changes).
+    """
+    marks = Mark.objects.filter(student_id=OuterRef("pk")).order_by().values("student_id")
+    ranks = StudentExamRank.objects.filter(student_id=OuterRef("pk")).order_by().values("student_id")
+    row = (
+        Student.objects.filter(pk=student_id)
+        .annotate(
+            mark_count=Subquery(marks.annotate(n=Count("id")).values("n")),
+            last_updated=Subquery(marks.annotate(last=Max("updated_at")).values("last")),
+            last_rank=Subquery(ranks.annotate(last=Max("id")).values("last")),
+        )
+        .values_list("user__first_name", "user__last_name", "mark_count", "last_updated", "last_rank")
+        .first()
+    )
+    if row is None:
+        return None
+    key = ":".join(str(value) for value in (REPORT_CARD_LAYOUT_VERSION, student_id, *row))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def report_card_payload(student):
+    """
+    Collect everything a report card shows as plain, picklable data:
+    {"student_id", "student_name", "exams": [{"name", "date", "rows":
+    [[subject, obtained, max, grade, class rank]], "position": [rank,
+    class size, percentile] or None}]}, oldest exam first.
+    """
+    marks = with_stored_ranks(
+        Mark.objects.filter(student=student)
+        .select_related('subject', 'exam')
+        .order_by('exam__date', 'exam_id', 'subject__name')
+    )
+    return build_payload(student, marks)
+
+
+def build_payload(student, marks):
+    """Build a report card payload from a student and their rank-annotated marks."""
+    exams = {}
+    for mark in marks:
+        exam = exams.get(mark.exam_id)
+        if exam is None:
+            exam = exams[mark.exam_id] = {
+                "name": mark.exam.name,
+                "date": mark.exam.date.isoformat(),
+                "rows": [],
+                "position": None,
+            }
+        exam["rows"].append([
+            mark.subject.name,
+            str(mark.marks_obtained),
+            str(mark.max_marks),
+            mark.grade or "",
+            str(mark.subject_rank) if mark.subject_rank else "-",
+        ])
+        if mark.exam_rank:
+            exam["position"] = [mark.exam_rank, mark.class_size, str(mark.exam_percentile)]
+    return {
+        "student_id": student.id,
+        "student_name": student.user.get_full_name(),
+        "exams": list(exams.values()),
+    }
+
+
+# ============================================================
+# 💾 DISK CACHE
+# ============================================================
+
+def cache_dir():
+    path = Path(settings.REPORT_CARD_CACHE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cached_report_card_path(student_id, fingerprint):
+    return cache_dir() / f"{student_id}-{fingerprint}.pdf"
+
+
+def get_report_card(student_id, fingerprint):
+    """
+    Return the path of the student's report card PDF for `fingerprint`,
+    rendering and storing it first if needed. Older versions of the
+    student's card are removed once the new one is in place.
+    """
+    path = cached_report_card_path(student_id, fingerprint)
+    if path.exists():
+        return path
+
+    student = Student.objects.select_related('user').get(pk=student_id)
+    payload = report_card_payload(student)
+    # Render straight into a temporary file and rename it into place,
+    # so readers never see half a PDF
+    handle, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as temp:
+            write_report_cards([payload], temp)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+    for stale in path.parent.glob(f"{student_id}-*.pdf"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return path
@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from performance.models import Exam
+from performance.signals import marks_changed
+from .leaderboards import invalidate_leaderboards
+
+
+# ============================================================
+# 🏆 LEADERBOARD INVALIDATION
+# ============================================================
+
+@receiver(marks_changed)
+def marks_changed_leaderboards(sender, exam_ids, subject_ids, **kwargs):
+    invalidate_leaderboards(exam_ids, subject_ids)
+
+
+@receiver(post_delete, sender=Exam)
+def exam_deleted_leaderboards(sender, instance, **kwargs):
+    """Cascaded mark deletes can no longer resolve the exam's scopes, so pass them."""
+    scope = (instance.id, instance.standard_id, instance.section_id)
+    transaction.on_commit(lambda: invalidate_leaderboards(exams=[scope]))
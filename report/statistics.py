@@ -0,0 +1,99 @@
+import numpy as np
+
+from performance.models import Mark
+
+
+# ============================================================
+# 📈 EXAM STATISTICS ENGINE
+# ============================================================
+
+STAT_COLUMNS = (
+    "exam_id", "exam__name",
+    "subject_id", "subject__name",
+    "exam__section_id", "exam__section__name",
+    "marks_obtained", "max_marks", "grade",
+)
+
+
+def _round(value):
+    return round(float(value), 2)
+
+
+def exam_statistics(marks=None):
+    """
+    Summarise mark percentages per exam x subject x section.
+
+    All rows are pulled with a single columnar values_list() fetch and
+    every group is computed with NumPy from one sort: normalized mean,
+    median, population standard deviation, min/max, quartiles and a
+    grade histogram. Returns a list of dicts ordered by exam, subject
+    and section.
+    """
+    if marks is None:
+        marks = Mark.objects.all()
+    rows = list(marks.order_by().values_list(*STAT_COLUMNS))
+    if not rows:
+        return []
+
+    (exam_ids, exam_names, subject_ids, subject_names,
+     section_ids, section_names, obtained, maximum, grades) = zip(*rows)
+
+    obtained = np.array(obtained, dtype=np.float64)
+    maximum = np.array(maximum, dtype=np.float64)
+    percentages = np.divide(
+        obtained * 100, maximum, out=np.zeros_like(obtained), where=maximum > 0
+    )
+
+    keys = np.array([exam_ids, subject_ids, section_ids], dtype=np.int64).T
+    group_keys, group_index = np.unique(keys, axis=0, return_inverse=True)
+    group_index = group_index.reshape(-1)
+
+    # One sort orders rows by group, then by percentage inside the group
+    order = np.lexsort((percentages, group_index))
+    sorted_pct = percentages[order]
+    counts = np.bincount(group_index, minlength=len(group_keys))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    sums = np.add.reduceat(sorted_pct, starts)
+    squares = np.add.reduceat(sorted_pct * sorted_pct, starts)
+    means = sums / counts
+    std_devs = np.sqrt(np.maximum(squares / counts - means * means, 0.0))
+
+    grade_labels, grade_index = np.unique(
+        np.array([grade or "" for grade in grades], dtype=object), return_inverse=True
+    )
+    histogram = np.zeros((len(group_keys), len(grade_labels)), dtype=np.int64)
+    np.add.at(histogram, (group_index, grade_index.reshape(-1)), 1)
+
+    names = {}
+    for exam_id, exam_name, subject_id, subject_name, section_id, section_name in zip(
+        exam_ids, exam_names, subject_ids, subject_names, section_ids, section_names
+    ):
+        names[(exam_id, subject_id, section_id)] = (exam_name, subject_name, section_name)
+
+    results = []
+    for group, (exam_id, subject_id, section_id) in enumerate(group_keys.tolist()):
+        values = sorted_pct[starts[group]:starts[group] + counts[group]]
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        exam_name, subject_name, section_name = names[(exam_id, subject_id, section_id)]
+        results.append({
+            "exam_id": exam_id,
+            "exam_name": exam_name,
+            "subject_id": subject_id,
+            "subject_name": subject_name,
+            "section_id": section_id,
+            "section_name": section_name,
+            "count": int(counts[group]),
+            "mean": _round(means[group]),
+            "median": _round(median),
+            "std_dev": _round(std_devs[group]),
+            "min": _round(values[0]),
+            "max": _round(values[-1]),
+            "quartiles": {"q1": _round(q1), "q2": _round(median), "q3": _round(q3)},
+            "grade_histogram": {
+                label: int(count)
+                for label, count in zip(grade_labels, histogram[group])
+                if count and label
+            },
+        })
+    return results
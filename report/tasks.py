@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework.permissions import IsAuthenticated
+
+from jobs.registry import register
+from students.permissions import IsAdminOrTeacher
+from .batch import batch_payloads, merged_pdf, render_batch, stream_zip
+from .rendering import get_report_card, report_card_fingerprint
+
+
+# ============================================================
+# ⏳ REPORT CARD JOBS
+# ============================================================
+
+@register("report_card")
+def report_card_job(payload, job):
+    """Render (or reuse) one student's cached report card. Payload: {"student_id"}."""
+    student_id = int(payload["student_id"])
+    fingerprint = report_card_fingerprint(student_id)
+    if fingerprint is None:
+        raise ValueError(f"Student {student_id} does not exist.")
+    path = get_report_card(student_id, fingerprint)
+    return {
+        "file": str(path),
+        "filename": f"report_card_{student_id}.pdf",
+        "content_type": "application/pdf",
+    }
+
+
+@register("report_cards", permission_classes=[IsAuthenticated, IsAdminOrTeacher])
+def report_cards_job(payload, job):
+    """
+    Render a whole standard, section or exam. Payload: any of
+    {"standard_id", "section_id", "exam_id"} plus "output" ("zip" or "pdf").
+    """
+    filters = {
+        key: int(payload[key])
+        for key in ("standard_id", "section_id", "exam_id")
+        if payload.get(key) is not None
+    }
+    if not filters:
+        raise ValueError("Pass at least one of standard_id, section_id or exam_id.")
+    output = payload.get("output", "zip")
+    if output not in ("zip", "pdf"):
+        raise ValueError("output must be 'zip' or 'pdf'.")
+
+    payloads = batch_payloads(**filters)
+    target_dir = Path(settings.JOB_RESULTS_DIR)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    target = target_dir / f"report_cards_{job.pk}.{output}"
+    with open(target, "wb") as handle:
+        if output == "pdf":
+            handle.write(merged_pdf(payloads))
+        else:
+            for chunk in stream_zip(render_batch(payloads)):
+                handle.write(chunk)
+    return {
+        "file": str(target),
+        "filename": f"report_cards.{output}",
+        "content_type": "application/pdf" if output == "pdf" else "application/zip",
+        "students": len(payloads),
+    }
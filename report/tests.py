@@ -1,3 +1,292 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import zipfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from performance.models import Exam, Mark
+from performance.tests import make_class
+from .batch import batch_payloads, render_batch
+from .render_pool import get_pool, shutdown_pool
+
+
+# ============================================================
+# 📈 EXAM STATISTICS
+# ============================================================
+class ExamStatisticsViewTests(APITestCase):
+    def setUp(self):
+        self.exam, self.students, self.subjects = make_class(students=4, subjects=2)
+        self.other_exam, others, other_subjects = make_class("6", "B", students=1, subjects=1)
+        # Out of 50 for one subject, out of 100 for the other: same percentages
+        for student, score in zip(self.students, (10, 20, 30, 40)):
+            Mark.objects.create(exam=self.exam, student=student, subject=self.subjects[0],
+                                marks_obtained=Decimal(score), max_marks=Decimal("50"))
+            Mark.objects.create(exam=self.exam, student=student, subject=self.subjects[1],
+                                marks_obtained=Decimal(score * 2), max_marks=Decimal("100"))
+        Mark.objects.create(exam=self.other_exam, student=others[0], subject=other_subjects[0],
+                            marks_obtained=Decimal("45"), max_marks=Decimal("50"))
+        self.url = reverse("exam-statistics")
+
+    def test_statistics_are_normalized_per_group(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(len(response.data), 3)
+
+        first, second, other = response.data
+        self.assertEqual(first["subject_id"], self.subjects[0].id)
+        self.assertEqual(first["section_name"], "A")
+        self.assertEqual(first["count"], 4)
+        self.assertEqual(first["mean"], 50.0)
+        self.assertEqual(first["median"], 50.0)
+        self.assertEqual(first["std_dev"], 22.36)
+        self.assertEqual((first["min"], first["max"]), (20.0, 80.0))
+        self.assertEqual(first["quartiles"], {"q1": 35.0, "q2": 50.0, "q3": 65.0})
+        self.assertEqual(first["grade_histogram"], {"D": 2, "B": 1, "A": 1})
+        self.assertEqual({k: v for k, v in second.items() if k not in ("subject_id", "subject_name")},
+                         {k: v for k, v in first.items() if k not in ("subject_id", "subject_name")})
+        self.assertEqual(other["grade_histogram"], {"A+": 1})
+
+    def test_filters_narrow_the_groups(self):
+        response = self.client.get(self.url, {"exam": self.exam.id, "subject": self.subjects[1].id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["subject_id"] for row in response.data], [self.subjects[1].id])
+
+    def test_bad_filter_is_rejected(self):
+        response = self.client.get(self.url, {"section": "abc"})
+
+        self.assertEqual(response.status_code, 400)
+
+
+# ============================================================
+# 🏆 LEADERBOARDS
+# ============================================================
+class LeaderboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.exam, self.students, self.subjects = make_class(students=4, subjects=1)
+        self.other_exam, self.others, other_subjects = make_class("6", "B", students=1, subjects=1)
+        for student, score in zip(self.students, (40, 45, 45, 20)):
+            Mark.objects.create(exam=self.exam, student=student, subject=self.subjects[0],
+                                marks_obtained=Decimal(score), max_marks=Decimal("50"))
+        Mark.objects.create(exam=self.other_exam, student=self.others[0], subject=other_subjects[0],
+                            marks_obtained=Decimal("15"), max_marks=Decimal("20"))
+
+    def board(self, **params):
+        return self.client.get(reverse("leaderboard", args=["section", self.exam.section_id]), params)
+
+    def test_ties_share_a_rank(self):
+        response = self.board(top=2)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["rank"] for row in response.data["results"]], [1, 1])
+        self.assertEqual(response.data["results"][0]["percentage"], 90.0)
+
+        ranks = [(row["student_id"], row["rank"]) for row in self.board().data["results"]]
+        self.assertEqual(ranks[2:], [(self.students[0].id, 3), (self.students[3].id, 4)])
+
+    def test_top_performers_ranks_on_percentage(self):
+        response = self.client.get(reverse("top-performers"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["percentage"] for row in response.data], [90.0, 90.0, 80.0])
+
+    def test_board_is_cached_until_a_mark_in_scope_changes(self):
+        self.board()
+        with self.assertNumQueries(0):
+            self.board()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Mark.objects.filter(exam=self.other_exam).get().save()
+        with self.assertNumQueries(0):
+            self.board()
+
+        mark = Mark.objects.get(student=self.students[3])
+        mark.marks_obtained = Decimal("50")
+        with self.captureOnCommitCallbacks(execute=True):
+            mark.save()
+        response = self.board(top=1)
+        self.assertEqual([row["student_id"] for row in response.data["results"]],
+                         [self.students[3].id])
+
+    def test_unknown_scope_is_not_found(self):
+        response = self.client.get(reverse("leaderboard", args=["planet", 1]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+# ============================================================
+# 🏫 CLASS PERFORMANCE
+# ============================================================
+class ClassPerformanceViewTests(APITestCase):
+    def test_reads_aggregates_normalized_by_max_marks(self):
+        exam, students, subjects = make_class(students=2, subjects=2)
+        for student in students:
+            Mark.objects.create(exam=exam, student=student, subject=subjects[0],
+                                marks_obtained=Decimal("25"), max_marks=Decimal("50"))
+            Mark.objects.create(exam=exam, student=student, subject=subjects[1],
+                                marks_obtained=Decimal("100"), max_marks=Decimal("100"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("class-performance"))
+
+        self.assertEqual(response.status_code, 200)
+        row = response.data[0]
+        self.assertEqual(row["student__standard__name"], "5")
+        self.assertEqual(row["avg_marks"], Decimal("62.5"))
+        self.assertEqual((row["avg_percentage"], row["std_dev"]), (75.0, 25.0))
+        self.assertEqual(row["count"], 4)
+
+
+# ============================================================
+# 🧾 REPORT CARDS
+# ============================================================
+class ReportCardViewTests(APITestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        settings_override = override_settings(REPORT_CARD_CACHE_DIR=self.cache_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.exam, self.students, self.subjects = make_class(students=1, subjects=2)
+        self.student = self.students[0]
+        for subject in self.subjects:
+            Mark.objects.create(exam=self.exam, student=self.student, subject=subject,
+                                marks_obtained=Decimal("40"), max_marks=Decimal("50"))
+        self.url = reverse("report-card", args=[self.student.id])
+
+    def download(self, **headers):
+        response = self.client.get(self.url, **headers)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_pdf_is_cached_and_revalidated_with_etag(self):
+        response, body = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(body.startswith(b"%PDF"))
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            again, cached = self.download()
+        self.assertEqual((again["ETag"], cached), (etag, body))
+
+        with self.assertNumQueries(1):
+            not_modified, _ = self.download(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], etag)
+
+    def test_changed_marks_produce_a_new_card(self):
+        response, _ = self.download()
+        mark = Mark.objects.first()
+        mark.marks_obtained = Decimal("10")
+        mark.save()
+
+        changed, body = self.download(HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+        self.assertEqual(len(list(Path(self.cache_dir).glob("*.pdf"))), 1)
+
+    def test_long_transcript_splits_across_pages_in_constant_queries(self):
+        with self.assertNumQueries(3):  # fingerprint, student, marks
+            response, body = self.download()
+        self.assertEqual(body.count(b"/Type /Page\n"), 1)
+
+        for i in range(1, 30):
+            exam = Exam.objects.create(name=f"Test {i}", date=self.exam.date.replace(day=i),
+                                       standard=self.exam.standard, section=self.exam.section)
+            for subject in self.subjects:
+                Mark.objects.create(exam=exam, student=self.student, subject=subject,
+                                    marks_obtained=Decimal("30"), max_marks=Decimal("50"))
+
+        with self.assertNumQueries(3):
+            response, body = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(body.count(b"/Type /Page\n"), 3)
+
+    def test_names_with_markup_characters_render(self):
+        user = self.student.user
+        user.first_name, user.last_name = "O'Neil", "& <i"
+        user.save()
+        self.exam.name = "Term <1> & Finals"
+        self.exam.save()
+
+        response, body = self.download()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(body.startswith(b"%PDF"))
+
+    def test_unknown_student_is_not_found(self):
+        self.assertEqual(self.client.get(reverse("report-card", args=[999])).status_code, 404)
+
+
+class ReportCardBatchTests(APITestCase):
+    def setUp(self):
+        self.exam, self.students, self.subjects = make_class(students=3, subjects=2)
+        for student in self.students:
+            for subject in self.subjects:
+                Mark.objects.create(exam=self.exam, student=student, subject=subject,
+                                    marks_obtained=Decimal("35"), max_marks=Decimal("50"))
+        self.client.force_authenticate(User.objects.create(username="teacher", role="TEACHER"))
+        self.url = reverse("report-card-batch")
+
+    def test_payloads_are_prefetched_in_two_queries(self):
+        with self.assertNumQueries(2):
+            payloads = batch_payloads(section_id=self.exam.section_id)
+
+        self.assertEqual([p["student_id"] for p in payloads], [s.id for s in self.students])
+        self.assertEqual(len(payloads[0]["exams"][0]["rows"]), 2)
+
+    def test_pool_renders_in_input_order(self):
+        payloads = batch_payloads(exam_id=self.exam.id)
+        self.addCleanup(shutdown_pool)
+
+        results = list(render_batch(payloads, workers=2))
+        self.assertIs(get_pool(2), get_pool(2))
+
+        self.assertEqual([p["student_id"] for p, _ in results], [s.id for s in self.students])
+        self.assertTrue(all(pdf.startswith(b"%PDF") for _, pdf in results))
+
+    def test_zip_is_streamed_with_one_card_per_student(self):
+        response = self.client.get(self.url, {"section": self.exam.section_id})
+
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(
+            sorted(archive.namelist()),
+            sorted(f"report_card_{s.id}.pdf" for s in self.students),
+        )
+
+    def test_merged_pdf_and_validation(self):
+        response = self.client.get(self.url, {"exam": self.exam.id, "output": "pdf"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.count(b"/Type /Page\n"), 3)
+
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"standard": 999}).status_code, 404)
+
+    def test_command_writes_zip(self):
+        target = Path(tempfile.mkdtemp()) / "cards.zip"
+        self.addCleanup(shutil.rmtree, target.parent, ignore_errors=True)
+
+        out = StringIO()
+        call_command("render_report_cards", section=self.exam.section_id, output=str(target),
+                     workers=1, stdout=out)
+
+        self.assertEqual(len(zipfile.ZipFile(target).namelist()), 3)
+        self.assertIn("Rendered 3 report cards", out.getvalue())
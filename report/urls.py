@@ -1,13 +1,25 @@
 from django.urls import path
-from .views import ReportCardView, ClassPerformanceView, TopPerformersView
+from .views import (
+    ReportCardView, ReportCardBatchView, ClassPerformanceView, TopPerformersView, LeaderboardView,
+    ExamStatisticsView,
+)
 
 urlpatterns = [
     # Generate PDF report card for a student
     path('report-card/<int:student_id>/', ReportCardView.as_view(), name='report-card'),
 
+    # Generate report cards for a whole standard, section or exam (ZIP or merged PDF)
+    path('report-cards/', ReportCardBatchView.as_view(), name='report-card-batch'),
+
     # Get class-wise average performance
     path('class-performance/', ClassPerformanceView.as_view(), name='class-performance'),
     
     # Get top 3 performers
     path('top-performers/', TopPerformersView.as_view(), name='top-performers'),
+
+    # Get top students of a standard, section, exam or subject
+    path('leaderboards/<str:scope>/<int:scope_id>/', LeaderboardView.as_view(), name='leaderboard'),
+
+    # Get mark statistics per exam, subject and section
+    path('exam-statistics/', ExamStatisticsView.as_view(), name='exam-statistics'),
 ]
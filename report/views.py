@@ -1,19 +1,20 @@
-from django.shortcuts import get_object_or_404
-from django.http import HttpResponse
-from rest_framework import generics
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from django.db.models import Avg
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.platypus import Table, TableStyle
-from io import BytesIO
+from django.db.models import Max, Min, Sum
 from accounts.permissions import IsTeacherOrPrincipal, IsPrincipal
-from students.models import Student
-from performance.models import Mark
+from jobs.serializers import JobSerializer
+from jobs.services import enqueue
+from performance.models import Mark, SectionSubjectAggregate
+from students.permissions import IsAdminOrTeacher
+from .batch import batch_payloads, merged_pdf, render_batch, stream_zip
+from .rendering import get_report_card, report_card_fingerprint
+from .leaderboards import LEADERBOARD_SIZE, SCOPES, get_leaderboard
+from .statistics import exam_statistics
 
 
 # ------------------------------
@@ -23,72 +24,106 @@ class ReportCardView(APIView):
     permission_classes = []
 
     def get(self, request, student_id):
-        student = get_object_or_404(Student, id=student_id)
-        marks = Mark.objects.filter(student=student)
-
-        # Create a byte buffer for PDF
-        buffer = BytesIO()
-
-        # Create a canvas
-        p = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-
-        # Title
-        p.setFont("Helvetica-Bold", 16)
-        p.drawString(200, height - 80, f"Report Card")
-
-        p.setFont("Helvetica", 12)
-        p.drawString(100, height - 110, f"Student: {student.user.get_full_name()}")
-        p.drawString(100, height - 130, f"Student ID: {student.id}")
-
-        # Prepare table data
-        y_position = height - 200
-        data = [["Subject", "Marks Obtained", "Max Marks", "Grade"]]  # table header
-
-        if marks.exists():
-            for mark in marks:
-                data.append([
-                    mark.subject.name,
-                    str(mark.marks_obtained),
-                    str(mark.max_marks),
-                    mark.grade
-                ])
+        """
+        Serves the student's report card PDF from the disk cache, keyed by
+        a fingerprint of their marks. The fingerprint is also the ETag, so
+        a repeat download with If-None-Match costs one query and a 304.
+        """
+        fingerprint = report_card_fingerprint(student_id)
+        if fingerprint is None:
+            raise NotFound("Student not found.")
+
+        etag = f'"{fingerprint}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        path = get_report_card(student_id, fingerprint)
+        response = FileResponse(
+            open(path, 'rb'),
+            as_attachment=True,
+            filename=f"report_card_{student_id}.pdf",
+            content_type='application/pdf',
+        )
+        response['ETag'] = etag
+        # Always revalidate; the ETag makes that cheap
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def post(self, request, student_id):
+        """Queues rendering in the background and returns 202 with the job."""
+        if report_card_fingerprint(student_id) is None:
+            raise NotFound("Student not found.")
+        job = enqueue(
+            "report_card",
+            {'student_id': student_id},
+            created_by=request.user if request.user.is_authenticated else None,
+        )
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+# ------------------------------
+# Batch Report Cards
+# ------------------------------
+class ReportCardBatchView(APIView):
+    # Whole-school renders are queued work; the jobs API checks the same
+    permission_classes = [IsAuthenticated, IsAdminOrTeacher]
+
+    filter_params = ('standard', 'section', 'exam')
+    outputs = ('zip', 'pdf')
+
+    def get_options(self, params):
+        filters = {}
+        for param in self.filter_params:
+            value = params.get(param)
+            if value is not None:
+                try:
+                    filters[f'{param}_id'] = int(value)
+                except (TypeError, ValueError):
+                    raise ValidationError({param: "Must be an integer id."})
+        if not filters:
+            raise ValidationError("Pass at least one of standard, section or exam.")
+        output = params.get('output', 'zip')
+        if output not in self.outputs:
+            raise ValidationError({'output': "Must be 'zip' or 'pdf'."})
+        return filters, output
+
+    def post(self, request):
+        """
+        Queues the same batch as a background job and returns 202 with
+        the job; download the file from the jobs API when it succeeds.
+        """
+        filters, output = self.get_options(request.data)
+        job = enqueue(
+            "report_cards",
+            {**filters, 'output': output},
+            created_by=request.user if request.user.is_authenticated else None,
+        )
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    def get(self, request):
+        """
+        Renders every student's report card for ?standard=, ?section= or
+        ?exam=. ?output=zip (default) streams one PDF per student, rendered
+        across a process pool; ?output=pdf returns a single merged PDF
+        drawn in this process.
+        """
+        filters, output = self.get_options(request.query_params)
+
+        payloads = batch_payloads(**filters)
+        if not payloads:
+            raise NotFound("No students found.")
+
+        if output == 'pdf':
+            response = HttpResponse(merged_pdf(payloads), content_type='application/pdf')
         else:
-            data.append(["No marks available", "", "", ""])
-
-        # Create the table
-        table = Table(data, colWidths=[2.5 * inch, 1.5 * inch, 1.5 * inch, 1.0 * inch])
-
-        # Add some styling
-        style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ])
-        table.setStyle(style)
-
-        # Render the table
-        table.wrapOn(p, width, height)
-        table.drawOn(p, 70, y_position - 20 * len(data))
-
-        p.showPage()
-        p.save()
-
-        # Get PDF data
-        pdf = buffer.getvalue()
-        buffer.close()
-
-        # Create HTTP response
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="report_card_{student_id}.pdf"'
-        response.write(pdf)
+            response = StreamingHttpResponse(
+                stream_zip(render_batch(payloads)), content_type='application/zip'
+            )
+        response['Content-Disposition'] = f'attachment; filename="report_cards.{output}"'
         return response
 
+
 # ------------------------------
 # Class Performance Summary
 # ------------------------------
@@ -96,46 +131,125 @@ class ClassPerformanceView(generics.ListAPIView):
     # permission_classes = [IsAuthenticated, IsPrincipal]
     permission_classes = []
 
+    filter_params = {'exam': 'exam_id', 'section': 'section_id', 'subject': 'subject_id'}
 
     def get_queryset(self):
         """
-        Returns average marks per standard.
+        Returns average marks, average percentage and its spread per
+        standard, summed from the maintained section subject aggregates
+        (optionally filtered by ?exam=, ?section=, ?subject=).
         """
+        filters = {}
+        for param, lookup in self.filter_params.items():
+            value = self.request.query_params.get(param)
+            if value is not None:
+                try:
+                    filters[lookup] = int(value)
+                except ValueError:
+                    raise ValidationError({param: "Must be an integer id."})
         return (
-            Mark.objects
-            .values('student__standard__name')
-            .annotate(avg_marks=Avg('marks_obtained'))
-            .order_by('student__standard__name')
+            SectionSubjectAggregate.objects
+            .filter(**filters)
+            .values('section__standard__name')
+            .annotate(
+                count=Sum('count'),
+                sum_marks=Sum('sum_marks'),
+                sum_percentage=Sum('sum_percentage'),
+                sum_squares=Sum('sum_squares'),
+                min_percentage=Min('min_percentage'),
+                max_percentage=Max('max_percentage'),
+            )
+            .order_by('section__standard__name')
         )
 
     def list(self, request, *args, **kwargs):
-        data = list(self.get_queryset())
+        data = []
+        for row in self.get_queryset():
+            mean = row['sum_percentage'] / row['count']
+            variance = max(row['sum_squares'] / row['count'] - mean * mean, 0.0)
+            data.append({
+                'student__standard__name': row['section__standard__name'],
+                'avg_marks': row['sum_marks'] / row['count'],
+                'avg_percentage': round(mean, 2),
+                'std_dev': round(variance ** 0.5, 2),
+                'min_percentage': round(row['min_percentage'], 2),
+                'max_percentage': round(row['max_percentage'], 2),
+                'count': row['count'],
+            })
         return Response(data)
 
 
 # ------------------------------
 # Top Performers
 # ------------------------------
-class TopPerformersView(generics.ListAPIView):
+def get_top(request, default):
+    """Read ?top= from the request, clamped to [1, LEADERBOARD_SIZE]."""
+    try:
+        top = int(request.query_params.get('top', default))
+    except ValueError:
+        raise ValidationError({'top': "Must be an integer."})
+    return max(1, min(top, LEADERBOARD_SIZE))
+
+
+class TopPerformersView(APIView):
     # permission_classes = [IsAuthenticated, IsPrincipal]
     permission_classes = []
 
-    def get_queryset(self):
+    def get(self, request):
         """
-        Returns top 3 students by average marks.
+        Returns the school-wide top 3 students by percentage (?top= for more).
         """
-        return (
-            Mark.objects
-            .values(
-                'student__id',
-                'student__user__first_name',
-                'student__user__last_name',
-                'student__standard__name'
-            )
-            .annotate(avg_marks=Avg('marks_obtained'))
-            .order_by('-avg_marks')[:3]
-        )
+        return Response(get_leaderboard(top=get_top(request, 3)))
 
-    def list(self, request, *args, **kwargs):
-        data = list(self.get_queryset())
-        return Response(data)
+
+# ------------------------------
+# Leaderboards
+# ------------------------------
+class LeaderboardView(APIView):
+    # permission_classes = [IsAuthenticated, IsTeacherOrPrincipal]
+    permission_classes = []
+
+    def get(self, request, scope, scope_id):
+        """
+        Returns the top students of a standard, section, exam or subject
+        by percentage. Tied students share a rank (?top=, default 10).
+        """
+        if scope not in SCOPES:
+            raise NotFound(f"Unknown leaderboard scope '{scope}'.")
+        return Response({
+            'scope': scope,
+            'id': scope_id,
+            'results': get_leaderboard(scope, scope_id, get_top(request, 10)),
+        })
+
+
+# ------------------------------
+# Exam Statistics
+# ------------------------------
+class ExamStatisticsView(APIView):
+    # permission_classes = [IsAuthenticated, IsTeacherOrPrincipal]
+    permission_classes = []
+
+    filter_params = {
+        'exam': 'exam_id',
+        'subject': 'subject_id',
+        'section': 'exam__section_id',
+        'standard': 'exam__standard_id',
+    }
+
+    def get(self, request):
+        """
+        Returns percentage statistics per exam x subject x section.
+        Optional filters: ?exam=, ?subject=, ?section=, ?standard= (ids).
+        """
+        filters = {}
+        for param, lookup in self.filter_params.items():
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            try:
+                filters[lookup] = int(value)
+            except ValueError:
+                raise ValidationError({param: "Must be an integer id."})
+
+        return Response(exam_statistics(Mark.objects.filter(**filters)))
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Standard, Section, Student
+from django.db import transaction
+
+from .models import Standard, Section, Student, Attendance
+from .services import refresh_attendance_summaries
 
 
 # ============================================================
@@ -63,3 +66,44 @@ class StudentAdmin(admin.ModelAdmin):
         """Display the student's email (from linked user)."""
         return obj.user.email
     user_email.short_description = "Email"
+
+
+
+# ------------------------------------------------------------
+# 📅 Attendance Admin
+# ------------------------------------------------------------
+@admin.register(Attendance)
+class AttendanceAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the Attendance model.
+    Every edit refreshes the attendance rollups and bitmaps in the
+    same transaction.
+    """
+    list_display = ("id", "student", "date", "status", "marked_by")
+    list_filter = ("status", "date")
+    search_fields = ("student__username", "student__first_name", "student__last_name")
+    date_hierarchy = "date"
+
+    def save_model(self, request, obj, form, change):
+        """Save the row and refresh summaries for its old and new keys."""
+        with transaction.atomic():
+            keys = set(
+                Attendance.objects.filter(pk=obj.pk).values_list("student_id", "date")
+            ) if change else set()
+            super().save_model(request, obj, form, change)
+            keys.add((obj.student_id, obj.date))
+            refresh_attendance_summaries(keys)
+
+    def delete_model(self, request, obj):
+        """Delete the row and refresh summaries for its key."""
+        with transaction.atomic():
+            key = (obj.student_id, obj.date)
+            super().delete_model(request, obj)
+            refresh_attendance_summaries([key])
+
+    def delete_queryset(self, request, queryset):
+        """Bulk delete from the changelist and refresh every affected key."""
+        with transaction.atomic():
+            keys = set(queryset.values_list("student_id", "date"))
+            super().delete_queryset(request, queryset)
+            refresh_attendance_summaries(keys)
@@ -0,0 +1,20 @@
+import os
+
+
+# ============================================================
+# 🔑 PASSWORD HASHING WORKERS
+# ============================================================
+# Runs inside spawned pool processes, so nothing here may import models
+# before the worker has set Django up.
+
+def setup_worker(settings_module):
+    # Hashers read PASSWORD_HASHERS from settings
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+def hash_password(password):
+    """make_password() for a worker; a blank password becomes an unusable one without hashing."""
+    from django.contrib.auth.hashers import make_password
+    return make_password(password or None)
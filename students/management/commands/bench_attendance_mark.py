@@ -0,0 +1,109 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from students.models import Attendance, Section, Standard, Student
+from students.serializers import AttendanceMarkSerializer
+from students.services import bulk_mark_attendance
+
+
+class _Rollback(Exception):
+    """Raised to discard every row the benchmark wrote."""
+
+
+class Command(BaseCommand):
+    """
+    Compares the per-row attendance path with the bulk upsert path.
+
+    Usage:
+        python manage.py bench_attendance_mark --sizes 1,10,60,250,1000
+
+    All synthetic students and attendance rows are created inside a
+    transaction that is rolled back at the end, so the database is left
+    untouched.
+    """
+    help = "Benchmark query count and latency of attendance marking by batch size."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1,10,60,250,1000",
+                            help="Comma separated batch sizes to measure.")
+        parser.add_argument("--repeat", type=int, default=3,
+                            help="Runs per batch size; the best time is reported.")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--sizes must be a comma separated list of integers.")
+
+        self.stdout.write(f"{'batch':>6} {'path':>8} {'queries':>8} {'ms':>10} {'ms/row':>8}")
+        try:
+            with transaction.atomic():
+                student_ids = self._create_students(max(sizes))
+                for size in sizes:
+                    paths = (("per-row", self._per_row, 2000), ("bulk", self._bulk, 2001))
+                    for path, run, year in paths:
+                        queries, seconds = self._measure(
+                            run, student_ids[:size], options["repeat"], year
+                        )
+                        self.stdout.write(
+                            f"{size:>6} {path:>8} {queries:>8} "
+                            f"{seconds * 1000:>10.2f} {seconds * 1000 / size:>8.3f}"
+                        )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    # --------------------------------------------------------
+    # Helpers
+    # --------------------------------------------------------
+    def _create_students(self, count):
+        standard = Standard.objects.create(name="bench-std")
+        section = Section.objects.create(name="B", standard=standard)
+        users = User.objects.bulk_create(
+            User(username=f"bench-student-{i}", role="STUDENT") for i in range(count)
+        )
+        students = Student.objects.bulk_create(
+            Student(user=user, standard=standard, section=section) for user in users
+        )
+        return [student.id for student in students]
+
+    def _payload(self, student_ids, day):
+        return [
+            {"student_id": student_id, "date": day.isoformat(), "status": "PRESENT"}
+            for student_id in student_ids
+        ]
+
+    def _per_row(self, payload):
+        # Mirrors the original view: one validation query and one
+        # update_or_create per item.
+        for row in payload:
+            serializer = AttendanceMarkSerializer(data=row)
+            serializer.is_valid(raise_exception=True)
+            item = serializer.validated_data
+            Attendance.objects.update_or_create(
+                student_id=item["user_id"],
+                date=item["date"],
+                defaults={"status": item["status"], "marked_by": None},
+            )
+
+    def _bulk(self, payload):
+        serializer = AttendanceMarkSerializer(data=payload, many=True)
+        serializer.is_valid(raise_exception=True)
+        bulk_mark_attendance(serializer.validated_data)
+
+    def _measure(self, run, student_ids, repeat, year):
+        best_seconds, queries = None, 0
+        for attempt in range(max(repeat, 1)):
+            payload = self._payload(student_ids, date(year, 1, 1 + attempt % 28))
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                run(payload)
+                elapsed = time.perf_counter() - started
+            queries = len(ctx.captured_queries)
+            best_seconds = elapsed if best_seconds is None else min(best_seconds, elapsed)
+        return queries, best_seconds
@@ -0,0 +1,118 @@
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from performance.models import Exam, Mark
+from performance.ranking import with_stored_ranks
+from students.models import Section, Standard, Student, Subject
+from students.serializers import MarkListSerializer, MarkSerializer
+
+
+class _Rollback(Exception):
+    """Raised to discard every row the benchmark wrote."""
+
+
+class Command(BaseCommand):
+    """
+    Compares the nested MarkSerializer with the flat MarkListSerializer.
+
+    Usage:
+        python manage.py bench_mark_serializers --rows 10000
+
+    Synthetic marks are created inside a transaction that is rolled back
+    at the end, so the database is left untouched. Each path is timed
+    from query to serialized data, as a list view would run it.
+    """
+    help = "Benchmark nested vs flat mark list serialization."
+
+    subjects = 10
+    exams = 10
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000,
+                            help="Marks to serialize (rounded to whole students).")
+        parser.add_argument("--repeat", type=int, default=3,
+                            help="Runs per path; the best time is reported.")
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1:
+            raise CommandError("--rows must be positive.")
+
+        paths = (("nested", self._nested), ("flat", self._flat))
+        self.stdout.write(f"{'path':>8} {'rows':>7} {'queries':>8} {'ms':>10} {'us/row':>8}")
+        try:
+            with transaction.atomic():
+                marks = self._create_marks(options["rows"])
+                for path, run in paths:
+                    rows, queries, seconds = self._measure(run, marks, options["repeat"])
+                    self.stdout.write(
+                        f"{path:>8} {rows:>7} {queries:>8} "
+                        f"{seconds * 1000:>10.2f} {seconds * 1e6 / max(rows, 1):>8.1f}"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    # --------------------------------------------------------
+    # Helpers
+    # --------------------------------------------------------
+    def _create_marks(self, rows):
+        per_student = self.subjects * self.exams
+        count = max(1, -(-rows // per_student))
+
+        standard = Standard.objects.create(name="bench-std")
+        section = Section.objects.create(name="B", standard=standard)
+        teacher = User.objects.create(username="bench-teacher", role="TEACHER")
+        users = User.objects.bulk_create(
+            User(username=f"bench-student-{i}", role="STUDENT") for i in range(count)
+        )
+        students = Student.objects.bulk_create(
+            Student(user=user, standard=standard, section=section) for user in users
+        )
+        subjects = Subject.objects.bulk_create(
+            Subject(name=f"Bench {i}", code=f"BENCH-{i}", standard=standard, teacher=teacher)
+            for i in range(self.subjects)
+        )
+        exams = Exam.objects.bulk_create(
+            Exam(name=f"Bench {i}", date=date(2025, 6, 1) + timedelta(weeks=i),
+                 standard=standard, section=section)
+            for i in range(self.exams)
+        )
+        # bulk_create skips Mark.save(), so no grading or aggregates are written
+        Mark.objects.bulk_create(
+            (
+                Mark(exam=exam, student=student, subject=subject, entered_by=teacher,
+                     marks_obtained=Decimal(i % 50), max_marks=Decimal(50), grade="B")
+                for i, (student, subject, exam) in enumerate(
+                    (student, subject, exam)
+                    for student in students for subject in subjects for exam in exams
+                )
+            ),
+            batch_size=1000,
+        )
+        return Mark.objects.filter(exam__in=exams).order_by("-exam__date", "subject__name")
+
+    def _nested(self, marks):
+        queryset = with_stored_ranks(
+            marks.select_related("subject__standard", "subject__teacher", "exam", "entered_by", "student")
+        )
+        return MarkSerializer(queryset, many=True).data
+
+    def _flat(self, marks):
+        return MarkListSerializer(MarkListSerializer.rows(marks), many=True).data
+
+    def _measure(self, run, marks, repeat):
+        best_seconds, queries, rows = None, 0, 0
+        for _ in range(max(repeat, 1)):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                rows = len(run(marks))
+                elapsed = time.perf_counter() - started
+            queries = len(ctx.captured_queries)
+            best_seconds = elapsed if best_seconds is None else min(best_seconds, elapsed)
+        return rows, queries, best_seconds
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from students.services import flush_attendance_queue
+
+
+class Command(BaseCommand):
+    """
+    Drains device tap events from the attendance queue into Attendance.
+
+    Usage:
+        python manage.py flush_attendance_queue --once
+        python manage.py flush_attendance_queue --batch-size 1000 --interval 10
+
+    Without --once the command keeps running, flushing every batch that
+    is ready and then sleeping for --interval seconds.
+    """
+    help = "Flush queued attendance taps into Attendance in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Queue rows moved per transaction.")
+        parser.add_argument("--interval", type=float, default=5.0,
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true",
+                            help="Drain the queue once and exit.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        try:
+            while True:
+                flushed = self._drain(batch_size)
+                if flushed:
+                    self.stdout.write(f"Flushed {flushed} queued taps.")
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def _drain(self, batch_size):
+        total = 0
+        while True:
+            flushed = flush_attendance_queue(batch_size=batch_size)
+            total += flushed
+            if flushed < batch_size:
+                return total
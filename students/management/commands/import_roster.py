@@ -0,0 +1,53 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from students.roster import ROSTER_CHUNK_SIZE, RosterError, default_workers, import_roster
+
+
+class Command(BaseCommand):
+    """
+    Registers students from a .csv or .xlsx roster.
+
+    Usage:
+        python manage.py import_roster roster.csv
+        python manage.py import_roster roster.xlsx --workers 8 --chunk-size 1000
+
+    Columns: firstname, lastname, email, password, standard, section
+    (standard and section by name). Passwords are hashed across --workers
+    processes; rows that fail validation are listed and skipped.
+    """
+    help = "Import a student roster from a CSV or XLSX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Roster .csv or .xlsx file.")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Password hashing processes (default: ROSTER_IMPORT_WORKERS or CPU count).")
+        parser.add_argument("--chunk-size", type=int, default=ROSTER_CHUNK_SIZE,
+                            help="Rows inserted per transaction.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        workers = options["workers"] or default_workers()
+
+        started = time.perf_counter()
+        with open(path, "rb") as roster:
+            try:
+                result = import_roster(roster, path.name, workers, options["chunk_size"])
+            except RosterError as exc:
+                raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        for error in result["errors"]:
+            details = "; ".join(
+                f"{field}: {' '.join(str(message) for message in messages)}"
+                for field, messages in error["errors"].items()
+            )
+            self.stderr.write(f"Row {error['row']}: {details}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} students with {workers} workers in {elapsed:.2f}s "
+            f"({len(result['errors'])} rows skipped)."
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from students.services import rebuild_attendance_bitmaps
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the per-student academic year attendance bitmaps.
+
+    Usage:
+        python manage.py rebuild_attendance_bitmaps
+    """
+    help = "Rebuild attendance bitmaps from the raw Attendance rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Rows fetched and inserted per batch.")
+
+    def handle(self, *args, **options):
+        written = rebuild_attendance_bitmaps(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} attendance bitmaps."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from students.services import rebuild_attendance_rollups
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the student-month and section-day attendance rollups.
+
+    Usage:
+        python manage.py rebuild_attendance_rollups
+    """
+    help = "Rebuild attendance rollup tables from the raw Attendance rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000,
+                            help="Rows per INSERT statement.")
+
+    def handle(self, *args, **options):
+        months, days = rebuild_attendance_rollups(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {months} student-month and {days} section-day rollup rows."
+        ))
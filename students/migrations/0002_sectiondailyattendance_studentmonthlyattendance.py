@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+
+def build_rollups(apps, schema_editor):
+    """Populate the rollups from attendance recorded before they existed."""
+    Attendance = apps.get_model('students', 'Attendance')
+    StudentMonthlyAttendance = apps.get_model('students', 'StudentMonthlyAttendance')
+    SectionDailyAttendance = apps.get_model('students', 'SectionDailyAttendance')
+    counts = {
+        'present': Count('id', filter=Q(status='PRESENT')),
+        'absent': Count('id', filter=Q(status='ABSENT')),
+    }
+
+    month_rows = (
+        Attendance.objects.annotate(month=TruncMonth('date'))
+        .order_by().values('student_id', 'month').annotate(**counts)
+    )
+    StudentMonthlyAttendance.objects.bulk_create(
+        (StudentMonthlyAttendance(**row) for row in month_rows), batch_size=1000
+    )
+
+    section_rows = (
+        Attendance.objects.filter(student__student_profile__section__isnull=False)
+        .order_by().values('student__student_profile__section_id', 'date').annotate(**counts)
+    )
+    SectionDailyAttendance.objects.bulk_create(
+        (
+            SectionDailyAttendance(
+                section_id=row['student__student_profile__section_id'],
+                date=row['date'],
+                present=row['present'],
+                absent=row['absent'],
+            )
+            for row in section_rows
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectionDailyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_attendance', to='students.section')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('section', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentMonthlyAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'STUDENT'}, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_attendance', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month'],
+                'unique_together': {('student', 'month')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
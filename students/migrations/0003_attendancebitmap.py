@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:07
+
+from datetime import date
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_bitmaps(apps, schema_editor):
+    """Populate bitmaps from attendance recorded before they existed."""
+    Attendance = apps.get_model('students', 'Attendance')
+    AttendanceBitmap = apps.get_model('students', 'AttendanceBitmap')
+
+    def year_start(year):
+        return date(year, settings.ACADEMIC_YEAR_START_MONTH, settings.ACADEMIC_YEAR_START_DAY)
+
+    bits = {}
+    for student_id, day, status in Attendance.objects.values_list('student_id', 'date', 'status'):
+        year = day.year if day >= year_start(day.year) else day.year - 1
+        flag = 1 << (day - year_start(year)).days
+        entry = bits.setdefault((student_id, year), [0, 0])
+        entry[0] |= flag
+        if status == 'PRESENT':
+            entry[1] |= flag
+
+    def to_bytes(value):
+        return value.to_bytes((value.bit_length() + 7) // 8, 'little')
+
+    AttendanceBitmap.objects.bulk_create(
+        (
+            AttendanceBitmap(
+                student_id=student_id, academic_year=year,
+                marked=to_bytes(marked), present=to_bytes(present),
+            )
+            for (student_id, year), (marked, present) in bits.items()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_sectiondailyattendance_studentmonthlyattendance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceBitmap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('academic_year', models.PositiveSmallIntegerField(help_text='Calendar year in which the academic year starts')),
+                ('marked', models.BinaryField(default=b'')),
+                ('present', models.BinaryField(default=b'')),
+                ('student', models.ForeignKey(limit_choices_to={'role': 'STUDENT'}, on_delete=django.db.models.deletion.CASCADE, related_name='attendance_bitmaps', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('student', 'academic_year')},
+            },
+        ),
+        migrations.RunPython(build_bitmaps, migrations.RunPython.noop),
+    ]
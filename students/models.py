@@ -80,11 +80,120 @@ class Attendance(models.Model):
     class Meta:
         unique_together = ('student', 'date')
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date', 'id'], name='attendance_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.date} - {self.status}"
 
 
+# -------------------------
+# Attendance Ingestion Queue
+# -------------------------
+class AttendanceQueue(models.Model):
+    """
+    Device tap events waiting to be flushed into Attendance.
+
+    One row per (student, date): the first tap of the day is kept and
+    later taps are dropped on insert. Drained in batches by the
+    flush_attendance_queue management command.
+    """
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        limit_choices_to={"role": "STUDENT"},
+        related_name="queued_attendance"
+    )
+    date = models.DateField()
+    status = models.CharField(max_length=10, choices=Attendance.STATUS_CHOICES, default='PRESENT')
+    device_id = models.CharField(max_length=64, blank=True)
+    tapped_at = models.DateTimeField(help_text="When the device captured the tap")
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('student', 'date')
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.student.username} - {self.date} ({self.device_id or 'unknown device'})"
+
+
+# -------------------------
+# Attendance Rollup Models
+# -------------------------
+class StudentMonthlyAttendance(models.Model):
+    """
+    Present/absent counts per student per calendar month.
+    Maintained by students.services on every attendance write.
+    """
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        limit_choices_to={"role": "STUDENT"},
+        related_name="monthly_attendance"
+    )
+    month = models.DateField(help_text="First day of the month")
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('student', 'month')
+        ordering = ['-month']
+
+    def __str__(self):
+        return f"{self.student.username} - {self.month:%Y-%m} ({self.present}/{self.present + self.absent})"
+
+
+class SectionDailyAttendance(models.Model):
+    """
+    Present/absent counts per section per day.
+    Maintained by students.services on every attendance write.
+    """
+    section = models.ForeignKey(Section, on_delete=models.CASCADE, related_name="daily_attendance")
+    date = models.DateField()
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('section', 'date')
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.section} - {self.date} ({self.present}/{self.present + self.absent})"
+
+
+# -------------------------
+# Attendance Bitmap Model
+# -------------------------
+class AttendanceBitmap(models.Model):
+    """
+    Compact per-student attendance for one academic year.
+
+    Bit N of each bitmap is day N of the academic year (little-endian),
+    so range percentages are popcounts over a mask. `marked` has a bit
+    for every day with an Attendance row, `present` for every day the
+    student was present. Maintained by students.services.
+    """
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        limit_choices_to={"role": "STUDENT"},
+        related_name="attendance_bitmaps"
+    )
+    academic_year = models.PositiveSmallIntegerField(
+        help_text="Calendar year in which the academic year starts"
+    )
+    marked = models.BinaryField(default=b"")
+    present = models.BinaryField(default=b"")
+
+    class Meta:
+        unique_together = ('student', 'academic_year')
+
+    def __str__(self):
+        return f"{self.student.username} - {self.academic_year}"
+
+
 # -------------------------
 # Subject Model
 # -------------------------
@@ -0,0 +1,94 @@
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# ============================================================
+# 🔖 KEYSET CURSORS
+# ============================================================
+
+def encode_cursor(values):
+    """Encode a dict of keyset values into an opaque URL-safe token."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor(), rejecting garbage with a 400."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    if not isinstance(values, dict):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return values
+
+
+def cursor_date(position):
+    """Return the `date` stored in a decoded cursor, rejecting bad values with a 400."""
+    try:
+        value = parse_date(str(position.get("date")))
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return value
+
+
+def get_page_size(request, default=30, maximum=100):
+    """Read ?page_size= from the request, clamped to [1, maximum]."""
+    try:
+        size = int(request.query_params.get("page_size", default))
+    except (TypeError, ValueError):
+        raise ValidationError({"page_size": "Must be an integer."})
+    return max(1, min(size, maximum))
+
+
+class DateKeysetPagination(BasePagination):
+    """
+    Keyset pagination on (date, id), newest first.
+
+    The cursor holds the last (date, id) seen, so each page is an index
+    range scan no matter how deep the client has scrolled.
+    """
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = get_page_size(request, self.page_size, self.max_page_size)
+
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            position = decode_cursor(token)
+            last_date = cursor_date(position)
+            last_id = position.get("id")
+            if not isinstance(last_id, int):
+                raise ValidationError({"cursor": "Invalid cursor."})
+            queryset = queryset.filter(
+                Q(date__lt=last_date) | Q(date=last_date, id__lt=last_id)
+            )
+
+        rows = list(queryset.order_by("-date", "-id")[:size + 1])
+        self.next_cursor = None
+        if len(rows) > size:
+            rows = rows[:size]
+            self.next_cursor = encode_cursor({"date": rows[-1].date, "id": rows[-1].id})
+        return rows
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
@@ -1,5 +1,6 @@
 from rest_framework import permissions
-from .models import ParentStudent, Student
+from .models import Student
+from .relationships import relationships_for
 
 
 class IsTeacher(permissions.BasePermission):
@@ -14,37 +15,36 @@ class IsTeacher(permissions.BasePermission):
         )
 
 
+class IsAdminOrTeacher(permissions.BasePermission):
+    """
+    Allows access only to staff and users with role 'ADMIN' or 'TEACHER'.
+    """
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user
+            and user.is_authenticated
+            and (user.is_staff or getattr(user, 'role', '') in ('ADMIN', 'TEACHER'))
+        )
+
+
 class IsParentOrStudent(permissions.BasePermission):
     """
     Grants permission if the user is:
     - The student themselves
     - A parent linked to the student
     - An admin/staff user
+
+    The user's links are resolved once per request (see
+    students.relationships), so checking many objects costs no queries.
     """
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        user = request.user
-
         # Get student object from the object itself or its 'student' attribute
-        student = getattr(obj, 'student', None)
-        if student is None and isinstance(obj, Student):
-            student = obj
-
+        student = obj if isinstance(obj, Student) else getattr(obj, 'student', None)
         if student is None:
             return False
 
-        # Student checking themselves
-        if hasattr(student, 'user') and student.user == user:
-            return True
-
-        # Parent linked to this student
-        if ParentStudent.objects.filter(parent=user, student=student).exists():
-            return True
-
-        # Admin/staff override
-        return user.is_staff or user.role == "ADMIN"
-
-
-
+        return relationships_for(request).can_access(student)
@@ -0,0 +1,158 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+
+from accounts.models import TokenUser, User
+from .models import Student
+
+
+# ============================================================
+# 🔗 USER ↔ STUDENT RELATIONSHIPS
+# ============================================================
+
+# Links can be kept per process for RELATIONSHIP_CACHE_SECONDS (a setting;
+# off by default). Link edits made in the same process drop the affected
+# entries immediately, but other processes keep theirs until the TTL runs
+# out, so deployments opt in only where that staleness is acceptable.
+RELATIONSHIP_CACHE_SECONDS = 0
+RELATIONSHIP_CACHE_SIZE = 1024
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class Relationships:
+    """
+    How one user relates to students: their own student profile and the
+    students linked to them as a parent, each as (student id, user id).
+
+    `can_access(student)` answers "is this the user's own record, a
+    linked child's, or is the user an admin" for a Student, a student's
+    User (as on Attendance) or a Student id, without touching the database.
+
+    Built from token claims, only the children's Student ids are known;
+    their user ids are loaded by the first check against a User.
+    """
+    __slots__ = ("is_admin", "student_id", "student_user_id", "child_ids", "_child_user_ids")
+
+    def __init__(self, is_admin, own=None, children=()):
+        self.is_admin = is_admin
+        self.student_id, self.student_user_id = own or (None, None)
+        self.child_ids = frozenset(student_id for student_id, _ in children)
+        self._child_user_ids = frozenset(user_id for _, user_id in children)
+
+    @classmethod
+    def from_claims(cls, user, is_admin):
+        """Relationships of a TokenUser, read from its student_id and child_ids claims."""
+        relationships = cls(is_admin, (user.student_id, user.pk) if user.student_id else None)
+        relationships.child_ids = user.child_ids
+        relationships._child_user_ids = None if user.child_ids else frozenset()
+        return relationships
+
+    @property
+    def child_user_ids(self):
+        if self._child_user_ids is None:
+            self._child_user_ids = frozenset(
+                Student.objects.filter(id__in=self.child_ids).values_list("user_id", flat=True)
+            )
+        return self._child_user_ids
+
+    def is_student(self, student):
+        if isinstance(student, User):
+            return student.pk == self.student_user_id
+        return _student_pk(student) == self.student_id
+
+    def is_parent_of(self, student):
+        if isinstance(student, User):
+            return student.pk in self.child_user_ids
+        return _student_pk(student) in self.child_ids
+
+    def can_access(self, student):
+        return self.is_admin or self.is_student(student) or self.is_parent_of(student)
+
+
+def _student_pk(student):
+    return student.pk if isinstance(student, Student) else student
+
+
+def _ttl():
+    return getattr(settings, "RELATIONSHIP_CACHE_SECONDS", RELATIONSHIP_CACHE_SECONDS)
+
+
+def load_links(user_id):
+    """
+    One query for the user's own student profile and linked children.
+    Returns (own, children) as (student id, user id) pairs.
+    """
+    own, children = None, []
+    rows = (
+        Student.objects.filter(Q(user_id=user_id) | Q(parents__parent_id=user_id))
+        .values_list("id", "user_id")
+        .distinct()
+    )
+    for student_id, student_user_id in rows:
+        if student_user_id == user_id:
+            own = (student_id, student_user_id)
+        else:
+            children.append((student_id, student_user_id))
+    return own, tuple(children)
+
+
+def get_links(user_id):
+    """Return the user's links from the process-local LRU, loading them on a miss or after the TTL."""
+    ttl = _ttl()
+    if ttl <= 0:
+        return load_links(user_id)
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(user_id)
+        if entry is not None and now - entry[0] <= ttl:
+            _cache.move_to_end(user_id)
+            return entry[1]
+
+    links = load_links(user_id)
+    with _cache_lock:
+        _cache[user_id] = (now, links)
+        _cache.move_to_end(user_id)
+        while len(_cache) > RELATIONSHIP_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return links
+
+
+def forget_links(user_ids):
+    """Drop cached links of `user_ids` after their profile or parent links change."""
+    with _cache_lock:
+        for user_id in user_ids:
+            _cache.pop(user_id, None)
+
+
+def clear_relationship_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def relationships_for(request):
+    """
+    Return the Relationships of `request.user`, resolved once per request
+    and shared by every permission check and view that asks. A TokenUser
+    brings its links in its claims, so no lookup is needed.
+    """
+    user = request.user
+    user_id = getattr(user, "pk", None)
+    cached = getattr(request, "_relationships", None)
+    if cached is not None and cached[0] == user_id:
+        return cached[1]
+
+    if user is None or not user.is_authenticated:
+        relationships = Relationships(is_admin=False)
+    else:
+        is_admin = user.is_staff or getattr(user, "role", "") == "ADMIN"
+        if isinstance(user, TokenUser):
+            relationships = Relationships.from_claims(user, is_admin)
+        else:
+            relationships = Relationships(is_admin, *get_links(user_id))
+    request._relationships = (user_id, relationships)
+    return relationships
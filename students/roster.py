@@ -0,0 +1,215 @@
+import csv
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from accounts.models import User
+from .hashing import hash_password, setup_worker
+from .models import Section, Standard, Student
+from .relationships import forget_links
+from .serializers import RosterRowSerializer
+
+
+# ============================================================
+# 📥 ROSTER IMPORT
+# ============================================================
+# Rows are read lazily and handled in chunks: each chunk is validated
+# against standards and sections loaded once up front, its passwords are
+# hashed across a process pool, and its users and students are inserted
+# with two bulk_create calls in one transaction. Rows that fail are
+# reported with their line number; the rest of the chunk is imported.
+
+ROSTER_COLUMNS = ("firstname", "lastname", "email", "password", "standard", "section")
+ROSTER_CHUNK_SIZE = 500
+
+
+class RosterError(Exception):
+    """The roster file as a whole cannot be read."""
+
+
+def default_workers():
+    return getattr(settings, "ROSTER_IMPORT_WORKERS", None) or os.cpu_count() or 1
+
+
+def read_roster(file, filename):
+    """
+    Return an iterator of (line number, row dict) over a .csv or .xlsx
+    roster whose first row holds the column names. The header is checked
+    straight away; rows are read as they are consumed. `file` is a binary
+    file object.
+    """
+    if filename.lower().endswith(".xlsx"):
+        rows = _xlsx_rows(file)
+    elif filename.lower().endswith(".csv"):
+        rows = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    else:
+        raise RosterError("Roster must be a .csv or .xlsx file.")
+
+    try:
+        header = next(rows, None)
+    except UnicodeDecodeError:
+        raise RosterError("CSV rosters must be UTF-8 encoded.")
+    if header is None:
+        raise RosterError("Roster is empty.")
+    header = [str(name or "").strip().lower() for name in header]
+    missing = [column for column in ROSTER_COLUMNS if column != "password" and column not in header]
+    if missing:
+        raise RosterError(f"Roster is missing columns: {', '.join(missing)}.")
+    return _roster_rows(header, rows)
+
+
+def _roster_rows(header, rows):
+    for line, values in enumerate(rows, start=2):
+        row = {
+            name: "" if value is None else str(value).strip()
+            for name, value in zip(header, values)
+            if name in ROSTER_COLUMNS
+        }
+        if any(row.values()):
+            yield line, row
+
+
+def _xlsx_rows(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RosterError("Importing .xlsx rosters needs the openpyxl package; upload a .csv instead.")
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as exc:
+        raise RosterError("Could not read the .xlsx roster.") from exc
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _hash_passwords(passwords, pool=None, workers=1):
+    if pool is None:
+        return [hash_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(pool.map(hash_password, passwords, chunksize=chunksize))
+
+
+class RosterImporter:
+    """
+    Imports roster rows as STUDENT users with their Student records.
+    Use as `RosterImporter(workers).run(rows)` with rows from read_roster().
+    """
+
+    def __init__(self, workers=None, chunk_size=ROSTER_CHUNK_SIZE):
+        self.workers = workers or default_workers()
+        self.chunk_size = chunk_size
+        # One query each, whatever the roster size
+        self.standards = dict(Standard.objects.values_list("name", "id"))
+        self.sections = {
+            (standard_id, name): section_id
+            for section_id, standard_id, name in Section.objects.values_list("id", "standard_id", "name")
+        }
+        self.seen_emails = set()
+        self.created = 0
+        self.errors = []
+
+    def run(self, rows):
+        """Import every row; returns {"created", "errors": [{"row", "errors"}]}."""
+        rows = iter(rows)
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=setup_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "SMART_EDUP.settings"),),
+            )
+        try:
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        return {"created": self.created, "errors": self.errors}
+
+    def import_chunk(self, chunk, pool=None):
+        valid = self.validate_chunk(chunk)
+        if not valid:
+            return
+        hashes = _hash_passwords([row["password"] for _, row in valid], pool, self.workers)
+
+        users = [
+            User(
+                username=row["email"],
+                email=row["email"],
+                first_name=row["firstname"],
+                last_name=row["lastname"],
+                role="STUDENT",
+                password=password,
+            )
+            for (_, row), password in zip(valid, hashes)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            if users[0].pk is None:
+                # Backends that cannot return ids from a bulk insert
+                ids = dict(User.objects.filter(username__in=[user.username for user in users])
+                           .values_list("username", "id"))
+                for user in users:
+                    user.pk = ids[user.username]
+            Student.objects.bulk_create([
+                Student(user=user, standard_id=row["standard_id"], section_id=row["section_id"])
+                for user, (_, row) in zip(users, valid)
+            ])
+        # bulk_create skips post_save, so drop links cached for reused ids
+        forget_links([user.pk for user in users])
+        self.created += len(users)
+
+    def validate_chunk(self, chunk):
+        """Return the chunk's valid (line, row) pairs, recording errors for the rest."""
+        # Usernames may be stored in any case; rows already imported by an
+        # earlier, interrupted run are skipped here too
+        emails = [row.get("email", "").lower() for _, row in chunk]
+        taken = set(
+            User.objects.annotate(username_lower=Lower("username"))
+            .filter(username_lower__in=emails)
+            .values_list("username_lower", flat=True)
+        )
+
+        valid = []
+        for line, data in chunk:
+            serializer = RosterRowSerializer(data=data)
+            if not serializer.is_valid():
+                self.errors.append({"row": line, "errors": serializer.errors})
+                continue
+            row = dict(serializer.validated_data)
+            row["email"] = row["email"].lower()
+            errors = {}
+
+            row["standard_id"] = self.standards.get(row["standard"])
+            if row["standard_id"] is None:
+                errors["standard"] = [f"Unknown standard '{row['standard']}'."]
+            else:
+                row["section_id"] = self.sections.get((row["standard_id"], row["section"]))
+                if row["section_id"] is None:
+                    errors["section"] = [f"Unknown section '{row['section']}' in standard '{row['standard']}'."]
+            if row["email"] in taken or row["email"] in self.seen_emails:
+                errors["email"] = ["A user with this email already exists."]
+
+            if errors:
+                self.errors.append({"row": line, "errors": errors})
+                continue
+            self.seen_emails.add(row["email"])
+            valid.append((line, row))
+        return valid
+
+
+def import_roster(file, filename, workers=None, chunk_size=ROSTER_CHUNK_SIZE):
+    """Read and import a roster file. Raises RosterError if the file itself is unusable."""
+    return RosterImporter(workers, chunk_size).run(read_roster(file, filename))
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from accounts.models import User
 from performance.models import Exam, Mark
+from performance.ranking import with_stored_ranks
 from .models import Student, Standard, Section, ParentStudent, Attendance, Subject
 
 
@@ -60,6 +61,20 @@ class StudentRegistrationSerializer(serializers.ModelSerializer):
         }
 
 
+class RosterRowSerializer(serializers.Serializer):
+    """
+    One row of a roster import (see students.roster). `standard` and
+    `section` are names; a blank password leaves the account unusable
+    until it is reset.
+    """
+    firstname = serializers.CharField(max_length=150)
+    lastname = serializers.CharField(max_length=150)
+    email = serializers.EmailField()
+    password = serializers.CharField(required=False, allow_blank=True, default="")
+    standard = serializers.CharField()
+    section = serializers.CharField()
+
+
 # ============================================================
 #  LINK PARENT TO STUDENT
 # ============================================================
@@ -126,15 +141,66 @@ class AttendanceSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "marked_by"]
 
 
+class AttendanceMarkListSerializer(serializers.ListSerializer):
+    """
+    Validates a whole roll call with a single Student lookup instead of
+    one `.exists()` query per row, resolving each student's User id on
+    the way. Errors keep the per-row list shape.
+    """
+    def to_internal_value(self, data):
+        items = super().to_internal_value(data)
+
+        student_ids = {item["student_id"] for item in items}
+        user_ids = dict(
+            Student.objects.filter(id__in=student_ids).values_list("id", "user_id")
+        )
+        if user_ids.keys() == student_ids:
+            for item in items:
+                item["user_id"] = user_ids[item["student_id"]]
+            return items
+
+        errors = [
+            {} if item["student_id"] in user_ids
+            else {"student_id": ["Student with this ID does not exist."]}
+            for item in items
+        ]
+        raise serializers.ValidationError(errors)
+
+
 class AttendanceMarkSerializer(serializers.Serializer):
+    """
+    One attendance entry for a Student id. Validated data also carries
+    `user_id`, the student's User id, which is what Attendance references.
+    """
     student_id = serializers.IntegerField()
     date = serializers.DateField()
     status = serializers.ChoiceField(choices=[("PRESENT", "Present"), ("ABSENT", "Absent")])
 
-    def validate_student_id(self, value):
-        if not Student.objects.filter(id=value).exists():
-            raise serializers.ValidationError("Student with this ID does not exist.")
-        return value
+    class Meta:
+        list_serializer_class = AttendanceMarkListSerializer
+
+    def validate(self, attrs):
+        # Bulk payloads are resolved in one query by the list serializer
+        if isinstance(self.parent, AttendanceMarkListSerializer):
+            return attrs
+        user_id = Student.objects.filter(id=attrs["student_id"]).values_list("user_id", flat=True).first()
+        if user_id is None:
+            raise serializers.ValidationError({"student_id": "Student with this ID does not exist."})
+        attrs["user_id"] = user_id
+        return attrs
+
+
+class AttendanceTapSerializer(serializers.Serializer):
+    """
+    A single tap from an RFID or biometric reader. Student ids are
+    checked in bulk when the taps are queued.
+    """
+    student_id = serializers.IntegerField()
+    tapped_at = serializers.DateTimeField()
+    device_id = serializers.CharField(max_length=64, required=False, allow_blank=True)
+    status = serializers.ChoiceField(
+        choices=[("PRESENT", "Present"), ("ABSENT", "Absent")], default="PRESENT"
+    )
 
 
 class AttendanceDailySerializer(serializers.ModelSerializer):
@@ -183,18 +249,69 @@ class SubjectSerializer(serializers.ModelSerializer):
 class ExamSerializer(serializers.ModelSerializer):
     class Meta:
         model = Exam
-        fields = ["id", "name", "date", "total_marks"]
+        fields = ["id", "name", "date", "is_finalized"]
 
 
 class MarkSerializer(serializers.ModelSerializer):
+    """
+    Rank fields come from performance.ranking.with_stored_ranks() and
+    stay null until the exam is finalized.
+    """
     subject = SubjectSerializer(read_only=True)
     exam = ExamSerializer(read_only=True)
-    recorded_by = serializers.StringRelatedField()
+    recorded_by = serializers.StringRelatedField(source="entered_by")
+    subject_rank = serializers.IntegerField(read_only=True, allow_null=True)
+    subject_percentile = serializers.DecimalField(
+        max_digits=5, decimal_places=2, read_only=True, allow_null=True
+    )
+    exam_rank = serializers.IntegerField(read_only=True, allow_null=True)
+    exam_percentile = serializers.DecimalField(
+        max_digits=5, decimal_places=2, read_only=True, allow_null=True
+    )
+    class_size = serializers.IntegerField(read_only=True, allow_null=True)
 
     class Meta:
         model = Mark
         fields = [
             "id", "student", "subject", "exam", "marks_obtained",
-            "max_marks", "grade", "remarks", "recorded_by", "updated_at"
+            "max_marks", "grade", "remarks", "recorded_by", "updated_at",
+            "subject_rank", "subject_percentile", "exam_rank", "exam_percentile",
+            "class_size",
         ]
         read_only_fields = ["recorded_by", "updated_at"]
+
+
+class MarkListSerializer(serializers.Serializer):
+    """
+    Flat, read-only mark row for list endpoints.
+
+    Serializes the dicts produced by MarkListSerializer.rows() (a single
+    values() query with stored class ranks joined in), so no Subject,
+    Exam or User instances are built per row.
+    """
+    id = serializers.IntegerField()
+    student = serializers.IntegerField(source="student_id")
+    subject = serializers.IntegerField(source="subject_id")
+    subject_name = serializers.CharField(source="subject__name")
+    subject_code = serializers.CharField(source="subject__code")
+    exam = serializers.IntegerField(source="exam_id")
+    exam_name = serializers.CharField(source="exam__name")
+    exam_date = serializers.DateField(source="exam__date")
+    marks_obtained = serializers.DecimalField(max_digits=5, decimal_places=2)
+    max_marks = serializers.DecimalField(max_digits=5, decimal_places=2)
+    grade = serializers.CharField(allow_null=True)
+    remarks = serializers.CharField(allow_null=True)
+    recorded_by = serializers.CharField(source="entered_by__username", allow_null=True)
+    updated_at = serializers.DateTimeField()
+    subject_rank = serializers.IntegerField(allow_null=True)
+    subject_percentile = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
+    exam_rank = serializers.IntegerField(allow_null=True)
+    exam_percentile = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
+    class_size = serializers.IntegerField(allow_null=True)
+
+    @classmethod
+    def rows(cls, queryset):
+        """Narrow a Mark queryset to exactly the values this serializer reads."""
+        return with_stored_ranks(queryset).values(
+            *(field.source for field in cls().fields.values())
+        )
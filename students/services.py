@@ -0,0 +1,488 @@
+from collections import defaultdict, namedtuple
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+from .models import (
+    Attendance, AttendanceBitmap, AttendanceQueue, SectionDailyAttendance, Student,
+    StudentMonthlyAttendance
+)
+
+
+# ============================================================
+# 📅 ATTENDANCE WRITE SERVICES
+# ============================================================
+
+def bulk_mark_attendance(items, marked_by=None):
+    """
+    Upserts a whole roll call in one statement keyed on (student, date).
+
+    `items` are validated AttendanceMarkSerializer rows; each row's
+    `user_id` (the student's User id, which Attendance references) is
+    used. When the same (student, date) appears more than once the last
+    row wins, exactly as if update_or_create had been called once per item.
+
+    Returns the saved Attendance instances (with primary keys set) in the
+    order their (student, date) key first appeared.
+    """
+    latest = {}
+    for item in items:
+        latest[(int(item["user_id"]), item["date"])] = item["status"]
+
+    records = [
+        Attendance(student_id=student_id, date=date_, status=status_, marked_by=marked_by)
+        for (student_id, date_), status_ in latest.items()
+    ]
+
+    with transaction.atomic():
+        Attendance.objects.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=["student", "date"],
+            update_fields=["status", "marked_by"],
+        )
+        refresh_attendance_summaries(latest.keys())
+
+    return records
+
+
+def refresh_attendance_summaries(keys):
+    """
+    Bring every derived attendance store (rollups and bitmaps) in line
+    with a set of (student user id, date) writes. Call inside the same
+    transaction as the write.
+    """
+    keys = set(keys)
+    refresh_attendance_rollups(keys)
+    refresh_attendance_bitmaps(keys)
+
+
+def calculate_attendance_percentage(present_days, total_days):
+    """Calculate attendance percentage and return a formatted string."""
+    if total_days == 0:
+        return "0%"
+    percentage = (present_days / total_days) * 100
+    return f"{percentage:.2f}%"
+
+
+# ============================================================
+# 📡 DEVICE TAP INGESTION
+# ============================================================
+
+def enqueue_attendance_taps(events):
+    """
+    Buffer validated tap events in AttendanceQueue with one INSERT.
+
+    Events carry Student ids; they are resolved to the students' User
+    ids (what AttendanceQueue and Attendance reference) in one query.
+    Events for unknown students are not queued; their ids are returned
+    so the device can be told. Repeat taps for a (student, date) already
+    in the queue are ignored. Returns (queued, rejected_ids).
+    """
+    events = list(events)
+    student_ids = {event["student_id"] for event in events}
+    user_ids = dict(Student.objects.filter(id__in=student_ids).values_list("id", "user_id"))
+
+    rows = [
+        AttendanceQueue(
+            student_id=user_ids[event["student_id"]],
+            date=timezone.localdate(event["tapped_at"]),
+            status=event["status"],
+            device_id=event.get("device_id", ""),
+            tapped_at=event["tapped_at"],
+        )
+        for event in events
+        if event["student_id"] in user_ids
+    ]
+    AttendanceQueue.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows), sorted(student_ids - user_ids.keys())
+
+
+def flush_attendance_queue(batch_size=500):
+    """
+    Move up to `batch_size` queued taps into Attendance in one upsert and
+    delete them from the queue, all in one transaction. Taps for a
+    student and day that already have an Attendance row are dropped, so
+    a teacher's mark is never rewritten by a tap.
+    Returns the number of queue rows consumed.
+    """
+    with transaction.atomic():
+        batch = list(
+            AttendanceQueue.objects.select_for_update(skip_locked=True)
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            return 0
+
+        existing = set(
+            Attendance.objects
+            .filter(
+                student_id__in={tap.student_id for tap in batch},
+                date__in={tap.date for tap in batch},
+            )
+            .values_list("student_id", "date")
+        )
+        bulk_mark_attendance(
+            {"user_id": tap.student_id, "date": tap.date, "status": tap.status}
+            for tap in batch
+            if (tap.student_id, tap.date) not in existing
+        )
+        AttendanceQueue.objects.filter(id__in=[tap.id for tap in batch]).delete()
+
+    return len(batch)
+
+
+# ============================================================
+# 📊 ATTENDANCE ROLLUPS
+# ============================================================
+
+def month_start(day):
+    """Return the first day of the month containing `day`."""
+    return day.replace(day=1)
+
+
+def next_month_start(day):
+    """Return the first day of the month after the one containing `day`."""
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
+
+
+def refresh_attendance_rollups(keys):
+    """
+    Recompute the rollup rows touched by a set of attendance writes.
+
+    `keys` is an iterable of (student user id, date) pairs that were
+    created, changed or deleted. Only the matching student-month and
+    section-day rows are recomputed from Attendance and upserted, so the
+    cost depends on the size of the write, not on the length of history.
+    Call inside the same transaction as the write.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+
+    student_ids = {student_id for student_id, _ in keys}
+
+    # Student x month
+    month_keys = {(student_id, month_start(day)) for student_id, day in keys}
+    month_rows = (
+        Attendance.objects
+        .filter(
+            student_id__in=student_ids,
+            date__gte=min(month for _, month in month_keys),
+            date__lt=next_month_start(max(month for _, month in month_keys)),
+        )
+        .annotate(month=TruncMonth("date"))
+        .order_by()
+        .values("student_id", "month")
+        .annotate(
+            present=Count("id", filter=Q(status="PRESENT")),
+            absent=Count("id", filter=Q(status="ABSENT")),
+        )
+    )
+    month_counts = {(row["student_id"], row["month"]): row for row in month_rows}
+    StudentMonthlyAttendance.objects.bulk_create(
+        [
+            StudentMonthlyAttendance(
+                student_id=student_id,
+                month=month,
+                present=month_counts.get((student_id, month), {}).get("present", 0),
+                absent=month_counts.get((student_id, month), {}).get("absent", 0),
+            )
+            for student_id, month in month_keys
+        ],
+        update_conflicts=True,
+        unique_fields=["student", "month"],
+        update_fields=["present", "absent"],
+    )
+
+    # Section x day
+    section_by_student = dict(
+        Student.objects
+        .filter(user_id__in=student_ids, section__isnull=False)
+        .values_list("user_id", "section_id")
+    )
+    refresh_section_days({
+        (section_by_student[student_id], day)
+        for student_id, day in keys
+        if student_id in section_by_student
+    })
+
+
+def refresh_section_days(section_keys):
+    """
+    Recompute the section-day rollup rows for a set of (section id, date)
+    pairs from Attendance, counting each student under their current
+    section. Pairs with no attendance left are written as zeros.
+    """
+    section_keys = set(section_keys)
+    if not section_keys:
+        return
+
+    section_rows = (
+        Attendance.objects
+        .filter(
+            date__in={day for _, day in section_keys},
+            student__student_profile__section_id__in={section_id for section_id, _ in section_keys},
+        )
+        .order_by()
+        .values("student__student_profile__section_id", "date")
+        .annotate(
+            present=Count("id", filter=Q(status="PRESENT")),
+            absent=Count("id", filter=Q(status="ABSENT")),
+        )
+    )
+    section_counts = {
+        (row["student__student_profile__section_id"], row["date"]): row
+        for row in section_rows
+    }
+    SectionDailyAttendance.objects.bulk_create(
+        [
+            SectionDailyAttendance(
+                section_id=section_id,
+                date=day,
+                present=section_counts.get((section_id, day), {}).get("present", 0),
+                absent=section_counts.get((section_id, day), {}).get("absent", 0),
+            )
+            for section_id, day in section_keys
+        ],
+        update_conflicts=True,
+        unique_fields=["section", "date"],
+        update_fields=["present", "absent"],
+    )
+
+
+def refresh_student_sections(user_id, section_ids):
+    """
+    Recompute the section-day rollups of `section_ids` on every date the
+    student (by user id) has attendance, after the student moved between
+    them or left. Call inside the same transaction as the change.
+    """
+    section_ids = {section_id for section_id in section_ids if section_id is not None}
+    if not section_ids:
+        return
+    dates = set(Attendance.objects.filter(student_id=user_id).values_list("date", flat=True))
+    refresh_section_days({(section_id, day) for section_id in section_ids for day in dates})
+
+
+def rebuild_attendance_rollups(batch_size=1000):
+    """
+    Drop and rebuild both rollup tables from the raw Attendance table.
+    Returns a (student_months, section_days) tuple of rows written.
+    """
+    month_rows = (
+        Attendance.objects
+        .annotate(month=TruncMonth("date"))
+        .order_by()
+        .values("student_id", "month")
+        .annotate(
+            present=Count("id", filter=Q(status="PRESENT")),
+            absent=Count("id", filter=Q(status="ABSENT")),
+        )
+    )
+    section_rows = (
+        Attendance.objects
+        .filter(student__student_profile__section__isnull=False)
+        .order_by()
+        .values("student__student_profile__section_id", "date")
+        .annotate(
+            present=Count("id", filter=Q(status="PRESENT")),
+            absent=Count("id", filter=Q(status="ABSENT")),
+        )
+    )
+
+    with transaction.atomic():
+        StudentMonthlyAttendance.objects.all().delete()
+        SectionDailyAttendance.objects.all().delete()
+
+        months = StudentMonthlyAttendance.objects.bulk_create(
+            (StudentMonthlyAttendance(**row) for row in month_rows.iterator()),
+            batch_size=batch_size,
+        )
+        days = SectionDailyAttendance.objects.bulk_create(
+            (
+                SectionDailyAttendance(
+                    section_id=row["student__student_profile__section_id"],
+                    date=row["date"],
+                    present=row["present"],
+                    absent=row["absent"],
+                )
+                for row in section_rows.iterator()
+            ),
+            batch_size=batch_size,
+        )
+
+    return len(months), len(days)
+
+
+# ============================================================
+# 🧮 ATTENDANCE BITMAPS
+# ============================================================
+
+class AttendanceCounts(namedtuple("AttendanceCounts", ["present", "absent"])):
+    """Present/absent day counts for one student over a date range."""
+    __slots__ = ()
+
+    @property
+    def total(self):
+        return self.present + self.absent
+
+    @property
+    def percentage(self):
+        return calculate_attendance_percentage(self.present, self.total)
+
+
+def academic_year_start(year):
+    """Return the first day of the academic year starting in `year`."""
+    return date(year, settings.ACADEMIC_YEAR_START_MONTH, settings.ACADEMIC_YEAR_START_DAY)
+
+
+def academic_year_of(day):
+    """Return the academic year (by its starting calendar year) containing `day`."""
+    if day < academic_year_start(day.year):
+        return day.year - 1
+    return day.year
+
+
+def day_index(day):
+    """Return the bit position of `day` inside its academic year bitmap."""
+    return (day - academic_year_start(academic_year_of(day))).days
+
+
+def _to_int(bitmap):
+    return int.from_bytes(bytes(bitmap), "little")
+
+
+def _to_bytes(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def refresh_attendance_bitmaps(keys):
+    """
+    Rebuild the bitmaps of every (student, academic year) touched by a
+    set of (student user id, date) writes, from that year's rows only.
+    """
+    years_by_student = defaultdict(set)
+    for student_id, day in keys:
+        years_by_student[student_id].add(academic_year_of(day))
+    if not years_by_student:
+        return
+
+    first_year = min(min(years) for years in years_by_student.values())
+    last_year = max(max(years) for years in years_by_student.values())
+    rows = (
+        Attendance.objects
+        .filter(
+            student_id__in=years_by_student,
+            date__gte=academic_year_start(first_year),
+            date__lt=academic_year_start(last_year + 1),
+        )
+        .order_by()
+        .values_list("student_id", "date", "status")
+    )
+
+    bits = {
+        (student_id, year): [0, 0]
+        for student_id, years in years_by_student.items()
+        for year in years
+    }
+    for student_id, day, status_ in rows:
+        entry = bits.get((student_id, academic_year_of(day)))
+        if entry is None:
+            continue
+        flag = 1 << day_index(day)
+        entry[0] |= flag
+        if status_ == "PRESENT":
+            entry[1] |= flag
+
+    AttendanceBitmap.objects.bulk_create(
+        [
+            AttendanceBitmap(
+                student_id=student_id,
+                academic_year=year,
+                marked=_to_bytes(marked),
+                present=_to_bytes(present),
+            )
+            for (student_id, year), (marked, present) in bits.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["student", "academic_year"],
+        update_fields=["marked", "present"],
+    )
+
+
+def bitmap_attendance_counts(student_user_ids, from_date=None, to_date=None):
+    """
+    Return {student user id: AttendanceCounts} for an inclusive date
+    range (open-ended when a bound is None) with one query.
+
+    Each academic year in range is a masked popcount, so the cost does
+    not grow with the number of days of history.
+    """
+    bitmaps = AttendanceBitmap.objects.filter(student_id__in=student_user_ids)
+    if from_date:
+        bitmaps = bitmaps.filter(academic_year__gte=academic_year_of(from_date))
+    if to_date:
+        bitmaps = bitmaps.filter(academic_year__lte=academic_year_of(to_date))
+
+    totals = defaultdict(lambda: [0, 0])
+    for student_id, year, marked, present in bitmaps.values_list(
+        "student_id", "academic_year", "marked", "present"
+    ):
+        mask = -1
+        if from_date and academic_year_of(from_date) == year:
+            mask &= ~((1 << day_index(from_date)) - 1)
+        if to_date and academic_year_of(to_date) == year:
+            mask &= (1 << (day_index(to_date) + 1)) - 1
+
+        marked_days = (_to_int(marked) & mask).bit_count()
+        present_days = (_to_int(present) & mask).bit_count()
+        totals[student_id][0] += present_days
+        totals[student_id][1] += marked_days - present_days
+
+    return {
+        student_id: AttendanceCounts(present, absent)
+        for student_id, (present, absent) in totals.items()
+    }
+
+
+def rebuild_attendance_bitmaps(batch_size=1000):
+    """
+    Drop and rebuild every attendance bitmap from the raw Attendance
+    rows, streaming them in (student, date) order. Returns rows written.
+    """
+    def bitmaps():
+        current, marked, present = None, 0, 0
+        rows = (
+            Attendance.objects.order_by("student_id", "date")
+            .values_list("student_id", "date", "status")
+            .iterator(chunk_size=batch_size)
+        )
+        for student_id, day, status_ in rows:
+            key = (student_id, academic_year_of(day))
+            if key != current:
+                if current is not None:
+                    yield AttendanceBitmap(
+                        student_id=current[0], academic_year=current[1],
+                        marked=_to_bytes(marked), present=_to_bytes(present),
+                    )
+                current, marked, present = key, 0, 0
+            flag = 1 << day_index(day)
+            marked |= flag
+            if status_ == "PRESENT":
+                present |= flag
+        if current is not None:
+            yield AttendanceBitmap(
+                student_id=current[0], academic_year=current[1],
+                marked=_to_bytes(marked), present=_to_bytes(present),
+            )
+
+    with transaction.atomic():
+        AttendanceBitmap.objects.all().delete()
+        created = AttendanceBitmap.objects.bulk_create(bitmaps(), batch_size=batch_size)
+    return len(created)
@@ -0,0 +1,106 @@
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from .models import Attendance, ParentStudent, Student
+from .relationships import forget_links
+from .services import refresh_attendance_rollups, refresh_section_days, refresh_student_sections
+
+
+# ============================================================
+# 🔗 RELATIONSHIP CACHE INVALIDATION
+# ============================================================
+
+@receiver(post_save, sender=User)
+def user_created(sender, instance, created, **kwargs):
+    # A reused id must not inherit links cached for a deleted user
+    if created:
+        forget_links([instance.pk])
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def student_links_changed(sender, instance, **kwargs):
+    forget_links([instance.user_id])
+
+
+@receiver(post_save, sender=ParentStudent)
+@receiver(post_delete, sender=ParentStudent)
+def parent_links_changed(sender, instance, **kwargs):
+    forget_links([instance.parent_id])
+
+
+# ============================================================
+# 📊 SECTION ROLLUPS
+# ============================================================
+# Section-day rollups count students under their current section, so a
+# move (or removal) re-counts both sections on the student's dates.
+# Queryset .update() calls bypass these signals; run
+# rebuild_attendance_rollups after bulk section changes.
+
+@receiver(pre_save, sender=Student)
+def remember_section(sender, instance, **kwargs):
+    instance._previous_section_id = (
+        Student.objects.filter(pk=instance.pk).values_list("section_id", flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Student)
+def student_section_changed(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_section_id", None)
+    if previous != instance.section_id:
+        with transaction.atomic():
+            refresh_student_sections(instance.user_id, {previous, instance.section_id})
+
+
+@receiver(post_delete, sender=Student)
+def student_removed(sender, instance, **kwargs):
+    with transaction.atomic():
+        refresh_student_sections(instance.user_id, {instance.section_id})
+
+
+# Deleting attendance, directly or by deleting the student's User, has to
+# re-count the section days it was part of. The section is read before
+# the rows go (a cascade removes the Student too) and the affected days
+# are recomputed once, when the transaction commits.
+
+_deleted = threading.local()
+
+
+def _deleted_attendance():
+    if not hasattr(_deleted, "keys"):
+        _deleted.keys, _deleted.sections = set(), {}
+    return _deleted
+
+
+@receiver(pre_delete, sender=Attendance)
+def attendance_removed(sender, instance, **kwargs):
+    deleted = _deleted_attendance()
+    if instance.student_id not in deleted.sections:
+        deleted.sections[instance.student_id] = (
+            Student.objects.filter(user_id=instance.student_id).values_list("section_id", flat=True).first()
+        )
+    deleted.keys.add((instance.student_id, deleted.sections[instance.student_id], instance.date))
+    transaction.on_commit(refresh_deleted_attendance)
+
+
+def refresh_deleted_attendance():
+    """Recompute the rollups of attendance deleted in this thread since the last call."""
+    deleted = _deleted_attendance()
+    keys, deleted.keys, deleted.sections = deleted.keys, set(), {}
+    if not keys:
+        return
+    remaining = set(User.objects.filter(id__in={user_id for user_id, _, _ in keys}).values_list("id", flat=True))
+    with transaction.atomic():
+        # Students still here: their months and current section days
+        refresh_attendance_rollups({(user_id, day) for user_id, _, day in keys if user_id in remaining})
+        # Removed students: only the section days they were counted in
+        refresh_section_days({
+            (section_id, day)
+            for user_id, section_id, day in keys
+            if user_id not in remaining and section_id is not None
+        })
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from django.conf import settings
+
+from rest_framework.permissions import IsAuthenticated
+
+from jobs.registry import register
+from .permissions import IsAdminOrTeacher
+from .roster import import_roster
+
+
+# ============================================================
+# ⏳ ROSTER IMPORT JOBS
+# ============================================================
+
+def roster_upload_dir():
+    """Where uploaded rosters wait for their import job."""
+    return Path(settings.JOB_RESULTS_DIR) / "rosters"
+
+
+@register("roster_import", permission_classes=[IsAuthenticated, IsAdminOrTeacher])
+def roster_import_job(payload, job):
+    """
+    Import an uploaded roster. Payload: {"upload", "filename"}, where
+    "upload" names a file in roster_upload_dir(). Passwords are hashed
+    across ROSTER_IMPORT_WORKERS processes, as in the import_roster
+    command. Returns {"created", "errors"} as import_roster() does.
+    """
+    upload = str(payload["upload"])
+    if Path(upload).name != upload:
+        raise ValueError("upload must be a file name, not a path.")
+    path = roster_upload_dir() / upload
+    with open(path, "rb") as roster:
+        result = import_roster(roster, payload.get("filename") or upload)
+    path.unlink()
+    return result
@@ -1,3 +1,752 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from accounts.models import User
+from accounts.tokens import token_user, tokens_for_user
+from jobs.models import Job
+from jobs.services import work
+from performance.models import Exam, Mark
+from .models import (
+    Attendance, AttendanceQueue, ParentStudent, Section, SectionDailyAttendance, Standard, Student,
+    StudentMonthlyAttendance, Subject
+)
+from .permissions import IsParentOrStudent
+from .relationships import clear_relationship_cache, relationships_for
+from .services import bitmap_attendance_counts, bulk_mark_attendance
+
+
+def make_student(username, section, first_name="", last_name=""):
+    """
+    Create a student whose Student id differs from its User id, so a
+    view that confuses the two fails its tests.
+    """
+    user = User.objects.create(
+        username=username, first_name=first_name, last_name=last_name, role="STUDENT"
+    )
+    return Student.objects.create(
+        id=user.id + 1000, user=user, standard=section.standard, section=section
+    )
+
+
+# ============================================================
+# 📅 ATTENDANCE MARKING
+# ============================================================
+class AttendanceMarkViewTests(APITestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        self.standard = Standard.objects.create(name="5")
+        self.section = Section.objects.create(name="A", standard=self.standard)
+        self.students = [make_student(f"s{i}", self.section) for i in range(5)]
+        self.client.force_authenticate(self.teacher)
+        self.url = reverse("attendance-mark")
+
+    def payload(self, status_="PRESENT", day="2025-06-02"):
+        return [
+            {"student_id": student.id, "date": day, "status": status_}
+            for student in self.students
+        ]
+
+    def test_bulk_mark_uses_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, self.payload()[:2], format="json")
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, self.payload(day="2025-06-03"), format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(
+            set(response.data[0]), {"id", "student", "date", "status", "marked_by"}
+        )
+        self.assertTrue(all(row["id"] for row in response.data))
+        # Attendance references the students' users, not their Student ids
+        self.assertEqual(
+            {row["student"] for row in response.data}, {student.user_id for student in self.students}
+        )
+
+    def test_single_entry_is_stored_for_the_students_user(self):
+        response = self.client.post(self.url, self.payload()[0], format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]["student"], self.students[0].user_id)
+
+    def test_remarking_updates_existing_rows(self):
+        self.client.post(self.url, self.payload(), format="json")
+        response = self.client.post(self.url, self.payload("ABSENT"), format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Attendance.objects.count(), 5)
+        self.assertFalse(Attendance.objects.filter(status="PRESENT").exists())
+        self.assertEqual(
+            Attendance.objects.get(student_id=self.students[0].user_id, date=date(2025, 6, 2)).marked_by,
+            self.teacher,
+        )
+
+    def test_unknown_student_reports_row_errors(self):
+        payload = self.payload()[:2] + [
+            {"student_id": 999, "date": "2025-06-02", "status": "PRESENT"}
+        ]
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[:2], [{}, {}])
+        self.assertIn("student_id", response.data[2])
+        self.assertFalse(Attendance.objects.exists())
+
+
+# ============================================================
+# 📊 ATTENDANCE REPORTS
+# ============================================================
+class AttendanceReportPrincipalViewTests(APITestCase):
+    def setUp(self):
+        self.standard = Standard.objects.create(name="6")
+        self.section = Section.objects.create(name="B", standard=self.standard)
+        self.url = reverse("attendance-report-principal")
+
+    def add_students(self, count, offset=0):
+        for i in range(offset, offset + count):
+            student = make_student(f"r{i}", self.section, first_name=f"F{i}", last_name="L")
+            bulk_mark_attendance([
+                {"user_id": student.user_id, "date": date(2025, 6, 2), "status": "PRESENT"},
+                {"user_id": student.user_id, "date": date(2025, 6, 3), "status": "ABSENT"},
+            ])
+
+    def query_count(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"standard": "6", "section": "B", **params})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_is_independent_of_student_count(self):
+        self.add_students(2)
+        small, _ = self.query_count()
+        self.add_students(8, offset=2)
+        large, data = self.query_count()
+
+        self.assertEqual(small, large)
+        self.assertEqual(large, 2)
+        self.assertEqual(len(data["records"]), 10)
+
+    def test_raw_range_query_count_is_independent_of_student_count(self):
+        params = {"from_date": "2025-06-02", "to_date": "2025-06-20"}
+        self.add_students(2)
+        small, _ = self.query_count(**params)
+        self.add_students(8, offset=2)
+        large, _ = self.query_count(**params)
+
+        self.assertEqual(small, large)
+
+    def test_whole_month_range_matches_raw_rows(self):
+        self.add_students(3)
+        _, rollup = self.query_count(from_date="2025-06-01", to_date="2025-06-30")
+        _, raw = self.query_count(from_date="2025-06-01", to_date="2025-06-29")
+
+        self.assertEqual(rollup, raw)
+
+    def test_students_without_section_agree_with_raw_rows(self):
+        self.add_students(2)
+        loner = make_student("loner", self.section)
+        loner.section = None
+        loner.save()
+        bulk_mark_attendance([{"user_id": loner.user_id, "date": date(2025, 6, 9), "status": "PRESENT"}])
+
+        for params in ({}, {"standard": "6"}):
+            with self.subTest(**params):
+                rollup = self.client.get(self.url, {**params, "from_date": "2025-06-01", "to_date": "2025-06-30"})
+                raw = self.client.get(self.url, {**params, "from_date": "2025-06-01", "to_date": "2025-06-29"})
+                self.assertEqual(rollup.data["summary"]["total_days"], 3)
+                self.assertEqual(rollup.data, raw.data)
+
+    def test_moving_a_student_moves_their_section_days(self):
+        self.add_students(1)
+        other = Section.objects.create(name="C", standard=self.standard)
+        student = Student.objects.get(section=self.section)
+
+        student.section = other
+        student.save()
+
+        self.assertEqual(
+            set(SectionDailyAttendance.objects.filter(present__gt=0).values_list("section_id", flat=True)),
+            {other.id},
+        )
+        _, data = self.query_count(section="C", from_date="2025-06-01", to_date="2025-06-30")
+        self.assertEqual(data["summary"]["total_days"], 2)
+        _, data = self.query_count(from_date="2025-06-01", to_date="2025-06-30")
+        self.assertEqual(data["summary"]["total_days"], 0)
+
+    def test_deleting_a_students_user_updates_section_days(self):
+        self.add_students(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.filter(section=self.section).first().user.delete()
+
+        self.assertEqual(
+            SectionDailyAttendance.objects.values_list("date", "present", "absent").order_by("date")[0],
+            (date(2025, 6, 2), 1, 0),
+        )
+        _, rollup = self.query_count(from_date="2025-06-01", to_date="2025-06-30")
+        _, raw = self.query_count(from_date="2025-06-01", to_date="2025-06-29")
+        self.assertEqual(rollup, raw)
+
+    def test_deleting_attendance_updates_rollups(self):
+        self.add_students(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.filter(date=date(2025, 6, 3)).delete()
+
+        self.assertEqual(
+            list(StudentMonthlyAttendance.objects.values_list("present", "absent")), [(1, 0)]
+        )
+        self.assertEqual(SectionDailyAttendance.objects.get(date=date(2025, 6, 3)).absent, 0)
+
+    def test_rebuild_command_restores_rollups(self):
+        self.add_students(2)
+        _, before = self.query_count()
+        StudentMonthlyAttendance.objects.all().delete()
+        SectionDailyAttendance.objects.all().delete()
+
+        call_command("rebuild_attendance_rollups", stdout=StringIO())
+
+        _, after = self.query_count()
+        self.assertEqual(before, after)
+
+    def test_report_shape(self):
+        self.add_students(2)
+        _, data = self.query_count()
+
+        self.assertEqual(
+            data["summary"],
+            {"total_students": 2, "total_days": 2, "average_attendance": "50.00%"},
+        )
+        self.assertEqual(data["records"][0], {
+            "student_name": "F0 L",
+            "standard": "6",
+            "section": "B",
+            "total_present": 1,
+            "total_absent": 1,
+            "attendance_percentage": "50.00%",
+        })
+
+
+class AttendanceBitmapTests(APITestCase):
+    def setUp(self):
+        standard = Standard.objects.create(name="7")
+        section = Section.objects.create(name="C", standard=standard)
+        self.student = make_student("bm", section, first_name="Bit", last_name="Map")
+        self.parent = User.objects.create(username="parent", role="PARENT")
+        ParentStudent.objects.create(parent=self.parent, student=self.student)
+        # Two academic years: 2024-06-01 .. 2025-05-31 and 2025-06-01 ..
+        self.days = {
+            date(2024, 6, 3): "PRESENT",
+            date(2025, 5, 30): "ABSENT",
+            date(2025, 6, 2): "PRESENT",
+            date(2025, 6, 3): "PRESENT",
+            date(2025, 6, 4): "ABSENT",
+        }
+        bulk_mark_attendance(
+            {"user_id": self.student.user_id, "date": day, "status": status_}
+            for day, status_ in self.days.items()
+        )
+
+    def counts(self, start=None, end=None):
+        return bitmap_attendance_counts([self.student.user_id], start, end)[self.student.user_id]
+
+    def test_counts_match_rows_for_any_range(self):
+        ranges = [
+            (None, None),
+            (date(2024, 6, 3), date(2025, 6, 2)),
+            (date(2025, 5, 31), date(2025, 6, 3)),
+            (date(2025, 6, 3), date(2025, 6, 3)),
+        ]
+        for start, end in ranges:
+            expected = [
+                status_ for day, status_ in self.days.items()
+                if (start is None or start <= day <= end)
+            ]
+            counts = self.counts(start, end)
+            self.assertEqual(counts.present, expected.count("PRESENT"), (start, end))
+            self.assertEqual(counts.absent, expected.count("ABSENT"), (start, end))
+
+    def test_remarking_keeps_bitmap_in_sync(self):
+        bulk_mark_attendance([
+            {"user_id": self.student.user_id, "date": date(2025, 6, 4), "status": "PRESENT"}
+        ])
+        self.assertEqual(self.counts(date(2025, 6, 1), date(2025, 6, 30)), (3, 0))
+
+    def test_parent_report_uses_bitmap_summary(self):
+        self.client.force_authenticate(self.parent)
+        response = self.client.get(
+            reverse("attendance-report-parent"),
+            {"from_date": "2025-06-01", "to_date": "2025-06-30"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        child = response.data["children"][0]
+        self.assertEqual(
+            child["summary"],
+            {"total_days": 3, "present": 2, "absent": 1, "percentage": "66.67%"},
+        )
+        self.assertEqual(len(child["records"]), 3)
+
+
+class AttendanceReportParentViewTests(APITestCase):
+    def setUp(self):
+        standard = Standard.objects.create(name="8")
+        section = Section.objects.create(name="D", standard=standard)
+        self.parent = User.objects.create(username="parent", role="PARENT")
+        self.children = []
+        for i in range(3):
+            child = make_student(f"c{i}", section, first_name=f"Child{i}")
+            ParentStudent.objects.create(parent=self.parent, student=child)
+            self.children.append(child)
+        self.client.force_authenticate(self.parent)
+        self.url = reverse("attendance-report-parent")
+
+    def mark_days(self, days):
+        bulk_mark_attendance(
+            {"user_id": child.user_id, "date": date(2025, 7, day), "status": "PRESENT"}
+            for child in self.children
+            for day in range(1, days + 1)
+        )
+
+    def get(self, **params):
+        # Count the parent's link lookup on every request
+        clear_relationship_cache()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_is_independent_of_history(self):
+        self.mark_days(3)
+        short, _ = self.get()
+        self.mark_days(25)
+        long, data = self.get()
+
+        self.assertEqual(short, long)
+        self.assertEqual(len(data["children"]), 3)
+        self.assertEqual(data["children"][0]["summary"]["total_days"], 25)
+
+    def test_cursor_walks_one_child_history(self):
+        self.mark_days(5)
+        _, data = self.get(page_size=2)
+        first = data["children"][0]
+        self.assertEqual([r["date"] for r in first["records"]], ["2025-07-05", "2025-07-04"])
+
+        seen = [r["date"] for r in first["records"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            _, data = self.get(page_size=2, cursor=cursor)
+            self.assertEqual(len(data["children"]), 1)
+            seen += [r["date"] for r in data["children"][0]["records"]]
+            cursor = data["children"][0]["next_cursor"]
+
+        self.assertEqual(seen, [f"2025-07-0{day}" for day in range(5, 0, -1)])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ClassAttendanceViewTests(APITestCase):
+    def setUp(self):
+        standard = Standard.objects.create(name="9")
+        self.section = Section.objects.create(name="E", standard=standard)
+        other = Section.objects.create(name="F", standard=standard)
+        self.students = [make_student(f"e{i}", self.section) for i in range(3)]
+        outsider = make_student("outsider", other)
+        bulk_mark_attendance(
+            {"user_id": student.user_id, "date": date(2025, 8, day), "status": "PRESENT"}
+            for student in self.students + [outsider]
+            for day in range(1, 8)
+        )
+        self.url = reverse("class-attendance", args=[self.section.id])
+
+    def test_keyset_pages_cover_section_history_once(self):
+        seen = []
+        url, params = self.url, {"page_size": 4}
+        with CaptureQueriesContext(connection) as ctx:
+            while url:
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                seen += [(row["date"], row["id"]) for row in response.data["results"]]
+                url, params = response.data["next"], None
+
+        self.assertEqual(len(seen), 21)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(set(seen)), 21)
+        # Section lookup plus one page query per request
+        self.assertEqual(len(ctx.captured_queries), 2 * 6)
+
+    def test_unknown_section_is_404(self):
+        response = self.client.get(reverse("class-attendance", args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class AttendanceExportViewTests(APITestCase):
+    def setUp(self):
+        standard = Standard.objects.create(name="10")
+        section = Section.objects.create(name="G", standard=standard)
+        self.students = [make_student(f"x{i}", section, first_name=f"X{i}") for i in range(2)]
+        bulk_mark_attendance(
+            {"user_id": student.user_id, "date": date(2025, 9, day), "status": "ABSENT"}
+            for student in self.students
+            for day in (1, 2, 3)
+        )
+        self.url = reverse("attendance-export")
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        body = self.read(self.client.get(self.url, {"standard": "10", "from_date": "2025-09-02",
+                                                     "to_date": "2025-09-03"}))
+        lines = body.strip().splitlines()
+
+        self.assertEqual(lines[0].split(","), [
+            "date", "student_id", "username", "first_name", "last_name",
+            "standard", "section", "status", "marked_by",
+        ])
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[1].startswith(f"2025-09-02,{self.students[0].user_id},x0,X0,,10,G,ABSENT"))
+
+    def test_ndjson_export(self):
+        body = self.read(self.client.get(self.url, {"output": "ndjson"}))
+        rows = [json.loads(line) for line in body.splitlines()]
+
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]["date"], "2025-09-01")
+        self.assertEqual(rows[0]["section"], "G")
+
+    def test_unknown_output_is_rejected(self):
+        response = self.client.get(self.url, {"output": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+
+class AttendanceIngestTests(APITestCase):
+    def setUp(self):
+        standard = Standard.objects.create(name="11")
+        section = Section.objects.create(name="H", standard=standard)
+        # Student ids deliberately differ from their User ids
+        User.objects.create(username="gatekeeper", role="TEACHER")
+        self.students = [
+            Student.objects.create(
+                user=User.objects.create(username=f"t{i}", role="STUDENT"),
+                standard=standard, section=section,
+            )
+            for i in range(3)
+        ]
+        self.url = reverse("attendance-ingest")
+
+    def tap(self, student, at="2025-10-01T08:01:00Z", **extra):
+        return {"student_id": student.id, "tapped_at": at, "device_id": "gate-1", **extra}
+
+    def test_taps_are_queued_deduplicated_and_flushed(self):
+        taps = [self.tap(student) for student in self.students]
+        taps.append(self.tap(self.students[0], at="2025-10-01T08:30:00Z"))
+        taps.append({"student_id": 999, "tapped_at": "2025-10-01T08:02:00Z"})
+
+        response = self.client.post(self.url, taps, format="json")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["rejected_student_ids"], [999])
+        self.assertEqual(AttendanceQueue.objects.count(), 3)
+        self.assertFalse(Attendance.objects.exists())
+
+        call_command("flush_attendance_queue", once=True, batch_size=2, stdout=StringIO())
+
+        self.assertFalse(AttendanceQueue.objects.exists())
+        self.assertEqual(
+            set(Attendance.objects.values_list("student_id", "date", "status")),
+            {(student.user_id, date(2025, 10, 1), "PRESENT") for student in self.students},
+        )
+        user_id = self.students[0].user_id
+        self.assertEqual(bitmap_attendance_counts([user_id])[user_id], (1, 0))
+
+    def test_flush_keeps_existing_matching_rows(self):
+        teacher = User.objects.create(username="teacher", role="TEACHER")
+        bulk_mark_attendance(
+            [{"user_id": self.students[0].user_id, "date": date(2025, 10, 1), "status": "PRESENT"}],
+            marked_by=teacher,
+        )
+        self.client.post(self.url, self.tap(self.students[0]), format="json")
+
+        call_command("flush_attendance_queue", once=True, stdout=StringIO())
+
+        self.assertEqual(Attendance.objects.get().marked_by, teacher)
+
+    def test_flush_keeps_a_teachers_different_mark(self):
+        teacher = User.objects.create(username="teacher", role="TEACHER")
+        bulk_mark_attendance(
+            [{"user_id": self.students[0].user_id, "date": date(2025, 10, 1), "status": "ABSENT"}],
+            marked_by=teacher,
+        )
+        self.client.post(self.url, [self.tap(student) for student in self.students[:2]], format="json")
+
+        call_command("flush_attendance_queue", once=True, stdout=StringIO())
+
+        marked = Attendance.objects.get(student_id=self.students[0].user_id)
+        self.assertEqual((marked.status, marked.marked_by), ("ABSENT", teacher))
+        self.assertEqual(Attendance.objects.get(student_id=self.students[1].user_id).status, "PRESENT")
+        self.assertFalse(AttendanceQueue.objects.exists())
+
+
+# ============================================================
+# 🧾 MARK LISTS
+# ============================================================
+class MarkListViewTests(APITestCase):
+    def setUp(self):
+        standard = Standard.objects.create(name="7")
+        section = Section.objects.create(name="C", standard=standard)
+        self.student = make_student("kid", section)
+        self.teacher = User.objects.create(username="teacher", role="TEACHER")
+        exam = Exam.objects.create(name="Unit 1", date=date(2025, 7, 1), standard=standard, section=section)
+        for i in range(3):
+            subject = Subject.objects.create(name=f"Subject {i}", code=f"S{i}", standard=standard)
+            Mark.objects.create(exam=exam, student=self.student, subject=subject, entered_by=self.teacher,
+                                marks_obtained=Decimal("40"), max_marks=Decimal("50"))
+
+    def test_student_marks_are_flat_rows_from_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("student-marks", args=[self.student.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries.captured_queries), 2)  # student lookup + marks
+        row = response.data[0]
+        self.assertEqual(row["subject_name"], "Subject 0")
+        self.assertEqual(row["exam_name"], "Unit 1")
+        self.assertEqual(row["exam_date"], "2025-07-01")
+        self.assertEqual(row["recorded_by"], "teacher")
+        self.assertEqual(row["marks_obtained"], "40.00")
+        self.assertIsNone(row["exam_rank"])
+
+    def test_my_marks_for_logged_in_student(self):
+        self.client.force_authenticate(self.student.user)
+
+        response = self.client.get(reverse("my-marks"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(response.data[0]["grade"], "A")
+
+
+# ============================================================
+# 🔗 RELATIONSHIPS
+# ============================================================
+class RelationshipResolverTests(APITestCase):
+    def setUp(self):
+        clear_relationship_cache()
+        standard = Standard.objects.create(name="10")
+        section = Section.objects.create(name="E", standard=standard)
+        self.parent = User.objects.create(username="parent", role="PARENT")
+        self.children = [make_student(f"k{i}", section) for i in range(3)]
+        self.other = make_student("other", section)
+        for child in self.children:
+            ParentStudent.objects.create(parent=self.parent, student=child)
+
+    def request_for(self, user):
+        request = APIRequestFactory().get("/")
+        request.user = user
+        return request
+
+    @override_settings(RELATIONSHIP_CACHE_SECONDS=60)
+    def test_object_checks_share_one_lookup(self):
+        request = self.request_for(self.parent)
+        permission = IsParentOrStudent()
+        students = self.children + [self.other]
+
+        with self.assertNumQueries(1):
+            allowed = [permission.has_object_permission(request, None, student) for student in students]
+        self.assertEqual(allowed, [True, True, True, False])
+
+        # Later requests hit the process-local cache
+        with self.assertNumQueries(0):
+            self.assertTrue(permission.has_object_permission(self.request_for(self.parent), None, self.children[0]))
+
+    def test_links_are_not_cached_by_default(self):
+        relationships_for(self.request_for(self.parent))
+        with self.assertNumQueries(1):
+            relationships_for(self.request_for(self.parent))
+
+    def test_token_user_links_come_from_claims(self):
+        parent = token_user(tokens_for_user(self.parent).access_token)
+        student = token_user(tokens_for_user(self.children[0].user).access_token)
+        attendance = Attendance(student=self.children[1].user, date=date(2025, 7, 1), status="PRESENT")
+
+        with self.assertNumQueries(0):
+            own = relationships_for(self.request_for(student))
+            self.assertTrue(own.can_access(self.children[0]))
+            self.assertTrue(own.can_access(self.children[0].user))
+            self.assertFalse(own.can_access(self.other))
+            relationships = relationships_for(self.request_for(parent))
+            self.assertTrue(relationships.is_parent_of(self.children[1]))
+            self.assertFalse(relationships.is_parent_of(self.other.id))
+        # A child's user id is looked up once, on the first check against a User
+        with self.assertNumQueries(1):
+            self.assertTrue(relationships.can_access(attendance.student))
+            self.assertFalse(relationships.can_access(self.other.user))
+
+    def test_student_and_admin_access(self):
+        student = self.children[0]
+        attendance = Attendance(student=student.user, date=date(2025, 7, 1), status="PRESENT")
+        own = relationships_for(self.request_for(student.user))
+        admin = relationships_for(self.request_for(User(username="admin", role="ADMIN")))
+
+        self.assertTrue(own.can_access(student))
+        self.assertTrue(own.can_access(attendance.student))
+        self.assertFalse(own.can_access(self.other))
+        self.assertTrue(admin.can_access(self.other))
+
+    @override_settings(RELATIONSHIP_CACHE_SECONDS=60)
+    def test_link_changes_drop_cached_links(self):
+        relationships_for(self.request_for(self.parent))
+        ParentStudent.objects.create(parent=self.parent, student=self.other)
+
+        self.assertTrue(relationships_for(self.request_for(self.parent)).is_parent_of(self.other))
+
+    def test_my_marks_for_linked_child_only(self):
+        self.client.force_authenticate(self.parent)
+
+        allowed = self.client.get(reverse("my-marks"), {"student_id": self.children[0].id})
+        denied = self.client.get(reverse("my-marks"), {"student_id": self.other.id})
+
+        self.assertEqual(allowed.status_code, 200)
+        self.assertEqual(denied.data, [])
+
+
+# ============================================================
+# 📥 ROSTER IMPORT
+# ============================================================
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"], ROSTER_IMPORT_WORKERS=1
+)
+class RosterImportTests(APITestCase):
+    def setUp(self):
+        self.results_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.results_dir, ignore_errors=True)
+        settings_override = override_settings(JOB_RESULTS_DIR=self.results_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        standard = Standard.objects.create(name="11")
+        Section.objects.create(name="A", standard=standard)
+        Section.objects.create(name="B", standard=standard)
+        User.objects.create(username="Taken@School.test", role="STUDENT")
+        self.client.force_authenticate(User.objects.create(username="teacher", role="TEACHER"))
+        self.url = reverse("student-roster-import")
+
+    def roster(self, rows, name="roster.csv"):
+        lines = ["firstname,lastname,email,password,standard,section"] + rows
+        return SimpleUploadedFile(name, "\n".join(lines).encode())
+
+    def post(self, rows, **kwargs):
+        return self.client.post(self.url, {"file": self.roster(rows, **kwargs)}, format="multipart")
+
+    def run_import(self, rows):
+        """Post a roster, run its job and return the job's result."""
+        response = self.post(rows)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["kind"], "roster_import")
+        self.assertEqual(work("w", once=True), 1)
+        job = Job.objects.get(pk=response.data["id"])
+        self.assertEqual(job.status, Job.SUCCEEDED, job.error)
+        return job.result
+
+    def test_import_creates_students_and_reports_row_errors(self):
+        result = self.run_import([
+            "Asha,Rao,asha@school.test,secret-1,11,A",
+            "Ben,Lee,BEN@school.test,,11,B",
+            "Cara,Moss,not-an-email,x,11,A",
+            "Dev,Shah,dev@school.test,x,12,A",
+            "Eli,Ng,eli@school.test,x,11,Z",
+            "Fay,Oak,taken@school.test,x,11,A",
+            "Gus,Poe,asha@school.test,x,11,A",
+        ])
+
+        self.assertEqual(result["created"], 2)
+        self.assertEqual(
+            [(error["row"], list(error["errors"])) for error in result["errors"]],
+            [(4, ["email"]), (5, ["standard"]), (6, ["section"]), (7, ["email"]), (8, ["email"])],
+        )
+        asha = Student.objects.select_related("user", "section").get(user__username="asha@school.test")
+        self.assertEqual(asha.section.name, "A")
+        self.assertEqual(asha.user.role, "STUDENT")
+        self.assertTrue(asha.user.check_password("secret-1"))
+        self.assertFalse(User.objects.get(username="ben@school.test").has_usable_password())
+        # The upload is removed once imported
+        self.assertEqual(list((Path(self.results_dir) / "rosters").iterdir()), [])
+
+    def test_query_count_is_independent_of_roster_size(self):
+        def run(count, prefix):
+            rows = [f"S{i},T,{prefix}{i}@school.test,pw,11,A" for i in range(count)]
+            self.post(rows)
+            with CaptureQueriesContext(connection) as ctx:
+                work("w", once=True)
+            self.assertEqual(Student.objects.filter(user__username__startswith=prefix).count(), count)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run(3, "small"), run(40, "large"))
+
+    def test_rerun_skips_rows_already_imported(self):
+        rows = ["Asha,Rao,asha@school.test,pw,11,A", "Ben,Lee,ben@school.test,pw,11,B"]
+        self.assertEqual(self.run_import(rows)["created"], 2)
+
+        again = self.run_import(rows + ["Cara,Moss,cara@school.test,pw,11,A"])
+
+        self.assertEqual(again["created"], 1)
+        self.assertEqual([error["row"] for error in again["errors"]], [2, 3])
+        self.assertEqual(Student.objects.count(), 3)
+
+    @override_settings(ROSTER_IMPORT_WORKERS=2, PASSWORD_HASHERS=[
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher", "django.contrib.auth.hashers.MD5PasswordHasher",
+    ])
+    def test_job_hashes_passwords_across_a_pool(self):
+        result = self.run_import([f"S{i},T,s{i}@school.test,pw-{i},11,A" for i in range(4)])
+
+        self.assertEqual((result["created"], result["errors"]), (4, []))
+        # Pool workers load the project settings, not the test's hashers
+        user = User.objects.get(username="s3@school.test")
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(user.check_password("pw-3"))
+
+    def test_bad_files_are_rejected(self):
+        missing = self.client.post(
+            self.url, {"file": SimpleUploadedFile("roster.csv", b"firstname,email\nA,a@b.test")},
+            format="multipart",
+        )
+        wrong_type = self.post([], name="roster.txt")
+
+        self.assertEqual(missing.status_code, 400)
+        self.assertIn("missing columns", missing.data["file"])
+        self.assertEqual(wrong_type.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    def test_only_admins_and_teachers_can_import(self):
+        self.client.force_authenticate(User.objects.create(username="pupil", role="STUDENT"))
+        self.assertEqual(self.post(["Ira,Kay,ira@school.test,pw,11,B"]).status_code, 403)
+
+        self.client.force_authenticate(User.objects.create(username="head", role="ADMIN"))
+        self.assertEqual(self.post(["Ira,Kay,ira@school.test,pw,11,B"]).status_code, 202)
+
+    def test_command_imports_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv") as roster:
+            roster.write(self.roster(["Ira,Kay,ira@school.test,pw,11,B"]).read())
+            roster.flush()
+            out = StringIO()
+            call_command("import_roster", roster.name, "--workers", "1", stdout=out)
+
+        self.assertIn("Imported 1 students", out.getvalue())
+        self.assertTrue(Student.objects.filter(user__username="ira@school.test").exists())
@@ -16,6 +16,11 @@ urlpatterns = [
         views.StudentRegistrationView.as_view(),
         name="student-register"
     ),
+    path(
+        "import/",
+        views.StudentRosterImportView.as_view(),
+        name="student-roster-import"
+    ),
     path(
         "list/",
         views.StudentListView.as_view(),
@@ -59,6 +64,11 @@ urlpatterns = [
         views.AttendanceMarkView.as_view(),
         name="attendance-mark"
     ),
+    path(
+        "attendance/ingest/",
+        views.AttendanceIngestView.as_view(),
+        name="attendance-ingest"
+    ),
     path(
         "attendance/student/<int:student_id>/",
         views.StudentAttendanceView.as_view(),
@@ -79,6 +89,11 @@ urlpatterns = [
         views.AttendanceReportParentView.as_view(),
         name="attendance-report-parent"
     ),
+    path(
+        "attendance/export/",
+        views.AttendanceExportView.as_view(),
+        name="attendance-export"
+    ),
 
     # ------------------------------------------------------------
     # 🧾 MARKS ROUTES
@@ -88,6 +103,11 @@ urlpatterns = [
         views.StudentMarkListView.as_view(),
         name="student-marks"
     ),
+    path(
+        "marks/student/<int:student_id>/progress/",
+        views.StudentProgressView.as_view(),
+        name="student-progress"
+    ),
     path(
         "marks/my/",
         views.MyMarkListView.as_view(),
@@ -1,18 +1,49 @@
+import csv
+import io
+import json
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from pathlib import Path
+
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.utils.dateparse import parse_date
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from .serializers import (
     StudentRegistrationSerializer, LinkParentSerializer,
     SectionSerializer, StandardSerializer,
-    AttendanceMarkSerializer, AttendanceSerializer,
-    SubjectSerializer, MarkSerializer
+    AttendanceMarkSerializer, AttendanceSerializer, AttendanceTapSerializer,
+    SubjectSerializer, MarkListSerializer
+)
+from .models import (
+    Student, ParentStudent, Standard, Section, Attendance, Subject,
+    StudentMonthlyAttendance, SectionDailyAttendance
 )
-from .models import Student, ParentStudent, Standard, Section, Attendance, Subject
 from accounts.models import User
+from jobs.serializers import JobSerializer
+from jobs.services import enqueue
 from performance.models import Exam, Mark
-from .permissions import IsTeacher, IsParentOrStudent
+from performance.progress import get_progress
+from .pagination import (
+    DateKeysetPagination, cursor_date, decode_cursor, encode_cursor, get_page_size
+)
+from .permissions import IsAdminOrTeacher, IsTeacher, IsParentOrStudent
+from .relationships import relationships_for
+from .roster import RosterError, read_roster
+from .services import (
+    bulk_mark_attendance, bitmap_attendance_counts, calculate_attendance_percentage,
+    enqueue_attendance_taps
+)
+from .tasks import roster_upload_dir
 
 
 # ============================================================
@@ -30,6 +61,46 @@ class StudentRegistrationView(generics.CreateAPIView):
     # permission_classes = [IsAuthenticated]
     permission_classes=[]
 
+class StudentRosterImportView(APIView):
+    """
+    POST /api/students/import/
+    --------------------------------
+    Registers a whole roster from an uploaded .csv or .xlsx file (field
+    "file") with columns firstname, lastname, email, password, standard
+    and section (names). The header is checked straight away; the rows
+    are imported by a background job and the response is 202 with that
+    job. Its result lists what was created and the rows that failed:
+    {"created": 480, "errors": [{"row": 7, "errors": {...}}]}.
+    """
+    parser_classes = [MultiPartParser]
+    permission_classes = [IsAuthenticated, IsAdminOrTeacher]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Upload a .csv or .xlsx roster."})
+
+        target_dir = roster_upload_dir()
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"{uuid.uuid4().hex}{Path(upload.name).suffix.lower()}"
+        with open(target, "wb") as handle:
+            for chunk in upload.chunks():
+                handle.write(chunk)
+        try:
+            with open(target, "rb") as roster:
+                read_roster(roster, upload.name)
+        except RosterError as exc:
+            target.unlink()
+            raise ValidationError({"file": str(exc)})
+
+        job = enqueue(
+            "roster_import",
+            {"upload": target.name, "filename": upload.name},
+            created_by=request.user,
+        )
+        return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
 class StudentListView(generics.ListAPIView):
     """
     Lists all registered students.
@@ -141,20 +212,11 @@ class AttendanceMarkView(generics.CreateAPIView):
         serializer = self.get_serializer(data=request.data, many=many)
         serializer.is_valid(raise_exception=True)
 
-        records = []
         items = serializer.validated_data if many else [serializer.validated_data]
+        marked_by = request.user if request.user.is_authenticated else None
 
-        for item in items:
-            student_id = int(item["student_id"])
-            date = item["date"]
-            status_ = item["status"]
-
-            attendance, _ = Attendance.objects.update_or_create(
-                student_id=student_id,
-                date=date,
-                defaults={"status": status_, "marked_by": request.user}
-            )
-            records.append(attendance)
+        # Whole roll call goes out as one upsert on (student, date)
+        records = bulk_mark_attendance(items, marked_by=marked_by)
 
         return Response(
             AttendanceSerializer(records, many=True).data,
@@ -162,6 +224,32 @@ class AttendanceMarkView(generics.CreateAPIView):
         )
 
 
+class AttendanceIngestView(generics.GenericAPIView):
+    """
+    POST /api/students/attendance/ingest/
+    --------------------------------
+    Accepts a tap event (or a list of them) from classroom readers and
+    buffers them in the attendance queue with a single insert. The
+    flush_attendance_queue worker moves them into Attendance in batches.
+    """
+    serializer_class = AttendanceTapSerializer
+    # permission_classes = [IsAuthenticated]
+    permission_classes = []
+
+    def post(self, request, *args, **kwargs):
+        many = isinstance(request.data, list)
+        serializer = self.get_serializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+
+        events = serializer.validated_data if many else [serializer.validated_data]
+        queued, rejected = enqueue_attendance_taps(events)
+
+        return Response(
+            {"queued": queued, "rejected_student_ids": rejected},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
 class StudentAttendanceView(generics.ListAPIView):
     """
     GET /api/attendance/student/<student_id>/
@@ -188,8 +276,10 @@ class ClassAttendanceView(generics.ListAPIView):
     GET /api/attendance/class/<section_id>/
     --------------------------------
     View attendance for all students in a section (teacher only).
+    Results are paginated newest first; follow `next` to keep scrolling.
     """
     serializer_class = AttendanceSerializer
+    pagination_class = DateKeysetPagination
     # permission_classes = [IsAuthenticated, IsTeacher]
     permission_classes = []
 
@@ -199,24 +289,152 @@ class ClassAttendanceView(generics.ListAPIView):
         section = get_object_or_404(Section, id=section_id)
         date = self.request.query_params.get("date")
 
-        user_ids = [student.user.id for student in Student.objects.filter(section=section)]
-        students = User.objects.filter(id__in=user_ids, role="STUDENT")
-
+        queryset = Attendance.objects.filter(
+            student__student_profile__section=section,
+            student__role="STUDENT",
+        )
         if date:
-            return Attendance.objects.filter(student__in=students, date=date)
-        return Attendance.objects.filter(student__in=students).order_by("-date")
+            queryset = queryset.filter(date=date)
+        return queryset
 
 
 # ============================================================
 # 🧮 ATTENDANCE REPORT HELPERS
 # ============================================================
 
-def calculate_attendance_percentage(present_days, total_days):
-    """Calculate attendance percentage and return a formatted string."""
-    if total_days == 0:
-        return "0%"
-    percentage = (present_days / total_days) * 100
-    return f"{percentage:.2f}%"
+def parse_report_range(from_date, to_date):
+    """
+    Parse the from_date/to_date query parameters of a report.
+    Returns a (start, end) pair of dates, or (None, None) when the range
+    is missing or incomplete.
+    """
+    if not (from_date and to_date):
+        return None, None
+    try:
+        start, end = parse_date(from_date), parse_date(to_date)
+    except ValueError:
+        start = end = None
+    if start is None or end is None:
+        raise ValidationError({"detail": "from_date and to_date must be valid YYYY-MM-DD dates."})
+    return start, end
+
+
+def rollup_span(start, end):
+    """
+    Decide whether a parsed report range can be answered from the rollups.
+
+    Returns (start, end) dates covering whole calendar months, where
+    `end` is exclusive, (None, None) when no range was requested, or None
+    when the range has to be computed from the raw Attendance rows.
+    """
+    if start is None or end is None:
+        return None, None
+    if start > end:
+        return None
+    end = end + timedelta(days=1)
+    if start.day != 1 or end.day != 1:
+        return None
+    return start, end
+
+
+def _student_report_fields():
+    """values() spec shared by the raw and rollup per-student reports."""
+    return {
+        "first_name": F("student__first_name"),
+        "last_name": F("student__last_name"),
+        "standard": F("student__student_profile__standard__name"),
+        "section": F("student__student_profile__section__name"),
+    }
+
+
+def _build_report(rows, total_days):
+    """Shape per-student rows into the principal report payload."""
+    records = []
+    overall_present = overall_records = 0
+    for row in rows:
+        row_total = row["total_present"] + row["total_absent"]
+        overall_present += row["total_present"]
+        overall_records += row_total
+        records.append({
+            "student_name": f"{row['first_name']} {row['last_name']}",
+            "standard": row["standard"] or "",
+            "section": row["section"] or "",
+            "total_present": row["total_present"],
+            "total_absent": row["total_absent"],
+            "attendance_percentage": calculate_attendance_percentage(
+                row["total_present"], row_total
+            ),
+        })
+
+    summary = {
+        "total_students": len(records),
+        "total_days": total_days,
+        "average_attendance": calculate_attendance_percentage(overall_present, overall_records),
+    }
+    return summary, records
+
+
+def summarize_attendance(queryset):
+    """
+    Build the principal report from a filtered Attendance queryset.
+
+    Uses two grouped queries with conditional counts (one per student,
+    one for the distinct days) no matter how many students match.
+    Returns a (summary, records) tuple.
+    """
+    rows = (
+        queryset.order_by()
+        .values("student_id", **_student_report_fields())
+        .annotate(
+            total_present=Count("id", filter=Q(status="PRESENT")),
+            total_absent=Count("id", filter=Q(status="ABSENT")),
+        )
+        .order_by("student_id")
+    )
+    total_days = queryset.order_by().values("date").distinct().count()
+    return _build_report(rows, total_days)
+
+
+def summarize_attendance_rollup(span, standard_name=None, section_name=None):
+    """
+    Build the principal report from the monthly and daily rollups.
+
+    `span` is a (start, end) pair from rollup_span(). Cost depends on the
+    number of students and months, not on the number of attendance rows.
+    """
+    start, end = span
+    months = StudentMonthlyAttendance.objects.all()
+    days = SectionDailyAttendance.objects.filter(Q(present__gt=0) | Q(absent__gt=0))
+    # Students without a section have no section-day rows; their days come
+    # from their own (few) attendance rows so both report paths agree
+    unsectioned = Attendance.objects.filter(student__student_profile__section__isnull=True)
+
+    if standard_name:
+        months = months.filter(student__student_profile__standard__name=standard_name)
+        days = days.filter(section__standard__name=standard_name)
+        unsectioned = unsectioned.filter(student__student_profile__standard__name=standard_name)
+    if section_name:
+        months = months.filter(student__student_profile__section__name=section_name)
+        days = days.filter(section__name=section_name)
+        unsectioned = unsectioned.none()
+    if start:
+        months = months.filter(month__gte=start, month__lt=end)
+        days = days.filter(date__gte=start, date__lt=end)
+        unsectioned = unsectioned.filter(date__gte=start, date__lt=end)
+
+    rows = (
+        months.order_by()
+        .values("student_id", **_student_report_fields())
+        .annotate(total_present=Sum("present"), total_absent=Sum("absent"))
+        .filter(Q(total_present__gt=0) | Q(total_absent__gt=0))
+        .order_by("student_id")
+    )
+    total_days = (
+        days.order_by().values("date")
+        .union(unsectioned.order_by().values("date"))
+        .count()
+    )
+    return _build_report(rows, total_days)
 
 
 # ============================================================
@@ -243,59 +461,26 @@ class AttendanceReportPrincipalView(generics.GenericAPIView):
 
         # Filter by standard
         if standard_name:
-            standards = Standard.objects.filter(name=standard_name)
-            students = Student.objects.filter(standard__in=standards)
-            queryset = queryset.filter(student__in=[s.user for s in students])
+            queryset = queryset.filter(student__student_profile__standard__name=standard_name)
 
         # Filter by section
         if section_name:
-            sections = Section.objects.filter(name=section_name)
-            students = Student.objects.filter(section__in=sections)
-            queryset = queryset.filter(student__in=[s.user for s in students])
+            queryset = queryset.filter(student__student_profile__section__name=section_name)
 
-        # Filter by date range
-        if from_date and to_date:
-            queryset = queryset.filter(date__range=[from_date, to_date])
-
-        # Build summary per student
-        summary_data = []
-        student_ids = queryset.values_list("student_id", flat=True).distinct()
-
-        for sid in student_ids:
-            student_attendance = queryset.filter(student_id=sid)
-            if not student_attendance.exists():
-                continue
-
-            student_obj = student_attendance.first().student
-            total_days = student_attendance.count()
-            total_present = student_attendance.filter(status="PRESENT").count()
-            total_absent = student_attendance.filter(status="ABSENT").count()
-
-            student_record = Student.objects.filter(user=student_obj).first()
+        start, end = parse_report_range(from_date, to_date)
 
-            summary_data.append({
-                "student_name": f"{student_obj.first_name} {student_obj.last_name}",
-                "standard": student_record.standard.name if student_record else "",
-                "section": student_record.section.name if student_record else "",
-                "total_present": total_present,
-                "total_absent": total_absent,
-                "attendance_percentage": calculate_attendance_percentage(total_present, total_days),
-            })
+        # Whole-month ranges are answered from the rollup tables
+        span = rollup_span(start, end)
+        if span is not None:
+            summary, records = summarize_attendance_rollup(span, standard_name, section_name)
+            return Response({"summary": summary, "records": records}, status=status.HTTP_200_OK)
 
-        # Overall summary
-        total_students = len(student_ids)
-        total_days = queryset.values("date").distinct().count()
-        overall_present = queryset.filter(status="PRESENT").count()
-        overall_percentage = calculate_attendance_percentage(overall_present, queryset.count())
+        # Filter by date range
+        if start and end:
+            queryset = queryset.filter(date__range=[start, end])
 
-        return Response({
-            "summary": {
-                "total_students": total_students,
-                "total_days": total_days,
-                "average_attendance": overall_percentage,
-            },
-            "records": summary_data
-        }, status=status.HTTP_200_OK)
+        summary, records = summarize_attendance(queryset)
+        return Response({"summary": summary, "records": records}, status=status.HTTP_200_OK)
 
 
 class AttendanceReportParentView(generics.GenericAPIView):
@@ -303,49 +488,179 @@ class AttendanceReportParentView(generics.GenericAPIView):
     GET /api/attendance/reports/parent/
     --------------------------------
     Allows parents (or students) to view attendance for linked children.
+
+    Each child's records are paginated newest first with a keyset cursor
+    on date (?page_size=, default 30). Pass a child's `next_cursor` back
+    as ?cursor= to fetch that child's next page.
     """
     # permission_classes = [IsAuthenticated, IsParentOrStudent]
     permission_classes = []
 
 
     def get(self, request, *args, **kwargs):
-        parent = request.user
-        linked_students = [link.student for link in ParentStudent.objects.filter(parent=parent)]
+        relationships = relationships_for(request)
         from_date = request.query_params.get("from_date")
         to_date = request.query_params.get("to_date")
+        start, end = parse_report_range(from_date, to_date)
+        page_size = get_page_size(request)
+
+        children = Student.objects.filter(id__in=relationships.child_ids).select_related(
+            "user", "standard", "section"
+        ).order_by("id")
+        cursor = request.query_params.get("cursor")
+        before = None
+        if cursor:
+            position = decode_cursor(cursor)
+            before = cursor_date(position)
+            if not isinstance(position.get("student"), int):
+                raise ValidationError({"cursor": "Invalid cursor."})
+            children = children.filter(user_id=position["student"])
+        linked_students = list(children) if relationships.child_ids else []
+        user_ids = [student_.user_id for student_ in linked_students]
+
+        # Summaries are popcounts over the attendance bitmaps
+        counts = bitmap_attendance_counts(user_ids, start, end)
+
+        # One windowed query returns the next page for every child
+        records = Attendance.objects.filter(student_id__in=user_ids)
+        if start and end:
+            records = records.filter(date__range=[start, end])
+        if before:
+            records = records.filter(date__lt=before)
+        records = (
+            records
+            .annotate(row_number=Window(
+                RowNumber(), partition_by=F("student_id"), order_by=F("date").desc()
+            ))
+            .filter(row_number__lte=page_size + 1)
+            .order_by("student_id", "-date")
+        )
+        pages = defaultdict(list)
+        for record in records:
+            pages[record.student_id].append(record)
 
         data = []
 
         for student_ in linked_students:
             user = student_.user
-            user_records = Attendance.objects.filter(student=user)
-
-            if from_date and to_date:
-                user_records = user_records.filter(date__range=[from_date, to_date])
-
-            if not user_records.exists():
+            summary = counts.get(user.id)
+            if summary is None or not summary.total:
                 continue
 
-            total_days = user_records.count()
-            total_present = user_records.filter(status="PRESENT").count()
-            total_absent = user_records.filter(status="ABSENT").count()
+            page = pages[user.id][:page_size]
+            next_cursor = None
+            if len(pages[user.id]) > page_size:
+                next_cursor = encode_cursor({"student": user.id, "date": page[-1].date})
 
             data.append({
                 "student_name": f"{user.first_name} {user.last_name}",
-                "standard": student_.standard.name,
-                "section": student_.section.name,
+                "standard": student_.standard.name if student_.standard else None,
+                "section": student_.section.name if student_.section else None,
                 "summary": {
-                    "total_days": total_days,
-                    "present": total_present,
-                    "absent": total_absent,
-                    "percentage": calculate_attendance_percentage(total_present, total_days),
+                    "total_days": summary.total,
+                    "present": summary.present,
+                    "absent": summary.absent,
+                    "percentage": summary.percentage,
                 },
-                "records": AttendanceSerializer(user_records, many=True).data,
+                "records": AttendanceSerializer(page, many=True).data,
+                "next_cursor": next_cursor,
             })
 
         return Response({"children": data})
 
 
+# ============================================================
+# 📤 ATTENDANCE EXPORT
+# ============================================================
+
+EXPORT_COLUMNS = [
+    ("date", "date"),
+    ("student_id", "student_id"),
+    ("username", "student__username"),
+    ("first_name", "student__first_name"),
+    ("last_name", "student__last_name"),
+    ("standard", "student__student_profile__standard__name"),
+    ("section", "student__student_profile__section__name"),
+    ("status", "status"),
+    ("marked_by", "marked_by_id"),
+]
+
+
+def _export_csv(rows, batch_size):
+    """Yield CSV text in batches of `batch_size` rows, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _export_ndjson(rows, batch_size):
+    """Yield newline-delimited JSON objects in batches of `batch_size` rows."""
+    names = [name for name, _ in EXPORT_COLUMNS]
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(names, row)), default=str))
+        if len(lines) == batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+class AttendanceExportView(APIView):
+    """
+    GET /api/students/attendance/export/
+    --------------------------------
+    Streams attendance rows as CSV (default) or NDJSON (?output=ndjson),
+    filtered by standard, section and from_date/to_date. Rows are read
+    with a chunked server-side cursor, so memory use stays flat however
+    many rows are exported.
+    """
+    # permission_classes = [IsAuthenticated]
+    permission_classes = []
+    chunk_size = 2000
+
+    FORMATS = {
+        "csv": (_export_csv, "text/csv"),
+        "ndjson": (_export_ndjson, "application/x-ndjson"),
+    }
+
+    def get(self, request, *args, **kwargs):
+        output = request.query_params.get("output", "csv").lower()
+        if output not in self.FORMATS:
+            raise ValidationError({"output": f"Must be one of {sorted(self.FORMATS)}."})
+
+        queryset = Attendance.objects.all()
+        standard_name = request.query_params.get("standard")
+        section_name = request.query_params.get("section")
+        start, end = parse_report_range(
+            request.query_params.get("from_date"), request.query_params.get("to_date")
+        )
+        if standard_name:
+            queryset = queryset.filter(student__student_profile__standard__name=standard_name)
+        if section_name:
+            queryset = queryset.filter(student__student_profile__section__name=section_name)
+        if start and end:
+            queryset = queryset.filter(date__range=[start, end])
+
+        rows = (
+            queryset
+            .order_by("date", "student_id")
+            .values_list(*[field for _, field in EXPORT_COLUMNS])
+            .iterator(chunk_size=self.chunk_size)
+        )
+        render, content_type = self.FORMATS[output]
+        response = StreamingHttpResponse(render(rows, self.chunk_size), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="attendance_export.{output}"'
+        return response
+
+
 # ============================================================
 # 🧾 MARKS MANAGEMENT
 # ============================================================
@@ -356,10 +671,10 @@ class StudentMarkListView(generics.ListAPIView):
     --------------------------------
     Lists marks for a specific student, filterable by exam or subject.
     """
-    serializer_class = MarkSerializer
+    serializer_class = MarkListSerializer
     # permission_classes = [IsAuthenticated, IsParentOrStudent]  # Add IsAuthenticated, IsParentOrStudent as needed
     permission_classes = []
-    queryset = Mark.objects.select_related('subject', 'exam', 'entered_by', 'student')
+    queryset = Mark.objects.all()
 
     def get_queryset(self):
         student_id = self.kwargs.get('student_id')
@@ -374,7 +689,8 @@ class StudentMarkListView(generics.ListAPIView):
         if subject_id:
             qs = qs.filter(subject_id=subject_id)
 
-        return qs.order_by('-exam__date', 'subject__name')
+        # Flat rows with the stored class ranks joined in
+        return MarkListSerializer.rows(qs.order_by('-exam__date', 'subject__name'))
 
 
 class MyMarkListView(generics.ListAPIView):
@@ -383,24 +699,44 @@ class MyMarkListView(generics.ListAPIView):
     --------------------------------
     Returns marks for the logged-in student or a parent's selected child.
     """
-    serializer_class = MarkSerializer
+    serializer_class = MarkListSerializer
     # permission_classes = [IsAuthenticated]
     permission_classes = []
 
-    queryset = Mark.objects.select_related('subject', 'exam', 'entered_by', 'student')
+    queryset = Mark.objects.all()
 
     def get_queryset(self):
-        user = self.request.user
-        student = getattr(user, 'student', None)
-
-        if student:
-            return self.queryset.filter(student=student).order_by('-exam__date', 'subject__name')
+        relationships = relationships_for(self.request)
+        if relationships.student_id:
+            return MarkListSerializer.rows(
+                self.queryset.filter(student_id=relationships.student_id).order_by('-exam__date', 'subject__name')
+            )
 
         # If parent, allow selecting a child
-        children_ids = ParentStudent.objects.filter(parent=user).values_list('student_id', flat=True)
         student_id = self.request.query_params.get('student_id')
 
-        if student_id and int(student_id) in set(children_ids):
-            return self.queryset.filter(student_id=student_id).order_by('-exam__date', 'subject__name')
+        if student_id and relationships.is_parent_of(int(student_id)):
+            return MarkListSerializer.rows(
+                self.queryset.filter(student_id=student_id).order_by('-exam__date', 'subject__name')
+            )
 
         return Mark.objects.none()
+
+
+class StudentProgressView(APIView):
+    """
+    GET /api/marks/student/<student_id>/progress/
+    --------------------------------
+    Per-subject time series of exam percentage and class percentile,
+    as parallel columns:
+    {"student": 3, "subjects": [{"id", "name", "exams", "exam_names",
+      "dates", "percentages", "percentiles"}, ...]}
+    Cached per student until their marks change.
+    """
+    # permission_classes = [IsAuthenticated, IsParentOrStudent]
+    permission_classes = []
+
+    def get(self, request, student_id):
+        student = get_object_or_404(Student, pk=student_id)
+        self.check_object_permissions(request, student)
+        return Response(get_progress(student.id))